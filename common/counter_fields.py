@@ -0,0 +1,17 @@
+class CounterFieldsMixin:
+    """
+    Model mixin for counter columns maintained outside of ``save()`` (F()
+    updates, periodic rollups), listed in ``COUNTER_FIELDS``.
+
+    Full saves of existing rows leave the counters alone, so an instance
+    loaded before a counter changed doesn't write back a stale value.
+    """
+    COUNTER_FIELDS = ()
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and not field.generated and field.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
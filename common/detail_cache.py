@@ -0,0 +1,173 @@
+"""
+Redis read-through cache for serialized detail payloads.
+
+Entries are stored per object and per serializer version under
+
+    {prefix}:{model label}:{pk}:v{object version}:{variant digest}
+
+where the object version is a counter (``{prefix}:version:{label}:{pk}``)
+bumped by ``invalidate`` whenever the row or a related row shown in its
+payload changes, and the variant hashes the serializer name, its cache
+version and the request's host and full path. Bumping the counter makes
+every variant of the object unreachable at once; old entries expire after
+``ttl`` seconds.
+
+Concurrent misses for the same entry are single-flighted: one request
+recomputes under a short lock while the others poll the cache for up to
+``coalesce_wait`` seconds before computing themselves.
+
+Hits, misses and coalesced hits are counted per endpoint in the
+``{prefix}:stats`` hash (see ``get_stats``). Redis being unavailable just
+disables the cache.
+"""
+import hashlib
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from redis.exceptions import RedisError
+from rest_framework.response import Response
+
+from utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DETAIL_CACHE = {
+    'key_prefix': 'detail',
+    'ttl': 600,
+    'enabled': True,
+    'lock_timeout': 5,      # seconds a recompute may hold the single-flight lock
+    'coalesce_wait': 0.5,   # seconds waiting requests poll for the recomputed entry
+}
+
+CACHE_HEADER = 'X-Detail-Cache'
+HIT = 'hit'
+MISS = 'miss'
+COALESCED = 'coalesced'
+
+
+def get_detail_cache_config() -> dict:
+    """Return DETAIL_CACHE merged over DEFAULT_DETAIL_CACHE."""
+    return {**DEFAULT_DETAIL_CACHE, **(getattr(settings, 'DETAIL_CACHE', None) or {})}
+
+
+def _version_key(config: dict, label: str, pk) -> str:
+    return f"{config['key_prefix']}:version:{label}:{pk}"
+
+
+def _stats_key(config: dict) -> str:
+    return f"{config['key_prefix']}:stats"
+
+
+def build_entry_key(config: dict, label: str, pk, version: int, variant: str) -> str:
+    digest = hashlib.sha256(variant.encode()).hexdigest()[:32]
+    return f"{config['key_prefix']}:{label}:{pk}:v{version}:{digest}"
+
+
+def _bump(model, pks) -> None:
+    config = get_detail_cache_config()
+    label = model._meta.label_lower
+    pks = [pk for pk in pks if pk is not None]
+    if not pks:
+        return
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        for pk in pks:
+            pipe.incr(_version_key(config, label, pk))
+        pipe.execute()
+    except RedisError:
+        logger.warning("[DETAIL_CACHE] Could not invalidate entries", extra={'model': label})
+
+
+def invalidate(model, pks) -> None:
+    """
+    Make every cached payload of ``model`` rows ``pks`` unreachable once the
+    current transaction commits (so a concurrent reader cannot re-cache the
+    pre-commit state under the new version). ``pks`` may be a lazy
+    ``values_list`` queryset; it is only evaluated when the cache is enabled.
+    """
+    if get_detail_cache_config()['enabled']:
+        transaction.on_commit(lambda: _bump(model, list(pks)))
+
+
+def _record(client, config: dict, endpoint: str, outcome: str) -> None:
+    try:
+        client.hincrby(_stats_key(config), f"{endpoint}:{outcome}", 1)
+    except RedisError:
+        pass
+
+
+def get_stats() -> dict:
+    """Per-endpoint ``{'hit', 'miss', 'coalesced', 'hit_rate'}`` counters."""
+    config = get_detail_cache_config()
+    stats = {}
+    for field, value in get_redis().hgetall(_stats_key(config)).items():
+        endpoint, outcome = field.rsplit(':', 1)
+        stats.setdefault(endpoint, {HIT: 0, MISS: 0, COALESCED: 0})[outcome] = int(value)
+    for counters in stats.values():
+        total = sum(counters.values())
+        counters['hit_rate'] = round((counters[HIT] + counters[COALESCED]) / total, 4) if total else 0.0
+    return stats
+
+
+def reset_stats() -> None:
+    get_redis().delete(_stats_key(get_detail_cache_config()))
+
+
+def _wait_for(client, key, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        time.sleep(0.01)
+        cached = client.get(key)
+        if cached is not None:
+            return cached
+    return None
+
+
+def cached_response(endpoint: str, model, pk, variant: str, compute):
+    """
+    Serve the object's payload from the cache, calling ``compute()`` (which
+    returns a Response) on a miss. Only 200 responses are stored.
+    """
+    config = get_detail_cache_config()
+    if not config['enabled']:
+        return compute()
+    label = model._meta.label_lower
+    locked = False
+    try:
+        client = get_redis()
+        version = int(client.get(_version_key(config, label, pk)) or 0)
+        key = build_entry_key(config, label, pk, version, variant)
+        cached = client.get(key)
+        outcome = HIT
+        if cached is None:
+            locked = bool(client.set(f"{key}:lock", 1, nx=True, ex=config['lock_timeout']))
+            if not locked:
+                cached = _wait_for(client, key, config['coalesce_wait'])
+                outcome = COALESCED
+    except RedisError:
+        return compute()
+
+    if cached is not None:
+        _record(client, config, endpoint, outcome)
+        return Response(json.loads(cached), headers={CACHE_HEADER: outcome})
+
+    _record(client, config, endpoint, MISS)
+    try:
+        response = compute()
+        if response.status_code == 200:
+            try:
+                client.set(key, json.dumps(response.data, cls=DjangoJSONEncoder), ex=config['ttl'])
+                response[CACHE_HEADER] = MISS
+            except RedisError:
+                pass
+    finally:
+        if locked:
+            try:
+                client.delete(f"{key}:lock")
+            except RedisError:
+                pass
+    return response
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from common.detail_cache import get_stats, reset_stats
+
+
+class Command(BaseCommand):
+    help = "Show hit-rate metrics of the Redis detail payload cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Clear the counters after printing them.",
+        )
+
+    def handle(self, *args, **options):
+        stats = get_stats()
+        if not stats:
+            self.stdout.write("No detail cache requests recorded.")
+        for endpoint, counters in sorted(stats.items()):
+            self.stdout.write(
+                f"{endpoint}: hit={counters['hit']} coalesced={counters['coalesced']} "
+                f"miss={counters['miss']} hit_rate={counters['hit_rate']:.2%}"
+            )
+        if options["reset"]:
+            reset_stats()
+            self.stdout.write(self.style.SUCCESS("Counters reset."))
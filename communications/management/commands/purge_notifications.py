@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from communications.retention import purge_notifications
+
+
+class Command(BaseCommand):
+    help = "Delete expired and old read notifications according to retention policies."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--archive",
+            action="store_true",
+            default=None,
+            help="Archive purged rows to compressed JSONL files before deleting.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Rows deleted per transaction (default: from settings).",
+        )
+
+    def handle(self, *args, **options):
+        stats = purge_notifications(
+            archive=options.get("archive"),
+            batch_size=options.get("batch_size"),
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Purged {stats['total_deleted']} notifications "
+                f"(expired={stats['expired_deleted']}, read={stats['read_deleted']}, "
+                f"archived={stats['archived']})"
+            )
+        )
+        if stats["archive_path"]:
+            self.stdout.write(f"Archive: {stats['archive_path']}")
@@ -0,0 +1,57 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from communications.services import seed_notification_preferences
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Backfill default in-app and email notification preferences for existing users."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Users seeded per batch (default: 1000).",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Process every user, adding per-type rows for newly added notification types.",
+        )
+        parser.add_argument(
+            "--no-email",
+            action="store_true",
+            help="Only seed in-app preferences.",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        email = not options["no_email"]
+
+        users = User.objects.all()
+        if not options["all"]:
+            missing = Q(notification_preferences__isnull=True)
+            if email:
+                missing |= Q(email_notification_preferences__isnull=True)
+            users = users.filter(missing)
+
+        pk_name = User._meta.pk.name
+        last_pk = None
+        total = 0
+        while True:
+            chunk = users.order_by(pk_name)
+            if last_pk is not None:
+                chunk = chunk.filter(pk__gt=last_pk)
+            user_ids = list(chunk.values_list("pk", flat=True)[:chunk_size])
+            if not user_ids:
+                break
+            seed_notification_preferences(user_ids, email=email)
+            total += len(user_ids)
+            last_pk = user_ids[-1]
+            self.stdout.write(f"Seeded preferences for {total} users...")
+
+        self.stdout.write(self.style.SUCCESS(f"Notification preferences seeded for {total} users"))
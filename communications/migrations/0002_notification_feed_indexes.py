@@ -0,0 +1,32 @@
+# Generated by Django 5.2.4 on 2026-10-18 21:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communications', '0001_initial'),
+        ('projects', '0003_project_milestones_project_technologies_used_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', '-created_at', '-notification_id'], name='idx_notif_user_feed'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['user', '-created_at', '-notification_id'], name='idx_notif_user_unread'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', 'notification_type', '-created_at', '-notification_id'], name='idx_notif_user_type_feed'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', 'priority', '-created_at', '-notification_id'], name='idx_notif_user_prio_feed'),
+        ),
+    ]
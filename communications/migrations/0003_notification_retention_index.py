@@ -0,0 +1,20 @@
+# Generated by Django 5.2.4 on 2026-10-18 21:39
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communications', '0002_notification_feed_indexes'),
+        ('projects', '0003_project_milestones_project_technologies_used_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('is_read', True)), fields=['notification_type', 'created_at'], name='idx_notif_read_type_created'),
+        ),
+    ]
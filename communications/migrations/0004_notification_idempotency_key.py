@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 21:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communications', '0003_notification_retention_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='idempotency_key',
+            field=models.CharField(blank=True, editable=False, help_text='Hash identifying a logical event; duplicates are skipped on insert', max_length=64, null=True, unique=True),
+        ),
+    ]
@@ -163,12 +163,45 @@ class Notification(TimeStampedModel):
     )
     is_read = models.BooleanField(default=False)
     expires_at = models.DateTimeField(null=True, blank=True)
+    idempotency_key = models.CharField(
+        max_length=64,
+        unique=True,
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_('Hash identifying a logical event; duplicates are skipped on insert')
+    )
 
     class Meta:
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['user', 'is_read', 'created_at'], name='idx_notif_user_read'),
             models.Index(fields=['expires_at'], name='idx_notif_expires'),
+            # Feed ordering (created_at, notification_id) used by cursor pagination
+            models.Index(
+                fields=['user', '-created_at', '-notification_id'],
+                name='idx_notif_user_feed',
+            ),
+            # Unread feed and unread_count: only unread rows are indexed
+            models.Index(
+                fields=['user', '-created_at', '-notification_id'],
+                name='idx_notif_user_unread',
+                condition=models.Q(is_read=False),
+            ),
+            models.Index(
+                fields=['user', 'notification_type', '-created_at', '-notification_id'],
+                name='idx_notif_user_type_feed',
+            ),
+            models.Index(
+                fields=['user', 'priority', '-created_at', '-notification_id'],
+                name='idx_notif_user_prio_feed',
+            ),
+            # Retention: old read rows per type, scanned in batches by the purge job
+            models.Index(
+                fields=['notification_type', 'created_at'],
+                name='idx_notif_read_type_created',
+                condition=models.Q(is_read=True),
+            ),
         ]
 
     def __str__(self):
@@ -0,0 +1,196 @@
+"""
+Process-wide registry of NotificationType rows.
+
+Notification types are a handful of near-static rows that are looked up by
+code on every notification, preference check and preference seeding. The
+registry loads them all with one query and answers code -> id /
+default_frequency lookups from memory.
+
+Invalidation: saving or deleting a NotificationType clears the local copy
+and, once the transaction commits, publishes a message on a Redis channel so
+every other web/Celery worker drops its copy too. A TTL bounds staleness if a
+broadcast is missed (e.g. Redis was unavailable). The listener thread does
+not survive a fork (Celery prefork children, ``gunicorn --preload``), so a
+forked child drops the registry state and subscribes again on first use.
+"""
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from django.db import transaction
+
+from communications.models import NotificationType
+from utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "communications:notification_types:invalidate"
+REGISTRY_TTL_SECONDS = 300
+
+
+@dataclass(frozen=True)
+class NotificationTypeEntry:
+    id: int
+    code: str
+    name: str
+    default_frequency: str
+    is_active: bool
+
+
+_lock = threading.Lock()
+_entries: Optional[dict[str, NotificationTypeEntry]] = None
+_loaded_at = 0.0
+_subscriber = None
+# Set while a NotificationType change made in this process is uncommitted
+_dirty = False
+
+
+def _query() -> dict[str, NotificationTypeEntry]:
+    rows = NotificationType.objects.values_list(
+        "id", "code", "name", "default_frequency", "is_active"
+    )
+    return {row[1]: NotificationTypeEntry(*row) for row in rows}
+
+
+def _load() -> dict[str, NotificationTypeEntry]:
+    global _entries, _loaded_at, _dirty
+    if _dirty:
+        if transaction.get_connection().in_atomic_block:
+            # Uncommitted type changes are visible here and may be rolled back
+            return _query()
+        # The transaction that changed types has ended (committed or rolled back)
+        with _lock:
+            _dirty = False
+    entries = _query()
+    with _lock:
+        _entries = entries
+        _loaded_at = time.monotonic()
+    _ensure_subscribed()
+    logger.debug("[REGISTRY] Notification types loaded", extra={"count": len(entries)})
+    return entries
+
+
+def _snapshot() -> dict[str, NotificationTypeEntry]:
+    entries = _entries
+    if entries is None or _dirty or time.monotonic() - _loaded_at > REGISTRY_TTL_SECONDS:
+        entries = _load()
+    return entries
+
+
+def get(code: str) -> Optional[NotificationTypeEntry]:
+    """
+    Return the entry for ``code`` or None if no such type exists.
+
+    A miss triggers one reload, so a type created by another process is
+    found even if its broadcast has not arrived yet.
+    """
+    entry = _snapshot().get(code)
+    if entry is None:
+        entry = _load().get(code)
+    return entry
+
+
+def get_type_id(code: str, name: Optional[str] = None) -> int:
+    """Return the NotificationType id for ``code``, creating the type if missing."""
+    entry = get(code)
+    if entry is not None:
+        return entry.id
+
+    ntype, created = NotificationType.objects.get_or_create(
+        code=code,
+        defaults={"name": name or code.replace("_", " ").title(), "description": "", "is_active": True},
+    )
+    if created:
+        logger.info("[REGISTRY] NotificationType created", extra={"code": code, "id": ntype.pk})
+    return ntype.pk
+
+
+def get_default_frequency(code: str) -> Optional[str]:
+    """Return the default frequency for ``code`` or None if the type is unknown."""
+    entry = get(code)
+    return entry.default_frequency if entry else None
+
+
+def active_types() -> list[NotificationTypeEntry]:
+    """Return entries for all active notification types."""
+    return [entry for entry in _snapshot().values() if entry.is_active]
+
+
+def clear() -> None:
+    """Drop the local copy; the next lookup reloads from the database."""
+    global _entries
+    with _lock:
+        _entries = None
+
+
+def invalidate() -> None:
+    """
+    Clear the local copy now and tell other processes to do the same once the
+    current transaction commits.
+    """
+    global _dirty
+    clear()
+    if transaction.get_connection().in_atomic_block:
+        with _lock:
+            _dirty = True
+    transaction.on_commit(_publish_invalidation)
+
+
+def _publish_invalidation() -> None:
+    global _dirty
+    with _lock:
+        _dirty = False
+    clear()
+    try:
+        get_redis().publish(INVALIDATION_CHANNEL, "1")
+    except Exception:
+        logger.warning("[REGISTRY] Could not broadcast notification type invalidation", exc_info=True)
+
+
+def _on_invalidation_message(message) -> None:
+    clear()
+
+
+def _ensure_subscribed() -> None:
+    """Start the background pub/sub listener once per process."""
+    global _subscriber
+    if _subscriber is not None:
+        return
+    with _lock:
+        if _subscriber is not None:
+            return
+        try:
+            pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{INVALIDATION_CHANNEL: _on_invalidation_message})
+            _subscriber = pubsub.run_in_thread(
+                sleep_time=1, daemon=True, exception_handler=_on_subscriber_error
+            )
+        except Exception:
+            # Redis unavailable: rely on the TTL refresh instead
+            _subscriber = False
+            logger.warning("[REGISTRY] Could not subscribe to notification type invalidations", exc_info=True)
+
+
+def _reset_after_fork() -> None:
+    """Forget the parent's listener (its thread isn't running here) and cached types."""
+    global _lock, _entries, _subscriber, _dirty
+    _lock = threading.Lock()
+    _entries = None
+    _subscriber = None
+    _dirty = False
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _on_subscriber_error(exc, pubsub, worker_thread) -> None:
+    global _subscriber
+    logger.warning("[REGISTRY] Invalidation listener stopped", exc_info=exc)
+    worker_thread.stop()
+    pubsub.close()
+    with _lock:
+        _subscriber = None
+    clear()
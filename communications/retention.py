@@ -0,0 +1,188 @@
+import gzip
+import json
+import logging
+import os
+from datetime import timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from communications.models import Notification, NotificationType
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FIELDS = (
+    'notification_id',
+    'user_id',
+    'notification_type_id',
+    'title',
+    'message',
+    'triggered_by_user_id',
+    'triggered_by_type',
+    'related_startup_id',
+    'related_project_id',
+    'related_message_id',
+    'priority',
+    'is_read',
+    'expires_at',
+    'created_at',
+    'updated_at',
+)
+
+DEFAULT_RETENTION = {
+    'batch_size': 1000,
+    'max_batches': 100,
+    'archive': False,
+    'archive_dir': None,
+    'default': {
+        'purge_expired': True,
+        'read_after_days': 90,
+    },
+    'types': {},
+}
+
+
+def get_retention_config() -> dict:
+    """Return the retention config merged over DEFAULT_RETENTION."""
+    configured = getattr(settings, 'COMMUNICATIONS_NOTIFICATION_RETENTION', None) or {}
+    config = {**DEFAULT_RETENTION, **configured}
+    config['default'] = {**DEFAULT_RETENTION['default'], **configured.get('default', {})}
+    config['types'] = dict(configured.get('types', {}))
+    if not config['archive_dir']:
+        config['archive_dir'] = os.path.join(settings.BASE_DIR, 'archive', 'notifications')
+    return config
+
+
+def get_type_policy(config: dict, type_code: str) -> dict:
+    """Return the effective retention policy for a notification type code."""
+    return {**config['default'], **config['types'].get(type_code, {})}
+
+
+class NotificationArchiver:
+    """Appends notification rows to a gzip-compressed JSONL file."""
+
+    def __init__(self, archive_dir: str, run_started_at):
+        self.path = os.path.join(
+            archive_dir,
+            f"notifications-{run_started_at.strftime('%Y%m%dT%H%M%S')}.jsonl.gz",
+        )
+        os.makedirs(archive_dir, exist_ok=True)
+
+    def write(self, rows: list[dict]) -> int:
+        with gzip.open(self.path, 'at', encoding='utf-8') as fh:
+            for row in rows:
+                fh.write(json.dumps(row, cls=DjangoJSONEncoder))
+                fh.write('\n')
+        return len(rows)
+
+
+def _purge_in_batches(queryset, *, batch_size: int, max_batches: int,
+                      archiver: Optional[NotificationArchiver]) -> tuple[int, int, int]:
+    """
+    Delete rows of ``queryset`` in bounded batches, archiving each batch first.
+
+    Every batch runs in its own short transaction so locks are held briefly and
+    WAL is produced in small increments. Returns (deleted, archived, batches).
+    """
+    deleted = archived = batches = 0
+    while batches < max_batches:
+        with transaction.atomic():
+            pks = list(queryset.values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                break
+            batch_qs = Notification.objects.filter(pk__in=pks)
+            if archiver is not None:
+                archived += archiver.write(list(batch_qs.values(*ARCHIVE_FIELDS)))
+            count, _ = batch_qs.delete()
+            deleted += count
+        batches += 1
+        if len(pks) < batch_size:
+            break
+    return deleted, archived, batches
+
+
+def purge_notifications(*, archive: Optional[bool] = None, batch_size: Optional[int] = None,
+                        now=None) -> dict:
+    """
+    Delete expired notifications and old read notifications according to the
+    per-type retention policies in COMMUNICATIONS_NOTIFICATION_RETENTION.
+
+    Policy keys (per type, falling back to ``default``):
+        purge_expired: delete rows whose ``expires_at`` has passed.
+        read_after_days: delete read rows created more than N days ago
+            (``None`` keeps read rows forever).
+        archive: write rows to a compressed JSONL file before deleting.
+
+    Returns:
+        dict: run metrics — totals plus a per-type breakdown.
+    """
+    config = get_retention_config()
+    now = now or timezone.now()
+    batch_size = batch_size or config['batch_size']
+    max_batches = config['max_batches']
+
+    stats = {
+        'started_at': now.isoformat(),
+        'expired_deleted': 0,
+        'read_deleted': 0,
+        'archived': 0,
+        'batches': 0,
+        'archive_path': None,
+        'by_type': {},
+    }
+    archiver = None
+
+    for ntype_id, code in NotificationType.objects.values_list('id', 'code'):
+        policy = get_type_policy(config, code)
+        should_archive = policy.get('archive', config['archive']) if archive is None else archive
+        if should_archive and archiver is None:
+            archiver = NotificationArchiver(config['archive_dir'], now)
+            stats['archive_path'] = archiver.path
+        type_archiver = archiver if should_archive else None
+        type_stats = {'expired_deleted': 0, 'read_deleted': 0}
+
+        if policy.get('purge_expired'):
+            expired_qs = Notification.objects.filter(
+                notification_type_id=ntype_id,
+                expires_at__lt=now,
+            )
+            deleted, archived, batches = _purge_in_batches(
+                expired_qs, batch_size=batch_size, max_batches=max_batches, archiver=type_archiver,
+            )
+            type_stats['expired_deleted'] = deleted
+            stats['archived'] += archived
+            stats['batches'] += batches
+
+        read_after_days = policy.get('read_after_days')
+        if read_after_days is not None:
+            read_qs = Notification.objects.filter(
+                notification_type_id=ntype_id,
+                is_read=True,
+                created_at__lt=now - timedelta(days=read_after_days),
+            )
+            deleted, archived, batches = _purge_in_batches(
+                read_qs, batch_size=batch_size, max_batches=max_batches, archiver=type_archiver,
+            )
+            type_stats['read_deleted'] = deleted
+            stats['archived'] += archived
+            stats['batches'] += batches
+
+        stats['expired_deleted'] += type_stats['expired_deleted']
+        stats['read_deleted'] += type_stats['read_deleted']
+        if type_stats['expired_deleted'] or type_stats['read_deleted']:
+            stats['by_type'][code] = type_stats
+
+    stats['total_deleted'] = stats['expired_deleted'] + stats['read_deleted']
+    logger.info(
+        "notifications.retention purged=%d expired=%d read=%d archived=%d batches=%d",
+        stats['total_deleted'],
+        stats['expired_deleted'],
+        stats['read_deleted'],
+        stats['archived'],
+        stats['batches'],
+        extra={'retention_stats': stats},
+    )
+    return stats
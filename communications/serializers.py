@@ -11,6 +11,7 @@ from .models import (
     EmailNotificationTypePreference,
 )
 from investors.models import Investor
+from mixins.sparse_fields_mixin import SparseFieldsetSerializerMixin
 
 class NotificationTypeSerializer(serializers.ModelSerializer):
     """Serializer for notification types."""
@@ -286,7 +287,7 @@ class UserEmailNotificationPreferenceSerializer(serializers.ModelSerializer):
         return instance
 
 
-class NotificationSerializer(serializers.ModelSerializer):
+class NotificationSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """Serializer for notifications."""
     notification_type = NotificationTypeSerializer(read_only=True)
     priority_display = serializers.CharField(
@@ -315,6 +316,14 @@ class NotificationSerializer(serializers.ModelSerializer):
         read_only_fields = [
             'notification_id', 'created_at', 'updated_at'
         ]
+        field_sources = {
+            'priority_display': ('priority',),
+            'actor': ('triggered_by_type', 'triggered_by_user__first_name', 'triggered_by_user__last_name'),
+            'redirect': (
+                'related_message_id', 'related_project', 'related_startup_id',
+                'triggered_by_type', 'triggered_by_user__user_id',
+            ),
+        }
 
     def _get_investor_from_user(self, user):
         """Return Investor instance for a user, if present, else None."""
@@ -1,11 +1,14 @@
+import hashlib
 import logging
 from typing import Optional
 
 from django.contrib.auth import get_user_model
 from django.db import transaction
+from django.utils import timezone
 
 from projects.models import Project
 
+from communications import registry
 from communications.models import (
     Notification,
     NotificationType,
@@ -20,6 +23,9 @@ from communications.models import (
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
+# Events with the same idempotency key inside this window collapse into one notification
+NOTIFICATION_DEDUP_WINDOW_SECONDS = 1
+
 def _get_user_pref(user: User) -> Optional[UserNotificationPreference]:
     try:
         return UserNotificationPreference.objects.get(user=user)
@@ -27,6 +33,65 @@ def _get_user_pref(user: User) -> Optional[UserNotificationPreference]:
         return None
 
 
+def seed_notification_preferences(users, *, in_app: bool = True, email: bool = True,
+                                  batch_size: int = 1000) -> None:
+    """Create default notification preferences for one or many users.
+
+    Inserts the in-app and/or email preference rows plus one per-type row for
+    every active NotificationType, using ``bulk_create(ignore_conflicts=True)``
+    so the statement count doesn't depend on the number of users or types.
+    Existing rows (and user-customised values) are left untouched.
+
+    Args:
+        users: iterable of User instances or user ids.
+        in_app: seed UserNotificationPreference and per-type frequencies.
+        email: seed EmailNotificationPreference and per-type toggles.
+        batch_size: maximum rows per INSERT statement.
+    """
+    user_ids = [getattr(user, 'pk', user) for user in users]
+    if not user_ids:
+        return
+    active_types = registry.active_types()
+
+    with transaction.atomic():
+        if in_app:
+            UserNotificationPreference.objects.bulk_create(
+                [UserNotificationPreference(user_id=uid) for uid in user_ids],
+                ignore_conflicts=True,
+                batch_size=batch_size,
+            )
+            UserNotificationTypePreference.objects.bulk_create(
+                [
+                    UserNotificationTypePreference(
+                        user_preference_id=uid,
+                        notification_type_id=ntype.id,
+                        frequency=ntype.default_frequency,
+                    )
+                    for uid in user_ids for ntype in active_types
+                ],
+                ignore_conflicts=True,
+                batch_size=batch_size,
+            )
+        if email:
+            EmailNotificationPreference.objects.bulk_create(
+                [EmailNotificationPreference(user_id=uid) for uid in user_ids],
+                ignore_conflicts=True,
+                batch_size=batch_size,
+            )
+            EmailNotificationTypePreference.objects.bulk_create(
+                [
+                    EmailNotificationTypePreference(
+                        email_preference_id=uid,
+                        notification_type_id=ntype.id,
+                        enabled=True,
+                    )
+                    for uid in user_ids for ntype in active_types
+                ],
+                ignore_conflicts=True,
+                batch_size=batch_size,
+            )
+
+
 def get_or_create_user_pref(user: User) -> UserNotificationPreference:
     """Return user's notification preferences, creating and seeding if absent.
 
@@ -36,38 +101,18 @@ def get_or_create_user_pref(user: User) -> UserNotificationPreference:
     pref = _get_user_pref(user)
     if pref:
         return pref
-    
-    with transaction.atomic():
-        pref = UserNotificationPreference.objects.create(user=user)
-        active_types = NotificationType.objects.filter(is_active=True)
-        to_create = [
-            UserNotificationTypePreference(
-                user_preference=pref,
-                notification_type=ntype,
-                frequency=ntype.default_frequency,
-            ) for ntype in active_types
-        ]
-        if to_create:
-            UserNotificationTypePreference.objects.bulk_create(to_create)
-    return pref
+
+    seed_notification_preferences([user], email=False)
+    return UserNotificationPreference.objects.get(user=user)
 
 def get_or_create_email_pref(user: User) -> EmailNotificationPreference:
     """Return user's email notification preferences, creating them if absent."""
-    with transaction.atomic():
-        email_pref, created = EmailNotificationPreference.objects.get_or_create(user=user)
-
-        if created:
-            active_types = NotificationType.objects.filter(is_active=True)
-            to_create = [
-                EmailNotificationTypePreference(
-                    email_preference=email_pref,
-                    notification_type=ntype,
-                    enabled=True
-                ) for ntype in active_types
-            ]
-            if to_create:
-                EmailNotificationTypePreference.objects.bulk_create(to_create)
-    return email_pref
+    email_pref = EmailNotificationPreference.objects.filter(user=user).first()
+    if email_pref:
+        return email_pref
+
+    seed_notification_preferences([user], in_app=False)
+    return EmailNotificationPreference.objects.get(user=user)
 
 
 def _get_type_pref(pref: UserNotificationPreference, ntype: NotificationType) -> Optional[UserNotificationTypePreference]:
@@ -124,16 +169,15 @@ def create_in_app_notification(user, type_code, title, message, related_project=
     """
     Creates an in-app notification.
     """
-    try:
-        notification_type = NotificationType.objects.get(code=type_code)
-    except NotificationType.DoesNotExist:
+    notification_type = registry.get(type_code)
+    if notification_type is None:
         logger.error(f"Attempted to create notification with non-existent type_code: {type_code}")
         return None
     
     try:
         notification_kwargs = {
             'user': user,
-            'notification_type': notification_type,
+            'notification_type_id': notification_type.id,
             'title': title,
             'message': message,
         }
@@ -153,6 +197,33 @@ def create_in_app_notification(user, type_code, title, message, related_project=
         return None
 
 
+def build_idempotency_key(type_code, recipient_id, triggered_by_id, related, *, now=None,
+                          window_seconds=NOTIFICATION_DEDUP_WINDOW_SECONDS) -> str:
+    """
+    Return a sha256 key identifying a notification event.
+
+    ``related`` identifies the related object, e.g. ``"startup:12"``. Events
+    are bucketed by ``window_seconds`` so repeats within a window share a key.
+    """
+    now = now or timezone.now()
+    bucket = int(now.timestamp()) // window_seconds
+    raw = f"{type_code}|{recipient_id}|{triggered_by_id or ''}|{related or ''}|{bucket}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def create_notification_once(**fields) -> Notification:
+    """
+    Insert a notification with ``INSERT ... ON CONFLICT DO NOTHING``.
+
+    ``fields`` must include ``idempotency_key``; a row with the same key makes
+    the insert a no-op, so deduplication costs no extra query. Note that
+    ``bulk_create`` does not send ``post_save``.
+    """
+    notification = Notification(**fields)
+    Notification.objects.bulk_create([notification], ignore_conflicts=True)
+    return notification
+
+
 def should_send_email_notification(user, notification_type_code):
     """
     Check if an email notification should be sent to a user for a given notification type.
@@ -172,8 +243,11 @@ def should_send_email_notification(user, notification_type_code):
         return False
 
     try:
+        notification_type = registry.get(notification_type_code)
+        if notification_type is None:
+            raise NotificationType.DoesNotExist
         email_pref = get_or_create_email_pref(user)
-        type_pref = email_pref.types_enabled.get(notification_type__code=notification_type_code)
+        type_pref = email_pref.types_enabled.get(notification_type_id=notification_type.id)
         return type_pref.enabled
     except (EmailNotificationTypePreference.DoesNotExist, NotificationType.DoesNotExist, EmailNotificationPreference.DoesNotExist):
         logger.warning(
@@ -1,20 +1,21 @@
 import logging
 from django.conf import settings
 from django.db import transaction
-from django.db.models.signals import post_save, post_migrate
+from django.db.models.signals import post_save, post_delete, post_migrate
 from django.apps import apps
 from django.dispatch import receiver
-from datetime import timedelta
-from django.utils import timezone
 
 from .models import (
-    UserNotificationPreference,
     NotificationType,
-    UserNotificationTypePreference,
-    Notification,
     NotificationTrigger,
     NotificationPriority,
 )
+from . import registry
+from .services import (
+    build_idempotency_key,
+    create_notification_once,
+    seed_notification_preferences,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -31,35 +32,20 @@ def _to_int(value):
 def create_user_notification_preferences(sender, instance, created, **kwargs):
     """
     Create default notification preferences and per-type preferences when a new user is created.
+    Runs a constant number of INSERTs regardless of how many notification types exist.
     """
     logger.debug(
         "[SIGNAL] create_user_notification_preferences fired",
         extra={"sig_created": bool(created), "user_id": getattr(instance, "pk", None)},
     )
     if created:
-        preference, pref_created = UserNotificationPreference.objects.get_or_create(user=instance)
+        # Email preferences are still created lazily by get_or_create_email_pref
+        seed_notification_preferences([instance], email=False)
         logger.info(
-            "[SIGNAL] UserNotificationPreference ensured",
-            extra={"user_id": getattr(instance, "pk", None), "pref_created": pref_created},
+            "[SIGNAL] Notification preferences seeded",
+            extra={"user_id": getattr(instance, "pk", None)},
         )
 
-        notification_types = NotificationType.objects.filter(is_active=True)
-        logger.debug(
-            "[SIGNAL] Active notification types fetched",
-            extra={"count": notification_types.count()},
-        )
-        for nt in notification_types:
-            _, utp_created = UserNotificationTypePreference.objects.get_or_create(
-                user_preference=preference,
-                notification_type=nt,
-                defaults={"frequency": nt.default_frequency},
-            )
-            if utp_created:
-                logger.debug(
-                    "[SIGNAL] Type preference created",
-                    extra={"user_id": instance.pk, "nt_code": nt.code},
-                )
-
 
 @receiver(post_migrate)
 def create_initial_notification_types(sender, **kwargs):
@@ -69,6 +55,8 @@ def create_initial_notification_types(sender, **kwargs):
     if sender.name != "communications":
         return
 
+    registry.clear()
+
     global _types_seeded
     if _types_seeded:
         logger.debug("[SIGNAL] Notification types already seeded, skipping")
@@ -108,6 +96,7 @@ def create_initial_notification_types(sender, **kwargs):
                 for nt in to_create
             ]
             NotificationType.objects.bulk_create(objs, ignore_conflicts=True)
+            registry.invalidate()
             logger.info(
                 "[SIGNAL] NotificationType bulk_create done",
                 extra={"inserted_codes": [o.code for o in objs]},
@@ -117,20 +106,48 @@ def create_initial_notification_types(sender, **kwargs):
     logger.debug("[SIGNAL] Types seeding marked as done")
 
 
-def _get_or_create_ntype(code: str, name: str | None = None) -> NotificationType:
-    ntype = NotificationType.objects.filter(code=code).first()
-    if ntype:
-        logger.debug("[SIGNAL] NotificationType found", extra={"code": code, "id": ntype.pk})
-        return ntype
-    ntype, created = NotificationType.objects.get_or_create(
-        code=code,
-        defaults={"name": name or code.replace("_", " ").title(), "description": "", "is_active": True},
-    )
-    logger.info(
-        "[SIGNAL] NotificationType ensured",
-        extra={"code": code, "created_now": created, "id": getattr(ntype, "pk", None)},
-    )
-    return ntype
+@receiver(post_save, sender=NotificationType)
+@receiver(post_delete, sender=NotificationType)
+def invalidate_notification_type_registry(sender, **kwargs):
+    """Refresh the NotificationType registry in every process when a type changes."""
+    registry.invalidate()
+
+
+def _schedule_follow_notification(*, type_code: str, type_name: str, related: str, fields: dict):
+    """
+    Create a follow notification as a single ``INSERT ... ON CONFLICT DO NOTHING``.
+
+    Duplicates (same type, recipient, trigger, related object and time bucket)
+    share an idempotency key and are dropped by the unique constraint. The insert
+    runs on commit when called inside a transaction.
+    """
+    def safe_create():
+        try:
+            fields["notification_type_id"] = registry.get_type_id(type_code, type_name)
+            fields["idempotency_key"] = build_idempotency_key(
+                type_code, fields["user_id"], fields.get("triggered_by_user_id"), related,
+            )
+            notif = create_notification_once(**fields)
+            logger.info(
+                "[SIGNAL] Follow notification inserted (duplicates ignored)",
+                extra={
+                    "notification_id": str(notif.notification_id),
+                    "user_id": fields["user_id"],
+                    "related": related,
+                    "nt_code": type_code,
+                },
+            )
+        except Exception:
+            logger.error("[SIGNAL] Failed to create follow notification", exc_info=True)
+
+    conn = transaction.get_connection()
+    if conn.in_atomic_block:
+        logger.debug("[SIGNAL] In atomic block; scheduling on_commit")
+        transaction.on_commit(safe_create)
+    else:
+        logger.debug("[SIGNAL] Not in atomic block; creating immediately")
+        safe_create()
+
 
 def _connect_saved_startup_signal():
     try:
@@ -211,90 +228,20 @@ def _connect_saved_startup_signal():
         title = "New follower"
         message = f"{inv_name} followed your startup."
 
-        # Ensure notification type
-        ntype = NotificationType.objects.filter(code="startup_followed", is_active=True).first()
-        if not ntype:
-            logger.debug("[SIGNAL] NotificationType 'startup_followed' not found, creating")
-            ntype = _get_or_create_ntype("startup_followed", "Startup Followed")
-            
-        now = timezone.now()
-        second_start = now.replace(microsecond=0)
-        second_end = second_start + timedelta(seconds=1)
-
-        # Deduplication
-        base_qs = Notification.objects.filter(
-            user=startup_user,
-            notification_type=ntype,
-            triggered_by_user=investor_user,
-            related_startup_id=sid,
-            created_at__gte=second_start,
-            created_at__lt=second_end,
+        _schedule_follow_notification(
+            type_code="startup_followed",
+            type_name="Startup Followed",
+            related=f"startup:{sid}",
+            fields={
+                "user_id": startup_user.pk,
+                "title": title,
+                "message": message,
+                "triggered_by_user_id": investor_user.pk,
+                "triggered_by_type": NotificationTrigger.INVESTOR,
+                "priority": NotificationPriority.LOW,
+                "related_startup_id": sid,
+            },
         )
-        if base_qs.exists():
-            logger.info(
-                "[SIGNAL] Duplicate",
-                extra={
-                    "startup_user_id": startup_user.pk,
-                    "investor_user_id": investor_user.pk,
-                    "startup_id": sid,
-                    "second_start": second_start.isoformat(),
-                },
-            )
-            return
-
-        def _create():
-            _now = timezone.now()
-            _second_start = _now.replace(microsecond=0)
-            _second_end = _second_start + timedelta(seconds=1)
-            
-            # double-check inside transaction/on_commit
-            if Notification.objects.filter(
-                user=startup_user,
-                notification_type=ntype,
-                triggered_by_user=investor_user,
-                related_startup_id=sid,
-                created_at__gte=_second_start,
-                created_at__lt=_second_end,
-            ).exists():
-                logger.info(
-                    "[SIGNAL] Duplicate within same second (re-check)",
-                    extra={"startup_id": sid, "second_start": _second_start.isoformat()},
-                )
-                return
-
-            notif = Notification.objects.create(
-                user=startup_user,
-                notification_type=ntype,
-                title=title,
-                message=message,
-                triggered_by_user=investor_user,
-                triggered_by_type=NotificationTrigger.INVESTOR,
-                priority=NotificationPriority.LOW,
-                related_startup_id=sid,
-            )
-            logger.info(
-                "[SIGNAL] Notification created",
-                extra={
-                    "notification_id": str(getattr(notif, "notification_id", "")),
-                    "user_id": startup_user.pk,
-                    "startup_id": sid,
-                    "investor_user_id": investor_user.pk,
-                },
-            )
-
-        def safe_create():
-            try:
-                _create()
-            except Exception:
-                logger.error("[SIGNAL] Failed to create notification", exc_info=True)
-
-        conn = transaction.get_connection()
-        if conn.in_atomic_block:
-            logger.debug("[SIGNAL] In atomic block; scheduling on_commit")
-            transaction.on_commit(safe_create)
-        else:
-            logger.debug("[SIGNAL] Not in atomic block; creating immediately")
-            safe_create()
 
     _handlers.append(notify_startup_followed)
     logger.info("[SIGNAL] _connect_saved_startup_signal handler registered",
@@ -391,87 +338,20 @@ def _connect_project_follow_signal():
         title = "New Project Follower"
         message = f"{investor_name} is now following your project '{project_title}'."
 
-        ntype = NotificationType.objects.filter(code="project_followed", is_active=True).first()
-        if not ntype:
-            logger.debug("[SIGNAL] NotificationType 'project_followed' not found, creating")
-            ntype = _get_or_create_ntype("project_followed", "Project Followed")
-            
-        now = timezone.now()
-        second_start = now.replace(microsecond=0)
-        second_end = second_start + timedelta(seconds=1)
-
-        base_qs = Notification.objects.filter(
-            user=startup_user,
-            notification_type=ntype,
-            triggered_by_user=investor_user,
-            related_project=project,
-            created_at__gte=second_start,
-            created_at__lt=second_end,
+        _schedule_follow_notification(
+            type_code="project_followed",
+            type_name="Project Followed",
+            related=f"project:{project_id}",
+            fields={
+                "user_id": startup_user.pk,
+                "title": title,
+                "message": message,
+                "triggered_by_user_id": investor_user.pk,
+                "triggered_by_type": NotificationTrigger.INVESTOR,
+                "priority": NotificationPriority.MEDIUM,
+                "related_project_id": project_id,
+            },
         )
-        if base_qs.exists():
-            logger.info(
-                "[SIGNAL] Duplicate project follow notification",
-                extra={
-                    "startup_user_id": startup_user.pk,
-                    "investor_user_id": investor_user.pk,
-                    "project_id": project_id,
-                    "second_start": second_start.isoformat(),
-                },
-            )
-            return
-
-        def _create():
-            _now = timezone.now()
-            _second_start = _now.replace(microsecond=0)
-            _second_end = _second_start + timedelta(seconds=1)
-            
-            if Notification.objects.filter(
-                user=startup_user,
-                notification_type=ntype,
-                triggered_by_user=investor_user,
-                related_project=project,
-                created_at__gte=_second_start,
-                created_at__lt=_second_end,
-            ).exists():
-                logger.info(
-                    "[SIGNAL] Duplicate project follow notification within same second (re-check)",
-                    extra={"project_id": project_id, "second_start": _second_start.isoformat()},
-                )
-                return
-
-            notif = Notification.objects.create(
-                user=startup_user,
-                notification_type=ntype,
-                title=title,
-                message=message,
-                triggered_by_user=investor_user,
-                triggered_by_type=NotificationTrigger.INVESTOR,
-                priority=NotificationPriority.MEDIUM,
-                related_project=project,
-            )
-            logger.info(
-                "[SIGNAL] Project follow notification created",
-                extra={
-                    "notification_id": str(getattr(notif, "notification_id", "")),
-                    "user_id": startup_user.pk,
-                    "project_id": project_id,
-                    "investor_user_id": investor_user.pk,
-                },
-            )
-
-        def safe_create():
-            try:
-                _create()
-            except Exception:
-                logger.error("[SIGNAL] Failed to create project follow notification", exc_info=True)
-
-        conn = transaction.get_connection()
-        if conn.in_atomic_block:
-            logger.debug("[SIGNAL] In atomic block; scheduling on_commit")
-            transaction.on_commit(safe_create)
-        else:
-            logger.debug("[SIGNAL] Not in atomic block; creating immediately")
-            safe_create()
 
     _handlers.append(notify_project_followed)
     logger.info("[SIGNAL] _connect_project_follow_signal handler registered",
@@ -27,3 +27,14 @@ def send_notification_task(user_id, notification_data):
             logger.info("Notification sent to user %s", user_id)
     except Exception as e:
         logger.error("Failed to send notification to user %s: %s", user_id, e)
+
+
+@shared_task
+def purge_notifications_task(archive=None):
+    """
+    Celery task to delete expired and old read notifications in bounded batches.
+    Scheduled daily via Celery Beat; returns the run metrics.
+    """
+    from communications.retention import purge_notifications
+
+    return purge_notifications(archive=archive)
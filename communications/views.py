@@ -4,20 +4,21 @@ from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 from rest_framework import viewsets, status, mixins, serializers
 from rest_framework.decorators import action
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
 from users.cookie_jwt import CookieJWTAuthentication
 from users.permissions import HasActiveCompanyAccount
+from mixins.sparse_fields_mixin import SparseFieldsetViewMixin
+from . import registry
 from .models import (
     Notification,
     UserNotificationPreference,
     NotificationType,
-    UserNotificationTypePreference,
     EmailNotificationPreference,
-    EmailNotificationTypePreference
 )
+from .services import get_or_create_user_pref, get_or_create_email_pref
 from .serializers import (
     NotificationSerializer,
     UserNotificationPreferenceSerializer,
@@ -31,10 +32,23 @@ class DefaultPageNumberPagination(PageNumberPagination):
     page_size = 10
 
 
+class NotificationCursorPagination(CursorPagination):
+    """
+    Keyset pagination for the notifications feed.
+
+    Pages are addressed by an opaque cursor over (created_at, notification_id)
+    instead of OFFSET, so fetching a deep page costs the same as the first one.
+    Ordering matches the idx_notif_user_* feed indexes.
+    """
+    page_size = 10
+    ordering = ('-created_at', '-notification_id')
+
+
 logger = logging.getLogger(__name__)
 
 
 class NotificationViewSet(
+    SparseFieldsetViewMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
     mixins.DestroyModelMixin,
@@ -49,6 +63,25 @@ class NotificationViewSet(
     lookup_field = 'notification_id'
     http_method_names = ['get', 'post', 'delete', 'head', 'options']
     pagination_class = DefaultPageNumberPagination
+    cursor_pagination_class = NotificationCursorPagination
+    # Cursor pagination reads the ordering columns from the last row
+    sparse_required_fields = ('created_at',)
+
+    @property
+    def paginator(self):
+        """
+        Use cursor pagination when requested via ``?pagination=cursor`` or when a
+        ``cursor`` param is present; page-number pagination stays the default.
+        """
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params if self.request is not None else {}
+            use_cursor = (
+                params.get('pagination') == 'cursor'
+                or self.cursor_pagination_class.cursor_query_param in params
+            )
+            pagination_class = self.cursor_pagination_class if use_cursor else self.pagination_class
+            self._paginator = pagination_class() if pagination_class is not None else None
+        return self._paginator
 
     def get_queryset(self):
         """Return only the authenticated user's notifications with helpful joins and filters.
@@ -58,11 +91,13 @@ class NotificationViewSet(
         - type: notification type code (slug)
         - priority: 'low' | 'medium' | 'high'
         - created_after, created_before: ISO datetime strings
+        - pagination: 'cursor' to switch the list to keyset pagination
         """
         qs = (
             Notification.objects
             .filter(user=self.request.user)
             .select_related('notification_type', 'triggered_by_user')
+            .order_by('-created_at', '-notification_id')
         )
 
         params = self.request.query_params
@@ -85,7 +120,8 @@ class NotificationViewSet(
 
         ntype_code = params.get('type')
         if ntype_code:
-            qs = qs.filter(notification_type__code=ntype_code)
+            ntype = registry.get(ntype_code)
+            qs = qs.filter(notification_type_id=ntype.id) if ntype else qs.none()
 
         priority = params.get('priority')
         if priority in {'low', 'medium', 'high'}:
@@ -227,15 +263,7 @@ class UserNotificationPreferenceViewSet(viewsets.ModelViewSet):
         obj = queryset.first()
 
         if obj is None:
-            obj = UserNotificationPreference.objects.create(user=self.request.user)
-
-            notification_types = NotificationType.objects.filter(is_active=True)
-            for notification_type in notification_types:
-                UserNotificationTypePreference.objects.create(
-                    user_preference=obj,
-                    notification_type=notification_type,
-                    frequency='immediate'
-                )
+            obj = get_or_create_user_pref(self.request.user)
 
         return obj
 
@@ -336,15 +364,7 @@ class EmailNotificationPreferenceViewSet(viewsets.GenericViewSet,
         obj = queryset.first()
 
         if obj is None:
-            obj = EmailNotificationPreference.objects.create(user=self.request.user)
-
-            notification_types = NotificationType.objects.filter(is_active=True)
-            for notification_type in notification_types:
-                EmailNotificationTypePreference.objects.create(
-                    email_preference=obj,
-                    notification_type=notification_type,
-                    enabled=True
-                )
+            obj = get_or_create_email_pref(self.request.user)
 
         return obj
 
@@ -19,6 +19,26 @@ app.conf.beat_schedule = {
         'task': 'users.tasks.check_unbound_inactive_users',
         'schedule': crontab(hour=0, minute=0),
     },
+    'purge-notifications-daily': {
+        'task': 'communications.tasks.purge_notifications_task',
+        'schedule': crontab(hour=3, minute=0),
+    },
+    'compact-project-history-daily': {
+        'task': 'projects.tasks.compact_project_history_task',
+        'schedule': crontab(hour=3, minute=30),
+    },
+    'flush-viewed-startups': {
+        'task': 'investors.tasks.flush_viewed_startups_task',
+        'schedule': 60.0,
+    },
+    'roll-up-popularity-counters': {
+        'task': 'startups.tasks.roll_up_popularity_task',
+        'schedule': 300.0,
+    },
+    'drain-search-index-queue': {
+        'task': 'search.tasks.drain_index_queue_task',
+        'schedule': 60.0,
+    },
 }
 
 @app.task(bind=True)
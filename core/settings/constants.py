@@ -1,3 +1,5 @@
+import sys
+
 # File validation settings
 ALLOWED_IMAGE_EXTENSIONS = ["jpg", "jpeg", "png"]
 ALLOWED_IMAGE_MIME_TYPES = ["image/jpeg", "image/png"]
@@ -76,6 +78,88 @@ COMMUNICATIONS_NOTIFICATION_TYPES = [
     },
 ]
 
+# Communications app: retention of expired and old read notifications.
+# Per-type policies override "default"; see communications.retention.
+COMMUNICATIONS_NOTIFICATION_RETENTION = {
+    'batch_size': 1000,
+    'max_batches': 100,
+    'archive': False,
+    'archive_dir': None,  # defaults to BASE_DIR/archive/notifications
+    'default': {
+        'purge_expired': True,
+        'read_after_days': 90,
+    },
+    'types': {
+        'message_received': {'read_after_days': 30},
+        'activity_summarized': {'read_after_days': 30},
+    },
+}
+
+# Search app: asynchronous Elasticsearch indexing queue
+SEARCH_INDEX_QUEUE = {
+    'key_prefix': 'search:index',
+    'batch_size': 500,      # keys per _bulk request
+    'max_batches': 20,      # per drain run
+    'max_attempts': 5,      # rejected by Elasticsearch before a key is moved to the dead-letter list
+    'schedule_delay': 2,    # seconds; saves within this window share one drain run
+    'lock_timeout': 300,    # seconds; one drain run at a time
+}
+
+# Elasticsearch circuit breaker; while open, search is served from Postgres
+SEARCH_CIRCUIT_BREAKER = {
+    'key_prefix': 'search:breaker',
+    'failure_threshold': 5,  # outage errors within window_seconds that open the circuit
+    'window_seconds': 60,
+    'reset_timeout': 30,     # seconds before Elasticsearch is tried again
+}
+
+# Redis cache for search result pages, invalidated whenever the index is written
+SEARCH_RESULT_CACHE = {
+    'key_prefix': 'search:results',
+    'ttl': 300,
+}
+
+# Redis read-through cache for startup and project detail payloads
+DETAIL_CACHE = {
+    'key_prefix': 'detail',
+    'ttl': 600,
+}
+
+# Projects app: compaction and retention of the change history; see projects.history
+PROJECT_HISTORY = {
+    'merge_window_seconds': 300,  # successive edits by the same editor closer than this are merged
+    'retention_days': None,       # None keeps history forever
+    'batch_size': 500,            # projects (merging) or entries (retention) per batch
+    'max_batches': 20,            # per run
+}
+
+# Investors app: recently viewed startups kept in Redis; see investors.view_history
+VIEW_HISTORY = {
+    'key_prefix': 'investors:viewed',
+    'max_entries': 50,      # most recent startups kept per investor
+    'ttl': 30 * 86400,      # seconds an idle investor's history stays in Redis
+    'batch_size': 1000,     # views upserted into Postgres per batch
+    'lock_timeout': 300,    # seconds; one flush runs at a time
+}
+
+# Startups app: view / save / follow counters kept in Redis and rolled up daily; see startups.popularity
+POPULARITY = {
+    'key_prefix': 'popularity',
+    'batch_size': 1000,       # counter fields written per transaction
+    'lock_timeout': 300,      # seconds; one rollup runs at a time
+    'score_window_days': 30,  # days of counters in popularity_score
+    'weights': {'views': 1, 'saves': 5, 'follows': 10},
+}
+
+# Maximum number of projects accepted by one bulk import request
+PROJECT_BULK_MAX_ITEMS = 100
+
+if 'test' in sys.argv:
+    # Redis outlives a test run and test databases reuse primary keys, so
+    # Redis-backed caches and counters are off unless a test enables them
+    for _config in (SEARCH_RESULT_CACHE, DETAIL_CACHE, VIEW_HISTORY, POPULARITY):
+        _config['enabled'] = False
+
 # Chat words settings
 FORBIDDEN_WORDS_SET = {
     "spam", "scam", "xxx", "viagra", "free money", "lottery", "bitcoin",
@@ -60,7 +60,8 @@ REST_FRAMEWORK: dict[str, Any] = {
     "DEFAULT_THROTTLE_RATES": {
         "user": "10/minute",
         "anon": "5/minute",
-        "resend_email": "5/minute"
+        "resend_email": "5/minute",
+        "autocomplete": "120/minute",
     },
     "DEFAULT_SCHEMA_CLASS": 'drf_spectacular.openapi.AutoSchema'
 }
@@ -231,6 +232,9 @@ ELASTICSEARCH_DSL = {
     },
 }
 
+# Queue index updates in Redis and send them in batches from Celery (search.indexing)
+ELASTICSEARCH_DSL_SIGNAL_PROCESSOR = 'search.indexing.QueuedSignalProcessor'
+
 # Override Elasticsearch index names for testing
 if 'users' in sys.argv:
     ELASTICSEARCH_DSL = {
@@ -99,6 +99,6 @@ class SubscriptionCreateSerializer(serializers.ModelSerializer):
                 investment_share=calculate_investment_share(amount, project_locked.funding_goal),
             )
             project_locked.current_funding = effective_current + amount
-            project_locked.save(update_fields=["current_funding"])
+            project_locked.save(update_fields=["current_funding", "updated_at"])
 
         return subscription
\ No newline at end of file
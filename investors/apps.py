@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class InvestorsConfig(AppConfig):
     name = 'investors'
+
+    def ready(self):
+        import investors.signals
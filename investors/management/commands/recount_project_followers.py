@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from investors.models import recount_follower_counts
+
+
+class Command(BaseCommand):
+    help = "Recompute Project.follower_count from active project follows (e.g. after bulk imports)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--project",
+            type=int,
+            action="append",
+            dest="projects",
+            help="Only recount this project id (repeatable; default: all projects).",
+        )
+
+    def handle(self, *args, **options):
+        updated = recount_follower_counts(options.get("projects"))
+        self.stdout.write(self.style.SUCCESS(f"Recounted followers of {updated} projects"))
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.4 on 2026-10-18 23:34
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_follower_counts(apps, schema_editor):
+    Project = apps.get_model('projects', 'Project')
+    ProjectFollow = apps.get_model('investors', 'ProjectFollow')
+    active = (
+        ProjectFollow.objects.filter(project=OuterRef('pk'), is_active=True)
+        .order_by().values('project').annotate(total=Count('pk')).values('total')
+    )
+    Project.objects.update(
+        follower_count=Coalesce(Subquery(active, output_field=IntegerField()), Value(0))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investors', '0007_projectfollow'),
+        ('projects', '0007_project_follower_count'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='projectfollow',
+            name='idx_project_follow_investor',
+        ),
+        migrations.RemoveIndex(
+            model_name='projectfollow',
+            name='idx_project_follow_project',
+        ),
+        migrations.RemoveIndex(
+            model_name='projectfollow',
+            name='idx_project_follow_is_active',
+        ),
+        migrations.AddIndex(
+            model_name='projectfollow',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['project', '-followed_at'], name='idx_pfollow_project_active'),
+        ),
+        migrations.AddIndex(
+            model_name='projectfollow',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['investor', '-followed_at'], name='idx_pfollow_investor_active'),
+        ),
+        migrations.RunPython(backfill_follower_counts, migrations.RunPython.noop),
+    ]
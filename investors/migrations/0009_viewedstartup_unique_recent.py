@@ -0,0 +1,42 @@
+# Generated by Django 5.2.4 on 2026-10-18 23:43
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def delete_duplicate_views(apps, schema_editor):
+    """Keep only the most recent view of each (investor, startup) pair."""
+    ViewedStartup = apps.get_model('investors', 'ViewedStartup')
+    seen = set()
+    duplicates = []
+    rows = ViewedStartup.objects.order_by('-viewed_at', '-id').values_list('id', 'investor_id', 'startup_id')
+    for pk, investor_id, startup_id in rows.iterator():
+        if (investor_id, startup_id) in seen:
+            duplicates.append(pk)
+        else:
+            seen.add((investor_id, startup_id))
+    ViewedStartup.objects.filter(pk__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investors', '0008_projectfollow_active_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='viewedstartup',
+            name='viewed_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(delete_duplicate_views, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='viewedstartup',
+            index=models.Index(fields=['investor', '-viewed_at'], name='idx_viewed_investor_recent'),
+        ),
+        migrations.AddConstraint(
+            model_name='viewedstartup',
+            constraint=models.UniqueConstraint(fields=('investor', 'startup'), name='unique_investor_viewed_startup'),
+        ),
+    ]
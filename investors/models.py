@@ -1,6 +1,9 @@
 from django.core.validators import MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 from common.company import Company
 from common.enums import Stage
 from core import settings
@@ -142,12 +145,19 @@ class ViewedStartup(models.Model):
         on_delete=models.CASCADE,
         related_name="views"
     )
-    viewed_at = models.DateTimeField(auto_now_add=True)
+    # Set explicitly when views are flushed from Redis; see investors.view_history
+    viewed_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
         verbose_name = "Startup view history"
         verbose_name_plural = "Startup view histories"
         ordering = ["-viewed_at"]
+        constraints = [
+            models.UniqueConstraint(fields=['investor', 'startup'], name='unique_investor_viewed_startup'),
+        ]
+        indexes = [
+            models.Index(fields=['investor', '-viewed_at'], name='idx_viewed_investor_recent'),
+        ]
 
     def __str__(self):
         return f"{self.investor} viewed {self.startup} at {self.viewed_at}"
@@ -169,6 +179,11 @@ class ProjectFollow(models.Model):
     Constraints:
         - Investors cannot follow their own startup's projects.
         - Each investor can follow a project only once (unique constraint).
+
+    ``Project.follower_count`` counts active rows. It is adjusted in the same
+    transaction whenever a row is created active, flips ``is_active`` or an
+    active row is deleted (see ``investors.signals``); ``bulk_create`` and
+    queryset updates bypass it, run ``recount_project_followers`` after them.
     """
     
     investor = models.ForeignKey(
@@ -209,10 +224,26 @@ class ProjectFollow(models.Model):
             pass
     
     def save(self, *args, **kwargs):
-        """Override save to run validation."""
+        """Override save to run validation and keep the project's follower_count."""
         self.clean()
-        super().save(*args, **kwargs)
-    
+        with transaction.atomic():
+            if self._state.adding:
+                super().save(*args, **kwargs)
+                delta = 1 if self.is_active else 0
+            else:
+                # Flip is_active with a conditional UPDATE first: the row lock
+                # makes concurrent follow/unfollow requests count only once
+                flipped = type(self).objects.filter(pk=self.pk).exclude(
+                    is_active=self.is_active
+                ).update(is_active=self.is_active)
+                super().save(*args, **kwargs)
+                delta = (1 if self.is_active else -1) if flipped else 0
+            if delta:
+                adjust_follower_count(self.project_id, delta)
+            if delta > 0:
+                from startups import popularity
+                popularity.record_follow(self.project)
+
     def __str__(self):
         return f"{self.investor.company_name} follows {self.project.title}"
     
@@ -228,8 +259,37 @@ class ProjectFollow(models.Model):
             ),
         ]
         indexes = [
-            models.Index(fields=["investor"], name="idx_project_follow_investor"),
-            models.Index(fields=["project"], name="idx_project_follow_project"),
+            # Followers of a project / follows of an investor, newest first;
+            # inactive rows are never listed so they are left out of the index
+            models.Index(
+                fields=["project", "-followed_at"],
+                name="idx_pfollow_project_active",
+                condition=Q(is_active=True),
+            ),
+            models.Index(
+                fields=["investor", "-followed_at"],
+                name="idx_pfollow_investor_active",
+                condition=Q(is_active=True),
+            ),
             models.Index(fields=["followed_at"], name="idx_project_follow_followed_at"),
-            models.Index(fields=["is_active"], name="idx_project_follow_is_active"),
         ]
+
+
+def adjust_follower_count(project_id, delta):
+    """Add ``delta`` to a project's follower_count with a single UPDATE."""
+    Project = ProjectFollow._meta.get_field('project').related_model
+    Project.objects.filter(pk=project_id).update(follower_count=F('follower_count') + delta)
+
+
+def recount_follower_counts(project_ids=None):
+    """
+    Recompute follower_count from the active ProjectFollow rows with one
+    UPDATE, for ``project_ids`` or every project. Returns rows updated.
+    """
+    Project = ProjectFollow._meta.get_field('project').related_model
+    active = (
+        ProjectFollow.objects.filter(project=OuterRef('pk'), is_active=True)
+        .order_by().values('project').annotate(total=Count('pk')).values('total')
+    )
+    projects = Project.objects.all() if project_ids is None else Project.objects.filter(pk__in=project_ids)
+    return projects.update(follower_count=Coalesce(Subquery(active, output_field=IntegerField()), Value(0)))
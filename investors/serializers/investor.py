@@ -6,11 +6,12 @@ from rest_framework import serializers
 from django.core.exceptions import ValidationError
 from common.enums import Stage
 from investors.models import Investor, SavedStartup, ViewedStartup
+from mixins.sparse_fields_mixin import SparseFieldsetSerializerMixin
 from startups.models import Startup
 from validation.validate_names import validate_company_name
 
 
-class InvestorSerializer(serializers.ModelSerializer):
+class InvestorSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the Investor model.
     Includes all fields defined in the abstract Company base class and Investor-specific fields.
@@ -178,7 +179,8 @@ class ViewedStartupSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ViewedStartup
-        fields = ["id", "startup_id", "company_name", "viewed_at"]
+        # Views served from Redis have no row yet, so entries are identified by startup_id
+        fields = ["startup_id", "company_name", "viewed_at"]
 
 class InvestorListSerializer(serializers.ModelSerializer):
     class Meta:
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from investors.models import ProjectFollow, SavedStartup, adjust_follower_count
+from startups import popularity
+from startups.models import Startup
+
+
+@receiver(post_delete, sender=ProjectFollow)
+def decrement_follower_count(sender, instance, **kwargs):
+    """Deleting an active follow (directly or by cascade) drops it from the project's count."""
+    if instance.is_active:
+        adjust_follower_count(instance.project_id, -1)
+
+
+@receiver(post_save, sender=SavedStartup)
+def count_startup_save(sender, instance, created, **kwargs):
+    if created:
+        popularity.record('saves', (Startup, instance.startup_id))
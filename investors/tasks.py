@@ -0,0 +1,12 @@
+from celery import shared_task
+
+
+@shared_task
+def flush_viewed_startups_task():
+    """
+    Celery task to write the recently viewed startups pending in Redis to Postgres.
+    Scheduled every minute via Celery Beat; returns the run metrics.
+    """
+    from investors.view_history import flush_views
+
+    return flush_views()
@@ -0,0 +1,330 @@
+"""
+Recently viewed startups.
+
+A startup page view no longer writes to Postgres. ``record_view`` adds the
+startup to the investor's Redis sorted set ``{prefix}:{investor id}`` (member
+startup id, score view time), trims it to the ``max_entries`` most recent
+startups and records the view in the ``{prefix}:pending`` hash, so repeated
+views of the same startup collapse into one pending entry.
+
+``flush_views`` is run periodically (see VIEW_HISTORY): it upserts the
+pending entries into ViewedStartup in batches and trims every flushed
+investor's rows to ``max_entries`` as well, so the table stays bounded.
+
+Clearing the history drops the investor's pending views as well, and its
+time is kept in ``{prefix}:cleared`` so a flush already holding older views
+of that investor does not write them back.
+
+The recently viewed list is read from the sorted set and its startups are
+loaded with one query. A sorted set that is missing (first use, expired
+after ``ttl`` seconds idle, Redis restarted) is rebuilt from ViewedStartup.
+When the history is disabled or Redis is unavailable, views are written to
+and read from Postgres directly.
+"""
+import logging
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+from redis.exceptions import RedisError
+
+from investors.models import Investor, ViewedStartup
+from startups.models import Startup
+from utils.redis_client import acquire_lock, claim_hash, get_redis, hash_batches, release_lock
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VIEW_HISTORY = {
+    'key_prefix': 'investors:viewed',
+    'enabled': True,
+    'max_entries': 50,
+    'ttl': 30 * 86400,
+    'batch_size': 1000,
+    'lock_timeout': 300,
+}
+
+
+def get_view_history_config() -> dict:
+    """Return VIEW_HISTORY merged over DEFAULT_VIEW_HISTORY."""
+    return {**DEFAULT_VIEW_HISTORY, **(getattr(settings, 'VIEW_HISTORY', None) or {})}
+
+
+def _history_key(config: dict, investor_id) -> str:
+    return f"{config['key_prefix']}:{investor_id}"
+
+
+def _pending_key(config: dict) -> str:
+    return f"{config['key_prefix']}:pending"
+
+
+def _cleared_key(config: dict) -> str:
+    return f"{config['key_prefix']}:cleared"
+
+
+def _lock_key(config: dict) -> str:
+    return f"{config['key_prefix']}:lock"
+
+
+def _from_score(score: float) -> datetime:
+    return datetime.fromtimestamp(score, tz=dt_timezone.utc)
+
+
+def _db_views(investor_id):
+    return ViewedStartup.objects.filter(investor_id=investor_id).select_related('startup').order_by('-viewed_at')
+
+
+def _ensure_loaded(client, config: dict, investor_id) -> None:
+    """Rebuild the investor's sorted set from Postgres if it does not exist."""
+    key = _history_key(config, investor_id)
+    if client.exists(key):
+        return
+    rows = (
+        ViewedStartup.objects.filter(investor_id=investor_id)
+        .order_by('-viewed_at')
+        .values_list('startup_id', 'viewed_at')[:config['max_entries']]
+    )
+    mapping = {startup_id: viewed_at.timestamp() for startup_id, viewed_at in rows}
+    if mapping:
+        pipe = client.pipeline()
+        pipe.zadd(key, mapping, nx=True)
+        pipe.expire(key, config['ttl'])
+        pipe.execute()
+
+
+def record_view(investor_id, startup, viewed_at=None) -> ViewedStartup:
+    """
+    Record that ``investor_id`` viewed ``startup``.
+
+    Returns:
+        ViewedStartup: the view; unsaved unless it was written to Postgres directly.
+    """
+    config = get_view_history_config()
+    viewed_at = viewed_at or timezone.now()
+    if config['enabled']:
+        key = _history_key(config, investor_id)
+        score = viewed_at.timestamp()
+        try:
+            client = get_redis()
+            _ensure_loaded(client, config, investor_id)
+            pipe = client.pipeline()
+            pipe.zadd(key, {startup.pk: score})
+            pipe.zremrangebyrank(key, 0, -config['max_entries'] - 1)
+            pipe.expire(key, config['ttl'])
+            pipe.hset(_pending_key(config), f"{investor_id}:{startup.pk}", score)
+            pipe.execute()
+            return ViewedStartup(investor_id=investor_id, startup=startup, viewed_at=viewed_at)
+        except RedisError:
+            logger.warning("[VIEWED] Could not record view in Redis", extra={"investor_id": investor_id}, exc_info=True)
+
+    view, _ = ViewedStartup.objects.update_or_create(
+        investor_id=investor_id,
+        startup=startup,
+        defaults={'viewed_at': viewed_at},
+    )
+    return view
+
+
+class RecentViews:
+    """
+    The investor's recently viewed startups, most recent first, as a lazy
+    sequence for Django's Paginator: ``count()`` and slicing each cost one
+    Redis round trip, and a page loads its startups with one query.
+    """
+
+    def __init__(self, investor_id, config: dict):
+        self.investor_id = investor_id
+        self.config = config
+        self.key = _history_key(config, investor_id)
+        self.fallback = None
+
+    def count(self) -> int:
+        try:
+            client = get_redis()
+            _ensure_loaded(client, self.config, self.investor_id)
+            return client.zcard(self.key)
+        except RedisError:
+            logger.warning("[VIEWED] Could not read views from Redis", extra={"investor_id": self.investor_id}, exc_info=True)
+            self.fallback = _db_views(self.investor_id)[:self.config['max_entries']]
+            return self.fallback.count()
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            raise TypeError("RecentViews only supports slicing")
+        if self.fallback is not None:
+            return list(self.fallback[index])
+        start = index.start or 0
+        stop = index.stop if index.stop is not None else self.config['max_entries']
+        if stop <= start:
+            return []
+        try:
+            members = get_redis().zrevrange(self.key, start, stop - 1, withscores=True)
+        except RedisError:
+            logger.warning("[VIEWED] Could not read views from Redis", extra={"investor_id": self.investor_id}, exc_info=True)
+            return list(_db_views(self.investor_id)[start:stop])
+        startups = Startup.objects.only('id', 'company_name').in_bulk([int(member) for member, _ in members])
+        return [
+            ViewedStartup(investor_id=self.investor_id, startup=startups[int(member)], viewed_at=_from_score(score))
+            for member, score in members
+            if int(member) in startups
+        ]
+
+
+def recent_views(investor_id):
+    """Return the investor's recently viewed startups, most recent first."""
+    config = get_view_history_config()
+    if not config['enabled']:
+        return _db_views(investor_id)
+    return RecentViews(investor_id, config)
+
+
+def clear_views(investor_id) -> int:
+    """
+    Forget the investor's viewed startups in Redis and Postgres.
+
+    Returns:
+        int: number of startups removed from the history.
+    """
+    config = get_view_history_config()
+    removed = 0
+    if config['enabled']:
+        try:
+            client = get_redis()
+            client.hset(_cleared_key(config), investor_id, timezone.now().timestamp())
+            pipe = client.pipeline()
+            pipe.zcard(_history_key(config, investor_id))
+            pipe.delete(_history_key(config, investor_id))
+            for pending in (_pending_key(config), f"{_pending_key(config)}:processing"):
+                stale = [field for field, _ in client.hscan_iter(pending, match=f"{investor_id}:*")]
+                if stale:
+                    pipe.hdel(pending, *stale)
+            removed = pipe.execute()[0]
+        except RedisError:
+            logger.warning("[VIEWED] Could not clear views in Redis", extra={"investor_id": investor_id}, exc_info=True)
+    deleted, _ = ViewedStartup.objects.filter(investor_id=investor_id).delete()
+    return max(removed, deleted)
+
+
+def _cleared_at(client, config: dict, investor_ids) -> dict:
+    investor_ids = list(investor_ids)
+    values = client.hmget(_cleared_key(config), investor_ids) if investor_ids else []
+    return {investor_id: float(value) for investor_id, value in zip(investor_ids, values) if value is not None}
+
+
+def _write_batch(client, config: dict, batch: dict) -> set:
+    """Upsert ``{(investor id, startup id): score}``; returns the investor ids written."""
+    cleared = _cleared_at(client, config, {i for i, _ in batch})
+    # Views older than a clear of the investor's history are dropped
+    batch = {
+        (investor_id, startup_id): score
+        for (investor_id, startup_id), score in batch.items()
+        if score > cleared.get(investor_id, 0)
+    }
+    investor_ids = set(Investor.objects.filter(pk__in={i for i, _ in batch}).values_list('pk', flat=True))
+    startup_ids = set(Startup.objects.filter(pk__in={s for _, s in batch}).values_list('pk', flat=True))
+    rows = [
+        ViewedStartup(investor_id=investor_id, startup_id=startup_id, viewed_at=_from_score(score))
+        for (investor_id, startup_id), score in batch.items()
+        # Views of rows deleted since are dropped
+        if investor_id in investor_ids and startup_id in startup_ids
+    ]
+    ViewedStartup.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['investor', 'startup'],
+        update_fields=['viewed_at'],
+    )
+    written = {row.investor_id for row in rows}
+
+    # A clear that happened while the rows were written may have missed them
+    for investor_id, cleared_at in _cleared_at(client, config, written).items():
+        if cleared_at > cleared.get(investor_id, 0):
+            ViewedStartup.objects.filter(investor_id=investor_id, viewed_at__lte=_from_score(cleared_at)).delete()
+    return written
+
+
+def _trim(investor_ids: set, max_entries: int) -> int:
+    """Delete the rows of ``investor_ids`` beyond their ``max_entries`` most recent."""
+    if not investor_ids:
+        return 0
+    excess = list(
+        ViewedStartup.objects.filter(investor_id__in=investor_ids)
+        .annotate(rank=Window(
+            RowNumber(),
+            partition_by=[F('investor_id')],
+            order_by=[F('viewed_at').desc(), F('id').desc()],
+        ))
+        .filter(rank__gt=max_entries)
+        .values_list('pk', flat=True)
+    )
+    if excess:
+        ViewedStartup.objects.filter(pk__in=excess).delete()
+    return len(excess)
+
+
+def flush_views(*, batch_size=None) -> dict:
+    """
+    Write the pending views to Postgres in batches of ``batch_size``.
+
+    Runs are serialized with a Redis lock. The pending hash is renamed before
+    it is read, so views recorded during the flush wait for the next run. If a
+    run fails, the next run writes the renamed hash again first.
+
+    Returns:
+        dict: run metrics.
+    """
+    config = get_view_history_config()
+    batch_size = batch_size or config['batch_size']
+    stats = {'flushed': 0, 'trimmed': 0, 'batches': 0}
+    if not config['enabled']:
+        return stats
+
+    client = get_redis()
+    lock = _lock_key(config)
+    token = acquire_lock(client, lock, config['lock_timeout'])
+    if token is None:
+        logger.info("[VIEWED] Flush already running")
+        return stats
+
+    try:
+        started_at = timezone.now().timestamp()
+        pending = _pending_key(config)
+        processing = f"{pending}:processing"
+        if not claim_hash(client, pending, processing):
+            return stats
+
+        investor_ids = set()
+        for fields in hash_batches(client, processing, batch_size):
+            batch = {
+                tuple(int(pk) for pk in field.split(':')): float(score)
+                for field, score in fields.items()
+            }
+            investor_ids |= _write_batch(client, config, batch)
+            stats['flushed'] += len(batch)
+            stats['batches'] += 1
+
+        stats['trimmed'] = _trim(investor_ids, config['max_entries'])
+        client.delete(processing)
+        # Clears from before this run already removed their views from the hashes it read
+        cleared = _cleared_key(config)
+        expired = [
+            investor_id for investor_id, cleared_at in client.hgetall(cleared).items()
+            if float(cleared_at) < started_at
+        ]
+        if expired:
+            client.hdel(cleared, *expired)
+    finally:
+        release_lock(client, lock, token)
+
+    logger.info(
+        "investors.view_history flushed=%d trimmed=%d batches=%d",
+        stats['flushed'],
+        stats['trimmed'],
+        stats['batches'],
+        extra={'view_history_stats': stats},
+    )
+    return stats
@@ -1,7 +1,6 @@
 import logging
 from django.db import IntegrityError
 from django.shortcuts import get_object_or_404
-from django.utils import timezone
 from django.db.models import Q
 from rest_framework import viewsets, status, generics, pagination, permissions
 from rest_framework.exceptions import ParseError, PermissionDenied, ValidationError
@@ -18,8 +17,10 @@ from users.permissions import (
 )
 from rest_framework.permissions import IsAuthenticated
 from .permissions import IsSavedStartupOwner
+from mixins.conditional_get_mixin import ConditionalGetMixin
+from mixins.sparse_fields_mixin import SparseFieldsetViewMixin, parse_list_param
 from users.views.base_protected_view import CookieJWTProtectedView
-from .models import Investor, ProjectFollow, ViewedStartup, SavedStartup
+from .models import Investor, ProjectFollow, SavedStartup
 from .serializers import InvestorSerializer, InvestorCreateSerializer
 from .serializers.project_follow import (
     ProjectFollowCreateSerializer,
@@ -27,13 +28,18 @@ from .serializers.project_follow import (
 )
 from .serializers.investor import SavedStartupSerializer, ViewedStartupSerializer, InvestorListSerializer
 from .filters import InvestorFilter
+from . import view_history
 from projects.models import Project
+from startups import popularity
 from startups.models import Startup
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of project ids accepted by ProjectFollowerCountsView
+MAX_FOLLOWER_COUNT_IDS = 100
 
-class InvestorViewSet(viewsets.ModelViewSet):
+
+class InvestorViewSet(ConditionalGetMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Investor instances.
     Optimized with select_related to avoid N+1 queries when fetching related user, industry, and location.
@@ -242,37 +248,34 @@ class ViewedStartupListView(generics.ListAPIView):
     """
     GET /api/v1/startups/viewed/
     Retrieve a paginated list of recently viewed startups for the authenticated investor.
+    Served from the investor's Redis history; see investors.view_history.
     """
     serializer_class = ViewedStartupSerializer
     permission_classes = [IsAuthenticated, IsInvestor, HasActiveCompanyAccount]
     pagination_class = ViewedStartupPagination
 
     def get_queryset(self):
-        return ViewedStartup.objects.filter(investor=self.request.user.investor).select_related('startup').order_by(
-            "-viewed_at")
+        return view_history.recent_views(self.request.user.investor.pk)
 
 
 class ViewedStartupCreateView(APIView):
     """
     POST /api/v1/startups/view/{startup_id}/
     Log that the authenticated investor has viewed a specific startup.
-    Return the serialized ViewedStartup instance.
+    The view is recorded in Redis and flushed to Postgres periodically.
+    Return the serialized view.
     """
     permission_classes = [IsAuthenticated, IsInvestor]
 
     def post(self, request, startup_id):
-        startup = get_object_or_404(Startup, id=startup_id)
+        startup = get_object_or_404(Startup.objects.only('id', 'company_name'), id=startup_id)
         if not hasattr(request.user, "investor"):
             return Response({"detail": "User is not an investor."}, status=status.HTTP_403_FORBIDDEN)
-        investor = request.user.investor
 
-        viewed_obj, created = ViewedStartup.objects.update_or_create(
-            investor=investor,
-            startup=startup,
-            defaults={"viewed_at": timezone.now()}
-        )
+        view = view_history.record_view(request.user.investor.pk, startup)
+        popularity.record('views', (Startup, startup.pk))
 
-        serializer = ViewedStartupSerializer(viewed_obj)
+        serializer = ViewedStartupSerializer(view)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
@@ -285,9 +288,7 @@ class ViewedStartupClearView(APIView):
     permission_classes = [IsAuthenticated, IsInvestor, HasActiveCompanyAccount]
 
     def delete(self, request):
-        investor = request.user.investor
-        deleted_count = investor.viewed_startups.count()
-        investor.viewed_startups.clear()
+        deleted_count = view_history.clear_views(request.user.investor.pk)
         return Response(
             {"detail": "Viewed startups history cleared successfully.", "deleted_count": deleted_count},
             status=status.HTTP_200_OK
@@ -320,7 +321,7 @@ class SaveStartupView(APIView):
                 return Response(SavedStartupSerializer(obj).data, status=status.HTTP_200_OK)
             raise
 
-class InvestorListView(generics.ListAPIView):
+class InvestorListView(ConditionalGetMixin, generics.ListAPIView):
     """
     API view to list investors with filtering and strict ordering validation.
     Only authenticated users can access. Invalid ordering fields return 400.
@@ -346,7 +347,7 @@ class InvestorListView(generics.ListAPIView):
             queryset = queryset.order_by("company_name")
         return queryset
 
-class InvestorDetailView(generics.RetrieveAPIView):
+class InvestorDetailView(ConditionalGetMixin, generics.RetrieveAPIView):
     """
     Returns a single investor profile.
     Only authenticated users can access.
@@ -535,4 +536,31 @@ class ProjectFollowersListView(ListAPIView):
         ).select_related(
             'investor__user',
             'project__startup'
-        ).order_by('-followed_at')
\ No newline at end of file
+        ).order_by('-followed_at')
+
+
+class ProjectFollowerCountsView(APIView):
+    """
+    API view returning the number of active followers of many projects at once.
+
+    Counts are read from the denormalized ``Project.follower_count`` column
+    with a single query. Unknown project ids are left out of the response.
+
+    GET /api/v1/projects/follower-counts/?ids=1,2,3
+    """
+    authentication_classes = [CookieJWTAuthentication]
+    permission_classes = [IsAuthenticatedOr401]
+
+    def get(self, request, *args, **kwargs):
+        raw_ids = parse_list_param(request.query_params, 'ids')
+        if not raw_ids:
+            raise ValidationError({"ids": ["This parameter is required."]})
+        if len(raw_ids) > MAX_FOLLOWER_COUNT_IDS:
+            raise ValidationError({"ids": [f"At most {MAX_FOLLOWER_COUNT_IDS} ids are allowed."]})
+        try:
+            ids = [int(value) for value in raw_ids]
+        except ValueError:
+            raise ValidationError({"ids": ["Ids must be integers."]})
+
+        counts = Project.objects.filter(pk__in=ids).values_list('pk', 'follower_count')
+        return Response({str(pk): count for pk, count in counts}, status=status.HTTP_200_OK)
@@ -0,0 +1,97 @@
+"""
+Conditional GET (ETag / Last-Modified) for retrieve and list actions.
+
+Before serializing, the view runs one aggregate query over the rows the
+response would contain: the newest value of each ``conditional_timestamp_fields``
+path and the number of rows of each ``conditional_count_fields`` relation
+(so deletions change the validator too). The ETag hashes these values with
+the request's host and full path, so query parameters such as filters,
+``fields`` or ``expand`` get their own validators. When ``If-None-Match`` or
+``If-Modified-Since`` match, a 304 is returned without loading or
+serializing the rows.
+
+Object permissions are still checked before a 304 on retrieve, on a
+minimal instance holding only ``permission_object_fields``.
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def check_minimal_object(view, queryset, fields=()):
+    """
+    Run ``view``'s object permissions on the single row of ``queryset``,
+    loading only ``fields`` (ORM paths). Returns the instance, or None if
+    the row is gone.
+    """
+    related = {path.rsplit('__', 1)[0] for path in fields if '__' in path}
+    queryset = queryset.select_related(None).prefetch_related(None)
+    if related:
+        queryset = queryset.select_related(*sorted(related))
+    obj = queryset.only(queryset.model._meta.pk.name, *fields).first()
+    if obj is not None:
+        view.check_object_permissions(view.request, obj)
+    return obj
+
+
+class ConditionalGetMixin:
+    conditional_timestamp_fields = ('updated_at',)
+    conditional_count_fields = ()
+    # Fields object permissions read; loaded before answering 304
+    permission_object_fields = ()
+
+    def get_conditional_state(self, queryset):
+        """Return ``(etag, last_modified)`` for ``queryset``; last_modified is None when empty."""
+        model = queryset.model
+        rows = model._default_manager.filter(pk__in=queryset.order_by().values('pk'))
+        aggregates = {'etag_rows': Count('pk', distinct=True)}
+        for index, path in enumerate(self.conditional_timestamp_fields):
+            aggregates[f'etag_ts{index}'] = Max(path)
+        for index, path in enumerate(self.conditional_count_fields):
+            aggregates[f'etag_count{index}'] = Count(path, distinct=True)
+        state = rows.aggregate(**aggregates)
+
+        timestamps = [value for key, value in state.items() if key.startswith('etag_ts') and value]
+        last_modified = max(timestamps) if timestamps else None
+        version = '|'.join(
+            value.isoformat() if hasattr(value, 'isoformat') else str(value)
+            for _, value in sorted(state.items())
+        )
+        request = self.request
+        digest = hashlib.sha256(
+            f"{model._meta.label}|{version}|{request.get_host()}|{request.get_full_path()}".encode()
+        ).hexdigest()[:32]
+        return f'"{digest}"', last_modified
+
+    def conditional_response(self, queryset, render, check=None):
+        etag, last_modified = self.get_conditional_state(queryset)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        not_modified = get_conditional_response(self.request, etag=etag, last_modified=timestamp)
+        if not_modified is not None and (check is None or check()):
+            return not_modified
+        response = render()
+        if response.status_code == 200:
+            response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+        return self.conditional_response(
+            queryset,
+            lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs),
+            check=lambda: check_minimal_object(self, queryset, self.permission_object_fields) is not None,
+        )
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.conditional_response(
+            queryset,
+            lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs),
+        )
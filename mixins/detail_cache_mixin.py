@@ -0,0 +1,35 @@
+from common import detail_cache
+from mixins.conditional_get_mixin import check_minimal_object
+
+
+class DetailCacheMixin:
+    """
+    Serve ``retrieve`` from the Redis detail cache (see common.detail_cache).
+
+    Object permissions are checked on a minimal instance (``permission_object_fields``)
+    before a cached payload is returned. Bump ``detail_cache_version`` whenever
+    the detail serializer's output changes.
+    """
+    detail_cache_version = 1
+    permission_object_fields = ()
+
+    def get_detail_cache_variant(self, request) -> str:
+        serializer_class = self.get_serializer_class()
+        return (
+            f"{serializer_class.__module__}.{serializer_class.__name__}.{self.detail_cache_version}"
+            f"|{request.get_host()}|{request.get_full_path()}"
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+        compute = lambda: super(DetailCacheMixin, self).retrieve(request, *args, **kwargs)  # noqa: E731
+        obj = check_minimal_object(self, queryset, self.permission_object_fields)
+        if obj is None:
+            return compute()
+        return detail_cache.cached_response(
+            f"{type(self).__name__}.retrieve", queryset.model, obj.pk,
+            self.get_detail_cache_variant(request), compute,
+        )
@@ -0,0 +1,225 @@
+"""
+Sparse fieldsets and expansion for read endpoints.
+
+    ?fields=id,title,startup_name   render only these fields
+    ?expand=startup                 render ``startup`` as a nested object
+
+Serializers opt in with ``SparseFieldsetSerializerMixin`` and may declare on
+their ``Meta``:
+
+    expandable_fields  name -> (serializer class, kwargs); replaces the
+                       default (usually id) representation when expanded
+    field_sources      name -> ORM paths the field reads, for fields whose
+                       source cannot be resolved automatically (method
+                       fields, model methods)
+
+Viewsets opt in with ``SparseFieldsetViewMixin``. When a GET request asks
+for ``fields`` or ``expand``, the queryset is rebuilt from the pruned
+serializer: ``select_related`` for nested and dotted foreign keys,
+``prefetch_related`` for nested lists and ``only()`` for the columns that
+are rendered. Requests without these parameters are untouched.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.relations import ManyRelatedField
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+
+def parse_list_param(params, name):
+    """Comma-separated and/or repeated parameter -> ordered unique names."""
+    names = []
+    for value in params.getlist(name):
+        for item in value.split(','):
+            item = item.strip()
+            if item and item not in names:
+                names.append(item)
+    return names
+
+
+class SparseFieldsetSerializerMixin:
+    """
+    Accepts ``fields`` and ``expand`` keyword arguments (lists of field names).
+    Unknown names raise a ValidationError listing the allowed ones.
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop(FIELDS_PARAM, None)
+        expand = kwargs.pop(EXPAND_PARAM, None)
+        super().__init__(*args, **kwargs)
+        if expand:
+            self._expand_fields(expand)
+        if fields:
+            self._prune_fields(fields, expand or ())
+
+    def _expand_fields(self, expand):
+        expandable = getattr(self.Meta, 'expandable_fields', {})
+        invalid = [name for name in expand if name not in expandable]
+        if invalid:
+            raise ValidationError({EXPAND_PARAM: (
+                f'Invalid expand field(s): {", ".join(invalid)}. '
+                f'Allowed fields: {", ".join(sorted(expandable)) or "none"}'
+            )})
+        for name in expand:
+            serializer_class, options = expandable[name]
+            self.fields[name] = serializer_class(read_only=True, **options)
+
+    def _prune_fields(self, fields, expand):
+        invalid = [name for name in fields if name not in self.fields]
+        if invalid:
+            raise ValidationError({FIELDS_PARAM: (
+                f'Invalid field(s): {", ".join(invalid)}. '
+                f'Allowed fields: {", ".join(self.fields)}'
+            )})
+        keep = set(fields) | set(expand)
+        for name in list(self.fields):
+            if name not in keep:
+                self.fields.pop(name)
+
+
+class _QueryPlan:
+    def __init__(self, annotations=()):
+        self.annotations = set(annotations)
+        self.only = set()
+        self.select = set()
+        self.prefetch = []
+        # False once a rendered field reads attributes we cannot map to columns
+        self.restrict = True
+
+
+def _add_path(plan, model, prefix, attrs, top_level=True):
+    """Register an attribute path (``['startup', 'company_name']``) read from ``model``."""
+    walked = []
+    for index, attr in enumerate(attrs):
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            if not (top_level and index == 0 and attr in plan.annotations):
+                plan.restrict = False
+            return
+        walked.append(attr)
+        path = prefix + '__'.join(walked)
+        is_last = index == len(attrs) - 1
+        if field.many_to_many or field.one_to_many or (field.one_to_one and not field.concrete):
+            plan.restrict = False
+            return
+        plan.only.add(path)
+        if not field.is_relation:
+            # Remaining attributes are read from the column value
+            return
+        if not is_last:
+            plan.select.add(path)
+            model = field.related_model
+
+
+def _plan_serializer(plan, serializer, model, prefix=''):
+    plan.only.add(prefix + model._meta.pk.name)
+    declared = getattr(getattr(serializer, 'Meta', None), 'field_sources', {})
+    for name, field in serializer.fields.items():
+        if name in declared:
+            for path in declared[name]:
+                _add_path(plan, model, prefix, path.split('__'), top_level=not prefix)
+        elif field.source == '*':
+            plan.restrict = False
+        elif isinstance(field, serializers.ListSerializer) and isinstance(field.child, serializers.Serializer):
+            plan.prefetch.append(_nested_prefetch(model, prefix, field.source, field.child))
+        elif isinstance(field, ManyRelatedField):
+            plan.prefetch.append(prefix + field.source)
+        elif isinstance(field, serializers.Serializer):
+            attrs = field.source.split('.')
+            _add_path(plan, model, prefix, attrs, top_level=not prefix)
+            related_model = _follow(model, attrs)
+            if related_model is None:
+                plan.restrict = False
+                continue
+            path = prefix + '__'.join(attrs)
+            plan.select.add(path)
+            _plan_serializer(plan, field, related_model, path + '__')
+        else:
+            _add_path(plan, model, prefix, field.source.split('.'), top_level=not prefix)
+
+
+def _follow(model, attrs):
+    for attr in attrs:
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        if not field.is_relation or field.many_to_many or field.one_to_many:
+            return None
+        model = field.related_model
+    return model
+
+
+def _nested_prefetch(model, prefix, source, child):
+    relation = model._meta.get_field(source)
+    related_model = relation.related_model
+    queryset = optimize_queryset(related_model._default_manager.all(), child)
+    if relation.one_to_many and queryset.query.deferred_loading[1] is False:
+        # only() is in effect: keep the foreign key the prefetch joins on
+        loaded = queryset.query.deferred_loading[0]
+        queryset = queryset.only(*loaded, relation.field.name)
+    return Prefetch(prefix + source, queryset=queryset)
+
+
+def optimize_queryset(queryset, serializer, required=()):
+    """
+    Rebuild the joins, prefetches and loaded columns of ``queryset`` for the
+    fields ``serializer`` renders. ``required`` are extra ORM paths the view
+    needs (e.g. for permission checks or pagination).
+    """
+    plan = _QueryPlan(queryset.query.annotations)
+    _plan_serializer(plan, serializer, queryset.model)
+    for path in required:
+        _add_path(plan, queryset.model, '', path.split('__'))
+
+    queryset = queryset.select_related(None).prefetch_related(None)
+    if plan.select:
+        queryset = queryset.select_related(*sorted(plan.select))
+    if plan.prefetch:
+        queryset = queryset.prefetch_related(*plan.prefetch)
+    if plan.restrict:
+        queryset = queryset.only(*sorted(plan.only))
+    return queryset
+
+
+class SparseFieldsetViewMixin:
+    """
+    Passes ``?fields=`` / ``?expand=`` to opted-in serializers on GET requests
+    and trims the queryset to match. ``sparse_required_fields`` lists ORM
+    paths that must stay loaded regardless of the rendered fields;
+    ``sparse_detail_required_fields`` only on detail routes (object
+    permission checks).
+    """
+    sparse_required_fields = ()
+    sparse_detail_required_fields = ()
+
+    def get_sparse_params(self):
+        request = getattr(self, 'request', None)
+        if request is None or request.method not in ('GET', 'HEAD'):
+            return None
+        if not issubclass(self.get_serializer_class(), SparseFieldsetSerializerMixin):
+            return None
+        params = {
+            FIELDS_PARAM: parse_list_param(request.query_params, FIELDS_PARAM),
+            EXPAND_PARAM: parse_list_param(request.query_params, EXPAND_PARAM),
+        }
+        return {name: value for name, value in params.items() if value} or None
+
+    def get_serializer(self, *args, **kwargs):
+        sparse = self.get_sparse_params()
+        if sparse:
+            kwargs = {**sparse, **kwargs}
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.get_sparse_params():
+            required = tuple(self.sparse_required_fields)
+            if getattr(self, 'detail', False):
+                required += tuple(self.sparse_detail_required_fields)
+            queryset = optimize_queryset(queryset, self.get_serializer(), required)
+        return queryset
@@ -4,5 +4,5 @@ class ProjectsConfig(AppConfig):
     name = 'projects'
 
     def ready(self):
-        import startups.signals, projects.documents
+        import projects.documents
         import projects.signals
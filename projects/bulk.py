@@ -0,0 +1,279 @@
+"""
+Bulk project import / update.
+
+A batch is a list of project objects; entries with an ``id`` update that
+project, the others create one. The whole batch is validated before
+anything is written, with a fixed number of queries regardless of its size:
+
+- the projects being updated, their startups and the startups / categories
+  referenced by new projects are loaded with one query each;
+- ``email`` and ``(title, startup)`` uniqueness is checked against the
+  database with one query each, and within the batch in memory.
+
+Validation and writes share one transaction, and the projects being
+updated are locked (``SELECT ... FOR UPDATE``) when they are loaded, so a
+concurrent write to them (e.g. a subscription raising ``current_funding``)
+waits for the batch instead of being overwritten. Updates are grouped by
+the set of fields each entry changes, so every row is written with only
+its own fields.
+
+Rows are then written with ``bulk_create`` / ``bulk_update`` and history
+with ``record_history`` (two inserts). Bulk writes send no model signals,
+so the work the signals do per save is done once per batch instead: one index
+queue push for all rows, one detail cache invalidation and one Celery task
+notifying subscribed investors about every updated project.
+
+Any error rejects the whole batch; errors are returned per entry, in input
+order, like a DRF ``many=True`` serializer.
+"""
+import copy
+import logging
+from collections import Counter, defaultdict
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django_elasticsearch_dsl.apps import DEDConfig
+from rest_framework import serializers
+from rest_framework.exceptions import PermissionDenied
+
+from common import detail_cache
+from communications import registry
+from communications.models import Notification, NotificationTrigger
+from investments.models import Subscription
+from projects.history import collect_changes, record_history
+from projects.models import Category, Project
+from projects.serializers import ProjectBulkItemSerializer
+from search import indexing
+from startups.models import Startup
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BULK_MAX_ITEMS = 100
+
+DUPLICATE_EMAIL = "Project with this email already exists."
+DUPLICATE_TITLE = "The fields title, startup must make a unique set."
+
+
+def get_bulk_max_items() -> int:
+    return getattr(settings, 'PROJECT_BULK_MAX_ITEMS', DEFAULT_BULK_MAX_ITEMS)
+
+
+def _does_not_exist(pk) -> str:
+    return f'Invalid pk "{pk}" - object does not exist.'
+
+
+def _add_error(errors: list, index: int, field: str, message: str) -> None:
+    errors[index].setdefault(field, []).append(message)
+
+
+def _parse_ids(items: list, errors: list) -> dict:
+    """Map entry index -> project id for update entries."""
+    ids = {}
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            _add_error(errors, index, 'non_field_errors', "Expected an object.")
+            continue
+        if item.get('id') is None:
+            continue
+        try:
+            ids[index] = int(item['id'])
+        except (TypeError, ValueError):
+            _add_error(errors, index, 'id', "A valid integer is required.")
+    return ids
+
+
+def _check_uniqueness(entries: list, errors: list) -> None:
+    """
+    ``entries`` are ``(index, instance or None, data)``. Checks the emails
+    and (title, startup) pairs the batch sets, against the database and
+    against each other.
+    """
+    emails, titles = {}, {}
+    for index, instance, data in entries:
+        pk = instance.pk if instance else None
+        if 'email' in data:
+            emails[index] = (data['email'], pk)
+        if 'title' in data:
+            startup_id = instance.startup_id if instance else data['startup_id']
+            titles[index] = ((startup_id, data['title']), pk)
+
+    email_counts = Counter(email for email, _ in emails.values())
+    taken_emails = dict(
+        Project.objects.filter(email__in=list(email_counts)).values_list('email', 'pk')
+    ) if email_counts else {}
+    for index, (email, pk) in emails.items():
+        if email_counts[email] > 1 or taken_emails.get(email, pk) != pk:
+            _add_error(errors, index, 'email', DUPLICATE_EMAIL)
+
+    title_counts = Counter(key for key, _ in titles.values())
+    taken_titles = {}
+    if title_counts:
+        rows = Project.objects.filter(
+            startup_id__in={startup_id for startup_id, _ in title_counts},
+            title__in={title for _, title in title_counts},
+        ).values_list('startup_id', 'title', 'pk')
+        taken_titles = {(startup_id, title): pk for startup_id, title, pk in rows}
+    for index, (key, pk) in titles.items():
+        if title_counts[key] > 1 or taken_titles.get(key, pk) != pk:
+            _add_error(errors, index, 'non_field_errors', DUPLICATE_TITLE)
+
+
+def validate_batch(items, user) -> list:
+    """
+    Validate a bulk payload for ``user``. Must run in a transaction: the
+    projects being updated are locked until it ends.
+
+    Returns:
+        list: ``(index, instance or None, validated data)`` per entry.
+
+    Raises:
+        ValidationError: per-entry errors, or a batch-level error.
+        PermissionDenied: an entry touches a startup ``user`` does not own.
+    """
+    if not isinstance(items, list) or not items:
+        raise serializers.ValidationError({'non_field_errors': ["Expected a non-empty list of projects."]})
+    max_items = get_bulk_max_items()
+    if len(items) > max_items:
+        raise serializers.ValidationError(
+            {'non_field_errors': [f"A batch may contain at most {max_items} projects."]}
+        )
+
+    errors = [{} for _ in items]
+    ids = _parse_ids(items, errors)
+    instances = (
+        Project.objects.select_related('startup')
+        .select_for_update(of=('self',))
+        .order_by('pk')
+        .in_bulk(set(ids.values()))
+    )
+
+    entries = []
+    for index, item in enumerate(items):
+        if errors[index]:
+            continue
+        instance = None
+        if index in ids:
+            instance = instances.get(ids[index])
+            if instance is None:
+                _add_error(errors, index, 'id', _does_not_exist(ids[index]))
+                continue
+        serializer = ProjectBulkItemSerializer(instance, data=item, partial=instance is not None)
+        if not serializer.is_valid():
+            errors[index] = dict(serializer.errors)
+            continue
+        data = dict(serializer.validated_data)
+        data.pop('id', None)
+        if instance is None:
+            for field in ('startup_id', 'category_id'):
+                if field not in data:
+                    _add_error(errors, index, field, "This field is required.")
+        elif data.get('startup_id', instance.startup_id) != instance.startup_id:
+            _add_error(errors, index, 'startup_id', "Cannot change the startup of a project.")
+        if not errors[index]:
+            entries.append((index, instance, data))
+
+    startup_ids = {data['startup_id'] for _, instance, data in entries if instance is None}
+    category_ids = {data['category_id'] for _, _, data in entries if 'category_id' in data}
+    startups = Startup.objects.only('id', 'user_id').in_bulk(startup_ids)
+    categories = Category.objects.only('id').in_bulk(category_ids)
+
+    for index, instance, data in entries:
+        owner_id = instance.startup.user_id if instance else getattr(startups.get(data['startup_id']), 'user_id', None)
+        if instance is None and data['startup_id'] not in startups:
+            _add_error(errors, index, 'startup_id', _does_not_exist(data['startup_id']))
+        elif owner_id != user.pk:
+            raise PermissionDenied("You can only import projects for your own startups.")
+        if 'category_id' in data and data['category_id'] not in categories:
+            _add_error(errors, index, 'category_id', _does_not_exist(data['category_id']))
+
+    _check_uniqueness([entry for entry in entries if not errors[entry[0]]], errors)
+
+    if any(errors):
+        raise serializers.ValidationError(errors)
+    return entries
+
+
+def bulk_upsert_projects(items, user) -> dict:
+    """
+    Validate and write a batch of projects for ``user`` (see module docstring).
+
+    Returns:
+        dict: ``{'created': [ids], 'updated': [ids]}`` in input order.
+    """
+    with transaction.atomic():
+        entries = validate_batch(items, user)
+        now = timezone.now()
+
+        new_projects = [Project(**data) for _, instance, data in entries if instance is None]
+        updated, by_fields, history = [], defaultdict(list), []
+        for _, instance, data in entries:
+            if instance is None:
+                continue
+            old_instance = copy.copy(instance)
+            for field, value in data.items():
+                setattr(instance, field, value)
+            # bulk_update does not apply auto_now
+            instance.updated_at = now
+            by_fields[tuple(sorted({'updated_at', *data}))].append(instance)
+            updated.append(instance)
+            history.append((instance, user, collect_changes(old_instance, instance)))
+
+        Project.objects.bulk_create(new_projects)
+        for fields, instances in by_fields.items():
+            Project.objects.bulk_update(instances, fields)
+        history_entries = record_history(history)
+
+        pks = [project.pk for project in new_projects + updated]
+        if DEDConfig.autosync_enabled():
+            indexing.enqueue(Project, pks)
+        detail_cache.invalidate(Project, pks)
+        detail_cache.invalidate(Startup, {project.startup_id for project in new_projects + updated})
+
+        changed_ids = [entry.project_id for entry in history_entries]
+        if changed_ids:
+            from projects.tasks import notify_project_subscribers_task
+            transaction.on_commit(partial(notify_project_subscribers_task.delay, changed_ids, user.pk))
+
+    return {
+        'created': [project.pk for project in new_projects],
+        'updated': [project.pk for project in updated],
+    }
+
+
+def notify_project_subscribers(project_ids, editor_id=None) -> int:
+    """
+    Send one ``project_updated`` in-app notification per (investor, project)
+    for the subscribers of ``project_ids``, with a single insert.
+
+    Returns:
+        int: notifications created.
+    """
+    notification_type = registry.get('project_updated')
+    if notification_type is None:
+        logger.error("Attempted to create notification with non-existent type_code: project_updated")
+        return 0
+
+    projects = Project.objects.select_related('startup').only('id', 'title', 'startup__company_name').in_bulk(project_ids)
+    recipients = (
+        Subscription.objects.filter(project_id__in=project_ids)
+        .values_list('project_id', 'investor__user_id')
+        .distinct()
+    )
+    notifications = []
+    for project_id, user_id in recipients:
+        project = projects.get(project_id)
+        if project is None or user_id is None:
+            continue
+        notifications.append(Notification(
+            user_id=user_id,
+            notification_type_id=notification_type.id,
+            title=f"Project '{project.title}' has been updated",
+            message=f"Startup '{project.startup.company_name}' has updated their project details.",
+            related_project_id=project_id,
+            triggered_by_user_id=editor_id,
+            triggered_by_type=NotificationTrigger.STARTUP,
+        ))
+    Notification.objects.bulk_create(notifications, batch_size=1000)
+    return len(notifications)
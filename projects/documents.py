@@ -1,18 +1,35 @@
 from django_elasticsearch_dsl import Document, fields
 from django_elasticsearch_dsl.registries import registry
-from projects.models import Project
+from elasticsearch_dsl import analyzer, tokenizer
+from projects.models import Category, Project
+from startups.models import Startup
+
+# Trigrams for infix (substring) filters; replaces leading-wildcard queries
+trigram_analyzer = analyzer(
+    'trigram',
+    tokenizer=tokenizer('trigram', 'ngram', min_gram=3, max_gram=3, token_chars=['letter', 'digit']),
+    filter=['lowercase'],
+)
 
 
 @registry.register_document
 class ProjectDocument(Document):
     category = fields.ObjectField(properties={
         'id': fields.IntegerField(),
-        'name': fields.KeywordField(),
+        'name': fields.KeywordField(fields={'suggest': fields.CompletionField()}),
     })
     startup = fields.ObjectField(properties={
         'id': fields.IntegerField(),
         'company_name': fields.KeywordField(),
     })
+    title = fields.TextField(fields={
+        'raw': fields.KeywordField(),
+        'suggest': fields.CompletionField(),
+        'ngram': fields.TextField(analyzer=trigram_analyzer),
+    })
+    description = fields.TextField(fields={'ngram': fields.TextField(analyzer=trigram_analyzer)})
+    status = fields.KeywordField()
+    funding_goal = fields.FloatField()
 
     class Index:
         name = 'projects'
@@ -25,8 +42,15 @@ class ProjectDocument(Document):
         model = Project
         fields = [
             'id',
-            'title',
-            'description',
-            'status',
+            'website',
         ]
-        related_models = ['startup', 'category']
+        related_models = [Startup, Category]
+
+    # Embedded related rows; edits to them are applied with one update_by_query
+    related_object_fields = {
+        Startup: 'startup',
+        Category: 'category',
+    }
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('startup', 'category')
@@ -0,0 +1,250 @@
+"""
+Project change history.
+
+Every edit of a tracked field is stored as a ProjectHistory entry (who and
+when) with one ProjectFieldChange row per changed field. The history feed of
+a project is served by the (project, timestamp) index and the timeline of a
+single field by the (project, field, timestamp) index, without parsing any
+blobs.
+
+``compact_history`` is run periodically (see PROJECT_HISTORY): it merges
+runs of successive entries of a project made by the same editor less than
+``merge_window_seconds`` apart into one entry holding the first old and the
+last new value of every field, dropping fields that ended up unchanged, and
+deletes entries older than ``retention_days``.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Window
+from django.db.models.functions import Lag
+from django.utils import timezone
+
+from projects.models import ProjectFieldChange, ProjectHistory
+
+logger = logging.getLogger(__name__)
+
+TRACKED_FIELDS = ['title', 'description', 'funding_goal', 'status', 'website', 'technologies_used', 'milestones']
+
+DEFAULT_PROJECT_HISTORY = {
+    'merge_window_seconds': 300,
+    'retention_days': None,
+    'batch_size': 500,
+    'max_batches': 20,
+}
+
+
+def get_history_config() -> dict:
+    """Return PROJECT_HISTORY merged over DEFAULT_PROJECT_HISTORY."""
+    return {**DEFAULT_PROJECT_HISTORY, **(getattr(settings, 'PROJECT_HISTORY', None) or {})}
+
+
+def collect_changes(old_instance, instance):
+    """
+    Compare the tracked fields of two Project instances.
+
+    Returns:
+        dict: ``{field: {'old': str, 'new': str}}`` for every tracked field that differs.
+    """
+    changes = {}
+    for field in TRACKED_FIELDS:
+        old_value = getattr(old_instance, field)
+        new_value = getattr(instance, field)
+        if old_value != new_value:
+            changes[field] = {
+                'old': str(old_value),
+                'new': str(new_value)
+            }
+    return changes
+
+
+def record_history(edits) -> list:
+    """
+    Store history for ``edits``, an iterable of ``(project, user, changes)``
+    where ``changes`` comes from ``collect_changes``, with two inserts.
+
+    Returns:
+        list: the created ProjectHistory entries.
+    """
+    edits = [(project, user, changes) for project, user, changes in edits if changes]
+    entries = ProjectHistory.objects.bulk_create(
+        [ProjectHistory(project=project, user=user) for project, user, _ in edits]
+    )
+    ProjectFieldChange.objects.bulk_create([
+        ProjectFieldChange(
+            history=entry,
+            project_id=entry.project_id,
+            field=field,
+            old_value=values['old'],
+            new_value=values['new'],
+            timestamp=entry.timestamp,
+        )
+        for entry, (_, _, changes) in zip(entries, edits)
+        for field, values in changes.items()
+    ])
+    return entries
+
+
+def _merge_candidates(window: timedelta, limit: int) -> dict:
+    """
+    Projects with at least one entry that follows an entry by the same
+    editor within ``window``, mapped to the earliest such preceding entry.
+    """
+    ordering = [F('timestamp').asc(), F('id').asc()]
+    rows = (
+        ProjectHistory.objects
+        .annotate(
+            previous_user=Window(Lag('user_id'), partition_by=[F('project_id')], order_by=ordering),
+            previous_timestamp=Window(Lag('timestamp'), partition_by=[F('project_id')], order_by=ordering),
+        )
+        .filter(previous_user=F('user_id'), timestamp__lte=F('previous_timestamp') + window)
+        .order_by('project_id', 'timestamp')
+        .values_list('project_id', 'previous_timestamp')
+    )
+    candidates = {}
+    for project_id, previous_timestamp in rows:
+        if project_id not in candidates:
+            if len(candidates) >= limit:
+                break
+            candidates[project_id] = previous_timestamp
+    return candidates
+
+
+def _merge_group(group: list, plan: dict) -> None:
+    """Fold ``group`` (consecutive entries, oldest first) into its first entry."""
+    first, last = group[0], group[-1]
+    merged = {}
+    for entry in group:
+        for change in entry.changes.all():
+            if change.field in merged:
+                merged[change.field]['new'] = change.new_value
+            else:
+                merged[change.field] = {'old': change.old_value, 'new': change.new_value}
+
+    plan['delete'].extend(entry.pk for entry in group[1:])
+    changed = {field: values for field, values in merged.items() if values['old'] != values['new']}
+    if not changed:
+        plan['delete'].append(first.pk)
+        return
+
+    first.timestamp = last.timestamp
+    plan['entries'].append(first)
+    existing = {change.field: change for change in first.changes.all()}
+    for field, values in merged.items():
+        change = existing.get(field)
+        if field not in changed:
+            if change is not None:
+                plan['delete_changes'].append(change.pk)
+        elif change is not None:
+            change.new_value = values['new']
+            change.timestamp = first.timestamp
+            plan['changes'].append(change)
+        else:
+            plan['new_changes'].append(ProjectFieldChange(
+                history=first,
+                project_id=first.project_id,
+                field=field,
+                old_value=values['old'],
+                new_value=values['new'],
+                timestamp=first.timestamp,
+            ))
+
+
+def _merge_projects(candidates: dict, window: timedelta) -> int:
+    """Merge the same-editor runs of ``candidates``; returns entries removed."""
+    entries = (
+        ProjectHistory.objects
+        .filter(project_id__in=list(candidates), timestamp__gte=min(candidates.values()))
+        .order_by('project_id', 'timestamp', 'id')
+        .prefetch_related('changes')
+    )
+    plan = {'entries': [], 'changes': [], 'new_changes': [], 'delete': [], 'delete_changes': []}
+    group = []
+    for entry in entries:
+        if entry.timestamp < candidates[entry.project_id]:
+            continue
+        previous = group[-1] if group else None
+        if (
+            previous is not None
+            and previous.project_id == entry.project_id
+            and previous.user_id is not None
+            and previous.user_id == entry.user_id
+            and entry.timestamp - previous.timestamp <= window
+        ):
+            group.append(entry)
+            continue
+        if len(group) > 1:
+            _merge_group(group, plan)
+        group = [entry]
+    if len(group) > 1:
+        _merge_group(group, plan)
+
+    with transaction.atomic():
+        ProjectFieldChange.objects.filter(pk__in=plan['delete_changes']).delete()
+        ProjectHistory.objects.filter(pk__in=plan['delete']).delete()
+        ProjectHistory.objects.bulk_update(plan['entries'], ['timestamp'])
+        ProjectFieldChange.objects.bulk_update(plan['changes'], ['new_value', 'timestamp'])
+        ProjectFieldChange.objects.bulk_create(plan['new_changes'])
+    return len(plan['delete'])
+
+
+def _delete_in_batches(queryset, *, batch_size: int, max_batches: int) -> int:
+    deleted = 0
+    for _ in range(max_batches):
+        with transaction.atomic():
+            pks = list(queryset.values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                break
+            ProjectHistory.objects.filter(pk__in=pks).delete()
+        deleted += len(pks)
+        if len(pks) < batch_size:
+            break
+    return deleted
+
+
+def compact_history(*, merge_window_seconds=None, retention_days=None, now=None) -> dict:
+    """
+    Merge rapid successive edits and apply the retention period.
+
+    Processes at most ``batch_size`` projects per batch and ``max_batches``
+    batches per run; the next run continues where this one stopped.
+
+    Returns:
+        dict: run metrics.
+    """
+    config = get_history_config()
+    now = now or timezone.now()
+    if merge_window_seconds is None:
+        merge_window_seconds = config['merge_window_seconds']
+    if retention_days is None:
+        retention_days = config['retention_days']
+
+    stats = {'merged': 0, 'expired': 0, 'projects': 0}
+    if retention_days is not None:
+        stats['expired'] = _delete_in_batches(
+            ProjectHistory.objects.filter(timestamp__lt=now - timedelta(days=retention_days)),
+            batch_size=config['batch_size'],
+            max_batches=config['max_batches'],
+        )
+
+    if merge_window_seconds:
+        window = timedelta(seconds=merge_window_seconds)
+        for _ in range(config['max_batches']):
+            candidates = _merge_candidates(window, config['batch_size'])
+            if not candidates:
+                break
+            stats['merged'] += _merge_projects(candidates, window)
+            stats['projects'] += len(candidates)
+            if len(candidates) < config['batch_size']:
+                break
+
+    logger.info(
+        "projects.history compacted merged=%d expired=%d projects=%d",
+        stats['merged'],
+        stats['expired'],
+        stats['projects'],
+        extra={'history_stats': stats},
+    )
+    return stats
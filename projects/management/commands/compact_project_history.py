@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from projects.history import compact_history
+
+
+class Command(BaseCommand):
+    help = "Merge rapid successive project edits and delete history older than the retention period."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--merge-window",
+            type=int,
+            default=None,
+            help="Seconds between edits by the same editor that are merged (default: from settings, 0 disables).",
+        )
+        parser.add_argument(
+            "--retention-days",
+            type=int,
+            default=None,
+            help="Delete history entries older than this many days (default: from settings).",
+        )
+
+    def handle(self, *args, **options):
+        stats = compact_history(
+            merge_window_seconds=options.get("merge_window"),
+            retention_days=options.get("retention_days"),
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Compacted project history: merged={stats['merged']}, "
+                f"expired={stats['expired']}, projects={stats['projects']}"
+            )
+        )
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.4 on 2026-10-18 22:24
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_project_milestones_project_technologies_used_and_more'),
+        ('startups', '0004_startup_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector('title', config='simple', weight='A'), '||', django.contrib.postgres.search.SearchVector('description', config='simple', weight='B'), django.contrib.postgres.search.SearchConfig('simple')), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='project_search_vector_gin'),
+        ),
+    ]
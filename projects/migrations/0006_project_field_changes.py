@@ -0,0 +1,104 @@
+# Generated by Django 5.2.4 on 2026-10-18 23:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def split_changed_fields(apps, schema_editor):
+    """Move each entry's changed_fields JSON into ProjectFieldChange rows."""
+    ProjectHistory = apps.get_model('projects', 'ProjectHistory')
+    ProjectFieldChange = apps.get_model('projects', 'ProjectFieldChange')
+    batch = []
+    for entry in ProjectHistory.objects.only('id', 'project_id', 'timestamp', 'changed_fields').iterator(chunk_size=1000):
+        for field, values in (entry.changed_fields or {}).items():
+            batch.append(ProjectFieldChange(
+                history_id=entry.id,
+                project_id=entry.project_id,
+                field=field,
+                old_value=str(values.get('old', '')),
+                new_value=str(values.get('new', '')),
+                timestamp=entry.timestamp,
+            ))
+        if len(batch) >= 1000:
+            ProjectFieldChange.objects.bulk_create(batch)
+            batch = []
+    ProjectFieldChange.objects.bulk_create(batch)
+
+
+def join_changed_fields(apps, schema_editor):
+    ProjectHistory = apps.get_model('projects', 'ProjectHistory')
+    ProjectFieldChange = apps.get_model('projects', 'ProjectFieldChange')
+    changed = {}
+    for change in ProjectFieldChange.objects.iterator(chunk_size=1000):
+        changed.setdefault(change.history_id, {})[change.field] = {'old': change.old_value, 'new': change.new_value}
+    for history_id, changed_fields in changed.items():
+        ProjectHistory.objects.filter(pk=history_id).update(changed_fields=changed_fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0005_category_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectFieldChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field', models.CharField(max_length=50)),
+                ('old_value', models.TextField(blank=True, default='')),
+                ('new_value', models.TextField(blank=True, default='')),
+                ('timestamp', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Project Field Change',
+                'verbose_name_plural': 'Project Field Changes',
+                'db_table': 'project_field_changes',
+                'ordering': ['-timestamp', '-id'],
+            },
+        ),
+        migrations.AlterModelOptions(
+            name='projecthistory',
+            options={'ordering': ['-timestamp', '-id'], 'verbose_name': 'Project History', 'verbose_name_plural': 'Project Histories'},
+        ),
+        migrations.AddIndex(
+            model_name='projecthistory',
+            index=models.Index(fields=['project', '-timestamp', '-id'], name='project_history_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projecthistory',
+            index=models.Index(fields=['timestamp'], name='project_history_ts_idx'),
+        ),
+        migrations.AddField(
+            model_name='projectfieldchange',
+            name='history',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='changes', to='projects.projecthistory'),
+        ),
+        migrations.AddField(
+            model_name='projectfieldchange',
+            name='project',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='field_changes', to='projects.project'),
+        ),
+        # Lets the reverse migration re-add the column to existing rows
+        migrations.AlterField(
+            model_name='projecthistory',
+            name='changed_fields',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.RunPython(split_changed_fields, join_changed_fields),
+        migrations.RemoveField(
+            model_name='projecthistory',
+            name='changed_fields',
+        ),
+        migrations.AddIndex(
+            model_name='projectfieldchange',
+            index=models.Index(fields=['project', 'field', '-timestamp', '-id'], name='project_field_timeline_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='projectfieldchange',
+            constraint=models.UniqueConstraint(fields=('history', 'field'), name='unique_history_field_change'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 23:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0006_project_field_changes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='follower_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
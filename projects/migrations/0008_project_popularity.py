@@ -0,0 +1,42 @@
+# Generated by Django 5.2.4 on 2026-10-18 23:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0007_project_follower_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='total_follows',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='total_views',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.CreateModel(
+            name='ProjectDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('follows', models.PositiveIntegerField(default=0)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='projects.project')),
+            ],
+            options={
+                'verbose_name': 'Project daily stats',
+                'verbose_name_plural': 'Project daily stats',
+                'db_table': 'project_daily_stats',
+                'ordering': ['-date'],
+                'indexes': [models.Index(fields=['date'], name='project_daily_stats_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('project', 'date'), name='unique_project_daily_stats')],
+            },
+        ),
+    ]
@@ -1,4 +1,6 @@
 from decimal import Decimal
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 
 from django.db import models
 from django.conf import settings
@@ -9,6 +11,7 @@ from validation.validate_document import validate_document_file
 from validation.validate_email import validate_email_custom
 from validation.validate_names import validate_forbidden_names
 
+from common.counter_fields import CounterFieldsMixin
 from common.enums import ProjectStatus
 
 
@@ -20,6 +23,7 @@ class Category(models.Model):
     name = models.CharField(max_length=100, unique=True)
     description = models.TextField(blank=True, default="")
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def clean(self):
         super().clean()
@@ -35,7 +39,7 @@ class Category(models.Model):
         db_table = 'categories'
 
 
-class Project(models.Model):
+class Project(CounterFieldsMixin, models.Model):
     """
     Represents a startup project with details about funding, status, and documentation.
     """
@@ -104,8 +108,23 @@ class Project(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Active ProjectFollow rows; changed only with F() updates (see ProjectFollow.save)
+    follower_count = models.PositiveIntegerField(default=0, editable=False)
+    # Engagement totals rolled up from Redis counters; see startups.popularity
+    total_views = models.PositiveIntegerField(default=0, editable=False)
+    total_follows = models.PositiveIntegerField(default=0, editable=False)
+
     technologies_used = models.CharField(max_length=255, blank=True, default="", help_text="Technologies used in the project, comma-separated")
     milestones = models.JSONField(default=dict, blank=True, help_text="Project milestones or roadmap")
+    # Maintained by Postgres; used by the full-text fallback when Elasticsearch is down
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector('title', weight='A', config='simple')
+            + SearchVector('description', weight='B', config='simple')
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
 
 
     def clean(self):
@@ -133,6 +152,9 @@ class Project(models.Model):
         if errors:
             raise ValidationError(errors)
 
+    # Maintained outside of save(); see ProjectFollow.save and startups.popularity
+    COUNTER_FIELDS = ('follower_count', 'total_views', 'total_follows')
+
     def __str__(self):
         return f"Project '{self.title}' by {self.startup}"
 
@@ -145,24 +167,92 @@ class Project(models.Model):
             models.Index(fields=['status'], name='project_status_idx'),
             models.Index(fields=['created_at'], name='project_created_at_idx'),
             models.Index(fields=['startup'], name='project_startup_idx'),
+            GinIndex(fields=['search_vector'], name='project_search_vector_gin'),
         ]
         constraints = [
             models.UniqueConstraint(fields=['title', 'startup'], name='unique_startup_project_title')
         ]
 class ProjectHistory(models.Model):
     """
-    Stores a history of changes for the Project model.
+    One edit of a Project: who made it and when. The changed values are
+    stored per field in ProjectFieldChange.
     """
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='history')
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True)
-    changed_fields = models.JSONField()
     timestamp = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         db_table = "project_history"
-        ordering = ['-timestamp']
+        ordering = ['-timestamp', '-id']
         verbose_name = "Project History"
         verbose_name_plural = "Project Histories"
+        indexes = [
+            # History feed of a project, paginated by (timestamp, id)
+            models.Index(fields=['project', '-timestamp', '-id'], name='project_history_feed_idx'),
+            # Retention scans
+            models.Index(fields=['timestamp'], name='project_history_ts_idx'),
+        ]
+
+    @property
+    def changed_fields(self):
+        """``{field: {'old': str, 'new': str}}``; prefetch ``changes`` when reading many entries."""
+        return {change.field: {'old': change.old_value, 'new': change.new_value} for change in self.changes.all()}
+
+    def __str__(self):
+        return f"History for {self.project.title} at {self.timestamp}"
+
+
+class ProjectFieldChange(models.Model):
+    """
+    The old and new value of one field in a ProjectHistory entry.
+
+    ``project`` and ``timestamp`` are copied from the entry so the timeline of
+    a single field is served by the (project, field, timestamp) index alone.
+    """
+    history = models.ForeignKey(ProjectHistory, on_delete=models.CASCADE, related_name='changes')
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='field_changes')
+    field = models.CharField(max_length=50)
+    old_value = models.TextField(blank=True, default="")
+    new_value = models.TextField(blank=True, default="")
+    timestamp = models.DateTimeField()
+
+    class Meta:
+        db_table = "project_field_changes"
+        ordering = ['-timestamp', '-id']
+        verbose_name = "Project Field Change"
+        verbose_name_plural = "Project Field Changes"
+        indexes = [
+            models.Index(fields=['project', 'field', '-timestamp', '-id'], name='project_field_timeline_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['history', 'field'], name='unique_history_field_change')
+        ]
+
+    def __str__(self):
+        return f"{self.field}: {self.old_value} -> {self.new_value}"
+
+
+class ProjectDailyStats(models.Model):
+    """
+    Engagement counters of a project for one day (UTC), rolled up from
+    Redis by ``startups.popularity.roll_up``.
+    """
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='daily_stats')
+    date = models.DateField()
+    views = models.PositiveIntegerField(default=0)
+    follows = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'project_daily_stats'
+        ordering = ['-date']
+        verbose_name = 'Project daily stats'
+        verbose_name_plural = 'Project daily stats'
+        constraints = [
+            models.UniqueConstraint(fields=['project', 'date'], name='unique_project_daily_stats'),
+        ]
+        indexes = [
+            models.Index(fields=['date'], name='project_daily_stats_date_idx'),
+        ]
 
     def __str__(self):
-        return f"History for {self.project.title} at {self.timestamp}"
\ No newline at end of file
+        return f"{self.project_id} on {self.date}"
@@ -2,13 +2,15 @@ from decimal import Decimal
 from django.db import transaction
 from django.db.models import F
 from rest_framework import serializers
-from projects.models import Project, Category
+from projects.models import Project, Category, ProjectFieldChange, ProjectHistory
 from startups.models import Startup
 from common.enums import ProjectStatus
+from mixins.sparse_fields_mixin import SparseFieldsetSerializerMixin
 from django_elasticsearch_dsl_drf.serializers import DocumentSerializer
 from projects.documents import ProjectDocument
 from startups.serializers.startup_project import StartupProjectSerializer
 from utils.get_field_value import get_field_value
+from validation.validate_email import validate_email_custom
 
 from investments.models import Subscription
 
@@ -21,7 +23,7 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'description']
 
 
-class ProjectReadSerializer(serializers.ModelSerializer):
+class ProjectReadSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for reading Project with nested related objects,
     including custom fields for startup details.
@@ -42,6 +44,11 @@ class ProjectReadSerializer(serializers.ModelSerializer):
             'has_patents', 'is_participant', 'is_active', 'created_at', 'updated_at'
         ]
         read_only_fields = fields
+        field_sources = {
+            'status_display': ('status',),
+            'startup_name': ('startup__company_name',),
+            'startup_logo': ('startup__logo',),
+        }
 
     def get_status_display(self, obj):
         return ProjectStatus(obj.status).label if obj.status else None
@@ -58,6 +65,40 @@ class ProjectReadSerializer(serializers.ModelSerializer):
         return None
 
 
+class ProjectListSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    """
+    Flat serializer for project listings: related startup and category are
+    reported by id and name instead of nested objects.
+    """
+    status_display = serializers.SerializerMethodField()
+    startup_name = serializers.CharField(source='startup.company_name', read_only=True)
+    category_name = serializers.CharField(source='category.name', read_only=True)
+
+    # Columns loaded for the list queryset; keep in sync with ``fields``
+    QUERYSET_ONLY = (
+        'id', 'title', 'status', 'funding_goal', 'current_funding', 'is_active',
+        'created_at', 'updated_at', 'startup_id', 'startup__company_name',
+        'category_id', 'category__name',
+    )
+
+    class Meta:
+        model = Project
+        fields = [
+            'id', 'title', 'status', 'status_display', 'funding_goal', 'current_funding',
+            'startup', 'startup_name', 'category', 'category_name', 'is_active',
+            'created_at', 'updated_at',
+        ]
+        read_only_fields = fields
+        field_sources = {'status_display': ('status',)}
+        expandable_fields = {
+            'startup': (StartupProjectSerializer, {}),
+            'category': (CategorySerializer, {}),
+        }
+
+    def get_status_display(self, obj):
+        return ProjectStatus(obj.status).label if obj.status else None
+
+
 class ProjectWriteSerializer(serializers.ModelSerializer):
     """
     Serializer for creating/updating Project with validation.
@@ -138,6 +179,61 @@ class ProjectWriteSerializer(serializers.ModelSerializer):
 
         return data
 
+class ProjectBulkItemSerializer(ProjectWriteSerializer):
+    """
+    One entry of a bulk project import: an object with ``id`` updates that
+    project (partially), one without creates a project.
+
+    Related ids are plain integers and the per-row uniqueness validators are
+    dropped; ``projects.bulk`` resolves and checks them once per batch.
+    File uploads are not accepted in bulk.
+    """
+    id = serializers.IntegerField(required=False)
+    startup_id = serializers.IntegerField(required=False)
+    category_id = serializers.IntegerField(required=False)
+
+    class Meta(ProjectWriteSerializer.Meta):
+        fields = [
+            field for field in ProjectWriteSerializer.Meta.fields
+            if field not in ('business_plan', 'media_files', 'created_at', 'updated_at')
+        ]
+        extra_kwargs = {'email': {'validators': [validate_email_custom]}}
+        validators = []
+
+
+class ProjectFieldChangeSerializer(serializers.ModelSerializer):
+    """One changed field of a history entry."""
+    old = serializers.CharField(source='old_value', read_only=True)
+    new = serializers.CharField(source='new_value', read_only=True)
+
+    class Meta:
+        model = ProjectFieldChange
+        fields = ['field', 'old', 'new']
+        read_only_fields = fields
+
+
+class ProjectHistorySerializer(serializers.ModelSerializer):
+    """A history entry with its changed fields; prefetch ``changes``."""
+    changes = ProjectFieldChangeSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = ProjectHistory
+        fields = ['id', 'user', 'timestamp', 'changes']
+        read_only_fields = fields
+
+
+class ProjectFieldTimelineSerializer(serializers.ModelSerializer):
+    """One point of a single field's timeline."""
+    user = serializers.IntegerField(source='history.user_id', read_only=True, allow_null=True)
+    old = serializers.CharField(source='old_value', read_only=True)
+    new = serializers.CharField(source='new_value', read_only=True)
+
+    class Meta:
+        model = ProjectFieldChange
+        fields = ['history', 'user', 'timestamp', 'old', 'new']
+        read_only_fields = fields
+
+
 class ProjectDocumentSerializer(DocumentSerializer):
     """
     Serializer for the Elasticsearch ProjectDocument.
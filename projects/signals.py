@@ -1,16 +1,14 @@
-from django.db.models.signals import post_save, post_delete, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 
-from projects.models import Project, ProjectHistory
-from projects.documents import ProjectDocument
+from common import detail_cache
+from projects.history import collect_changes, record_history
+from projects.models import Category, Project
+from startups.models import Startup
 
-import logging
 from investments.models import Subscription
 from communications.services import create_in_app_notification
-from elasticsearch.exceptions import ConnectionError, NotFoundError
-
-TRACKED_FIELDS = ['title', 'description', 'funding_goal', 'status', 'website', 'technologies_used', 'milestones']
 
 @receiver(pre_save, sender=Project)
 def store_pre_save_instance(sender, instance, **kwargs):
@@ -39,22 +37,9 @@ def handle_project_updates(sender, instance, created, **kwargs):
     if not old_instance:
         return
 
-    changes = {}
-    for field in TRACKED_FIELDS:
-        old_value = getattr(old_instance, field)
-        new_value = getattr(instance, field)
-        if old_value != new_value:
-            changes[field] = {
-                'old': str(old_value),
-                'new': str(new_value)
-            }
-
+    changes = collect_changes(old_instance, instance)
     if changes:
-        ProjectHistory.objects.create(
-            project=instance,
-            user=getattr(instance, '_last_editor', None),
-            changed_fields=changes
-        )
+        record_history([(instance, getattr(instance, '_last_editor', None), changes)])
 
         investor_user_ids = Subscription.objects.filter(project=instance).values_list('investor__user_id', flat=True).distinct()
         investor_users = get_user_model().objects.filter(user_id__in=investor_user_ids)
@@ -74,11 +59,16 @@ def handle_project_updates(sender, instance, created, **kwargs):
                 triggered_by_type='startup'
             )
 
-@receiver(post_delete, sender=Project)
-def delete_project(sender, instance, **kwargs):
-    try:
-        ProjectDocument().delete(id=instance.id)
-    except (ConnectionError, NotFoundError) as e:
-        logging.error(
-            f"Failed to delete project {instance.id} from Elasticsearch: {e}"
-        )
\ No newline at end of file
+
+@receiver([post_save, post_delete], sender=Project)
+def invalidate_project_detail(sender, instance, **kwargs):
+    """Project details embed the row; startup details embed their projects."""
+    detail_cache.invalidate(Project, [instance.pk])
+    detail_cache.invalidate(Startup, [instance.startup_id])
+
+
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_category_details(sender, instance, **kwargs):
+    projects = Project.objects.filter(category=instance)
+    detail_cache.invalidate(Project, projects.values_list('pk', flat=True))
+    detail_cache.invalidate(Startup, projects.values_list('startup_id', flat=True).distinct())
@@ -0,0 +1,23 @@
+from celery import shared_task
+
+
+@shared_task
+def notify_project_subscribers_task(project_ids, editor_id=None):
+    """
+    Celery task to notify subscribed investors that projects were updated.
+    Enqueued once per bulk import; returns the number of notifications created.
+    """
+    from projects.bulk import notify_project_subscribers
+
+    return notify_project_subscribers(project_ids, editor_id)
+
+
+@shared_task
+def compact_project_history_task():
+    """
+    Celery task to merge rapid successive project edits and drop expired history.
+    Scheduled daily via Celery Beat; returns the run metrics.
+    """
+    from projects.history import compact_history
+
+    return compact_history()
@@ -3,7 +3,7 @@ from rest_framework.routers import DefaultRouter
 
 from investments.views import SubscriptionCreateView
 from projects.views import ProjectDocumentView, ProjectViewSet
-from investors.views import ProjectFollowCreateView, ProjectFollowersListView
+from investors.views import ProjectFollowCreateView, ProjectFollowerCountsView, ProjectFollowersListView
 
 router = DefaultRouter()
 router.register(r'projects', ProjectViewSet, basename='project')
@@ -15,4 +15,5 @@ urlpatterns = [
     path("<int:project_id>/subscribe/", SubscriptionCreateView.as_view(), name="project-subscribe"),
     path("<int:project_id>/follow/", ProjectFollowCreateView.as_view(), name="project-follow"),
     path("<int:project_id>/followers/", ProjectFollowersListView.as_view(), name="project-followers"),
+    path("follower-counts/", ProjectFollowerCountsView.as_view(), name="project-follower-counts"),
 ]
@@ -2,28 +2,47 @@ from rest_framework import viewsets, filters, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination
 from django_filters.rest_framework import DjangoFilterBackend
 from elasticsearch.exceptions import ConnectionError, TransportError
-from elasticsearch_dsl import Q
+from projects.bulk import bulk_upsert_projects
+from projects.history import TRACKED_FIELDS
 from projects.models import Project
 
 from django_elasticsearch_dsl_drf.viewsets import DocumentViewSet
-from django_elasticsearch_dsl_drf.filter_backends import (
-    FilteringFilterBackend,
-    OrderingFilterBackend,
-    SearchFilterBackend,
-)
+from django_elasticsearch_dsl_drf.filter_backends import OrderingFilterBackend
 
 from users.cookie_jwt import CookieJWTAuthentication
 from users.permissions import IsAuthenticatedOr401, HasActiveCompanyAccount
 from projects.documents import ProjectDocument
+from mixins.conditional_get_mixin import ConditionalGetMixin
+from mixins.detail_cache_mixin import DetailCacheMixin
+from mixins.sparse_fields_mixin import SparseFieldsetViewMixin
 from projects.permissions import IsOwnerOrReadOnly
-from projects.serializers import ProjectDocumentSerializer, ProjectReadSerializer, ProjectWriteSerializer
+from projects.serializers import (
+    ProjectDocumentSerializer, ProjectFieldTimelineSerializer, ProjectHistorySerializer,
+    ProjectListSerializer, ProjectReadSerializer, ProjectWriteSerializer,
+)
+from search.facets import FACETS_PARAM, FUNDING_GOAL_RANGES, FacetedSearchMixin
+from search.fallback import DatabaseFallbackMixin
+from search.query_builder import INFIX, FilterQueryBuilder
+from search.result_cache import CachedSearchMixin
+from startups import popularity
 import logging
 
 logger = logging.getLogger(__name__)
 
-class ProjectViewSet(viewsets.ModelViewSet):
+
+class ProjectHistoryCursorPagination(CursorPagination):
+    """
+    Keyset pagination for project history, over (timestamp, id) like the
+    project_history_feed_idx and project_field_timeline_idx indexes.
+    """
+    page_size = 20
+    ordering = ('-timestamp', '-id')
+
+
+class ProjectViewSet(ConditionalGetMixin, DetailCacheMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     API endpoint for viewing and editing projects.
 
@@ -38,6 +57,11 @@ class ProjectViewSet(viewsets.ModelViewSet):
         - Searching: by `title`, `description`, and `email`.
         - Ordering: by `created_at`, `funding_goal`, and `current_funding`.
         - Default ordering: newest projects first (`-created_at`).
+        - Sparse fieldsets: `?fields=` and `?expand=` on read operations.
+        - Conditional GET: ETag / Last-Modified on list and retrieve.
+        - Retrieve payloads are served from the Redis detail cache.
+        - Bulk import: create and update many projects in one request.
+        - History: paginated change history, or the timeline of one field.
 
     Permissions:
         - Authenticated users can view all projects.
@@ -52,20 +76,43 @@ class ProjectViewSet(viewsets.ModelViewSet):
     search_fields = ['title', 'description', 'email']
     ordering_fields = ['created_at', 'funding_goal', 'current_funding']
     ordering = ['-created_at']
+    # IsOwnerOrReadOnly compares obj.startup.user on retrieve
+    sparse_detail_required_fields = ('startup__user',)
+    conditional_timestamp_fields = ('updated_at', 'startup__updated_at', 'category__updated_at')
+    permission_object_fields = ('startup__user__user_id',)
+
+    def get_queryset(self):
+        """
+        Lists load only the columns ProjectListSerializer renders.
+        """
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            queryset = queryset.only(*ProjectListSerializer.QUERYSET_ONLY)
+        return queryset
 
     def get_serializer_class(self):
         """
         Return the appropriate serializer class depending on the action.
 
-        - For read actions (`list`, `retrieve`), use `ProjectReadSerializer`
+        - For `list`, use the flat `ProjectListSerializer`.
+        - For `retrieve`, use `ProjectReadSerializer`
           to include detailed, read-only fields.
         - For write actions (`create`), use `ProjectWriteSerializer` to handle validation and input data.
         - For the `update_project` action, we'll use `ProjectReadSerializer` for the response.
         """
-        if self.action in ['list', 'retrieve', 'update_project']:
+        if self.action == 'list':
+            return ProjectListSerializer
+        if self.action in ['retrieve', 'update_project']:
             return ProjectReadSerializer
         return ProjectWriteSerializer
     
+    def retrieve(self, request, *args, **kwargs):
+        """Count a project view for every successful detail request, cached or not."""
+        response = super().retrieve(request, *args, **kwargs)
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            popularity.record('views', (Project, self.kwargs['pk']))
+        return response
+
     def perform_update(self, serializer):
         """
         Updates the project instance and sets the last editor.
@@ -93,6 +140,42 @@ class ProjectViewSet(viewsets.ModelViewSet):
         self.perform_update(serializer)
         return Response(ProjectReadSerializer(project).data, status=status.HTTP_200_OK)
     
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_upsert(self, request):
+        """
+        Create and update up to PROJECT_BULK_MAX_ITEMS projects in one request.
+        The URL will be /api/v1/projects/projects/bulk/
+
+        The body is a list of project objects; objects with an ``id`` update
+        that project, the others create one. The batch is all-or-nothing.
+        """
+        result = bulk_upsert_projects(request.data, request.user)
+        return Response(result, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=['get'], url_path='history')
+    def history(self, request, pk=None):
+        """
+        Change history of a project, newest first, cursor-paginated.
+        The URL will be /api/v1/projects/projects/{pk}/history/
+
+        With ``?field=<name>`` returns the timeline of that tracked field only.
+        """
+        project = self.get_object()
+        field = request.query_params.get('field')
+        if field:
+            if field not in TRACKED_FIELDS:
+                raise ValidationError({'field': [f"Unknown field. Allowed fields: {', '.join(TRACKED_FIELDS)}."]})
+            queryset = project.field_changes.filter(field=field).select_related('history')
+            serializer_class = ProjectFieldTimelineSerializer
+        else:
+            queryset = project.history.prefetch_related('changes')
+            serializer_class = ProjectHistorySerializer
+
+        paginator = ProjectHistoryCursorPagination()
+        # Without the view, so the project OrderingFilter doesn't override the history ordering
+        page = paginator.paginate_queryset(queryset, request)
+        return paginator.get_paginated_response(serializer_class(page, many=True).data)
+
     def partial_update(self, request, *args, **kwargs):
         """
         This method will no longer be the primary way to update a project.
@@ -101,7 +184,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
         return super().partial_update(request, *args, **kwargs)
 
 
-class ProjectDocumentView(DocumentViewSet):
+class ProjectDocumentView(CachedSearchMixin, DatabaseFallbackMixin, FacetedSearchMixin, DocumentViewSet):
     """
     Elasticsearch-backed viewset for Project documents.
     Supports filtering, ordering, and full-text search with robust error handling.
@@ -111,15 +194,31 @@ class ProjectDocumentView(DocumentViewSet):
     document = ProjectDocument
     serializer_class = ProjectDocumentSerializer
 
+    # Filters and search are compiled by FilterQueryBuilder in filter_queryset
     filter_backends = [
-        FilteringFilterBackend,
         OrderingFilterBackend,
-        SearchFilterBackend,
     ]
 
-    filter_fields = {
-        'category.name': 'category.name',
-        'startup.company_name': 'startup.company_name',
+    query_filters = {
+        'startup.company_name': {'field': 'startup.company_name'},
+        'title': {'field': 'title.ngram', 'type': INFIX},
+        'description': {'field': 'description.ngram', 'type': INFIX},
+    }
+
+    # Filterable facets; counts are returned with ?facets=true
+    facets = {
+        'category.name': {'field': 'category.name'},
+        'status': {'field': 'status'},
+        'funding_goal': {'field': 'funding_goal', 'ranges': FUNDING_GOAL_RANGES},
+    }
+
+    # Used by the Postgres fallback while Elasticsearch is unavailable
+    fallback_filters = {
+        'startup.company_name': 'startup__company_name',
+        'title': 'title__icontains',
+        'description': 'description__icontains',
+        'category.name': 'category__name',
+        'status': 'status',
     }
 
     ordering_fields = {
@@ -135,51 +234,29 @@ class ProjectDocumentView(DocumentViewSet):
     def filter_queryset(self, queryset):
         """
         Filters the queryset based on query parameters.
-        Supports multiple values per filter field and partial matches for text fields.
+        Supports multiple values per filter field and substring matches on
+        title/description via their trigram subfields.
         Raises ValidationError if invalid filter parameters are provided.
         """
-        params = self.request.query_params
-        allowed_params = set(self.filter_fields.keys()) | {'search'}
-
-        invalid_params = set(params.keys()) - allowed_params
-        if invalid_params:
-            allowed = ', '.join(sorted(allowed_params))
-            logger.warning(f"Invalid filter field(s) attempted: {sorted(invalid_params)}. Allowed fields: {allowed}")
-            raise ValidationError({
-                'error': f'Invalid filter field(s): {", ".join(sorted(invalid_params))}. Allowed fields: {allowed}'
-            })
-
-        must_queries = []
-
-        for field, es_field in self.filter_fields.items():
-            if field in params:
-                values = params.getlist(field)
-                if field in ['title', 'description']:
-                    for val in values:
-                        must_queries.append(Q('wildcard', **{es_field: f'*{val}*'}))
-                else:
-                    for val in values:
-                        must_queries.append(Q('term', **{es_field: val}))
-
-        search_terms = params.getlist('search')
-        if search_terms:
-            should_queries = []
-            for term in search_terms:
-                should_queries.append(Q('match', title=term))
-                should_queries.append(Q('match', description=term))
-            if should_queries:
-                must_queries.append(Q('bool', should=should_queries, minimum_should_match=1))
-
-        if must_queries:
-            queryset = queryset.query(Q('bool', must=must_queries))
-
+        builder = FilterQueryBuilder(
+            self.query_filters,
+            self.search_fields,
+            set(self.facets) | {FACETS_PARAM, self.paginator.page_query_param},
+        )
+        try:
+            query = builder.build(self.request.query_params)
+        except ValidationError as ve:
+            logger.warning(f"Invalid filter params: {ve.detail}")
+            raise
+        if query is not None:
+            queryset = queryset.query(query)
         return super().filter_queryset(queryset)
 
     def list(self, request, *args, **kwargs):
         """
         Overrides the list action.
         Relies on filter_queryset to validate query params and filter the queryset.
-        Handles Elasticsearch connection errors gracefully with HTTP 503 response.
+        Falls back to Postgres full-text search when Elasticsearch is down.
         """
         try:
             return super().list(request, *args, **kwargs)
@@ -0,0 +1,73 @@
+"""
+Typeahead suggestions from Elasticsearch completion suggesters.
+
+Company names, project titles, industries and categories each have a
+``suggest`` completion subfield in the documents. All requested groups are
+fetched in one ``_msearch`` round trip (one suggest-only search per index),
+which is served from the in-memory FST and returns in a few milliseconds.
+"""
+from elasticsearch_dsl import MultiSearch
+
+from projects.models import Category, Project
+from startups.models import Industry, Startup
+
+from .documents import ProjectDocument, StartupDocument
+
+SUGGESTERS = {
+    'startups': (StartupDocument, 'company_name.suggest'),
+    'projects': (ProjectDocument, 'title.suggest'),
+    'industries': (StartupDocument, 'industry.name.suggest'),
+    'categories': (ProjectDocument, 'category.name.suggest'),
+}
+
+# Suggestions of these groups point at a document and carry its id
+DOCUMENT_GROUPS = ('startups', 'projects')
+
+
+def build_multi_search(prefix: str, groups, size: int) -> MultiSearch:
+    searches = {}
+    for name in groups:
+        document, field = SUGGESTERS[name]
+        search = searches.get(document) or document.search().source(False).extra(size=0)
+        # Industry/category names repeat across documents; titles are distinct items
+        searches[document] = search.suggest(
+            name, prefix,
+            completion={'field': field, 'size': size, 'skip_duplicates': name not in DOCUMENT_GROUPS},
+        )
+    multi_search = MultiSearch()
+    for search in searches.values():
+        multi_search = multi_search.add(search)
+    return multi_search
+
+
+def parse_suggestions(responses, groups) -> dict:
+    """Return {group: [{'text', 'id'?}]} from executed suggest-only searches."""
+    result = {name: [] for name in groups}
+    for response in responses:
+        suggest = response.to_dict().get('suggest', {})
+        for name, entries in suggest.items():
+            for option in entries[0]['options']:
+                item = {'text': option['text']}
+                if name in DOCUMENT_GROUPS:
+                    item['id'] = int(option['_id'])
+                result[name].append(item)
+    return result
+
+
+def database_suggestions(prefix: str, groups, size: int) -> dict:
+    """Prefix matches from Postgres, used while Elasticsearch is unavailable."""
+    sources = {
+        'startups': Startup.objects.filter(company_name__istartswith=prefix)
+                                   .order_by('company_name').values_list('id', 'company_name'),
+        'projects': Project.objects.filter(title__istartswith=prefix).order_by('title').values_list('id', 'title'),
+        'industries': Industry.objects.filter(name__istartswith=prefix).order_by('name').values_list('name', flat=True),
+        'categories': Category.objects.filter(name__istartswith=prefix).order_by('name').values_list('name', flat=True),
+    }
+    result = {}
+    for name in groups:
+        rows = sources[name][:size]
+        if name in DOCUMENT_GROUPS:
+            result[name] = [{'text': text, 'id': pk} for pk, text in rows]
+        else:
+            result[name] = [{'text': text} for text in rows]
+    return result
@@ -0,0 +1,113 @@
+"""
+Benchmark for project substring filters: leading wildcards vs trigram subfields.
+
+Builds a throw-away index with ProjectDocument's mapping and analysis, fills
+it with synthetic projects and runs both strategies over the same random
+substrings. Latency is reported as wall time and as Elasticsearch's own
+``took``; total hits are reported so the strategies can be checked for
+matching results.
+"""
+import random
+import statistics
+import time
+
+from elasticsearch.helpers import bulk
+from elasticsearch_dsl import Index, Q, Search
+from elasticsearch_dsl.connections import connections
+
+from projects.documents import ProjectDocument
+
+WORDS = (
+    'solar', 'energy', 'health', 'medical', 'finance', 'payments', 'retail', 'logistics',
+    'agriculture', 'education', 'learning', 'robotics', 'drone', 'security', 'network',
+    'cloud', 'platform', 'analytics', 'marketplace', 'mobile', 'battery', 'storage',
+    'water', 'recycling', 'transport', 'travel', 'housing', 'construction', 'textile',
+    'fashion', 'gaming', 'music', 'media', 'insurance', 'lending', 'crypto', 'sensor',
+    'wearable', 'genomics', 'pharmacy', 'clinic', 'fitness', 'nutrition', 'delivery',
+    'kitchen', 'coffee', 'bakery', 'satellite', 'aviation', 'maritime', 'railway',
+)
+STATUSES = ('draft', 'active', 'completed')
+CATEGORIES = ('Tech', 'Finance', 'Health', 'Energy', 'Education')
+
+STRATEGIES = {
+    'wildcard': lambda term: Q('wildcard', **{'title.raw': {'value': f'*{term}*', 'case_insensitive': True}}),
+    'trigram': lambda term: Q('match_phrase', **{'title.ngram': term}),
+}
+
+
+def synthetic_projects(count: int, seed: int):
+    rng = random.Random(seed)
+    for pk in range(1, count + 1):
+        title = ' '.join(word.capitalize() for word in rng.sample(WORDS, 3))
+        category = rng.randrange(len(CATEGORIES))
+        yield {
+            'id': pk,
+            'title': title,
+            'description': ' '.join(rng.choices(WORDS, k=20)),
+            'status': rng.choice(STATUSES),
+            'funding_goal': rng.randrange(1_000, 2_000_000),
+            'category': {'id': category + 1, 'name': CATEGORIES[category]},
+            'startup': {'id': pk % 5_000 + 1, 'company_name': f'Startup {pk % 5_000 + 1}'},
+        }
+
+
+def sample_terms(count: int, seed: int) -> list:
+    """Random 4-6 character substrings of the vocabulary (infix, not prefix)."""
+    rng = random.Random(seed + 1)
+    terms = []
+    for _ in range(count):
+        word = rng.choice(WORDS)
+        length = min(len(word), rng.randint(4, 6))
+        start = rng.randint(0, len(word) - length)
+        terms.append(word[start:start + length])
+    return terms
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * pct))], 2)
+
+
+def run_filter_benchmark(*, documents: int = 100_000, runs: int = 50, seed: int = 42,
+                         keep: bool = False) -> dict:
+    client = connections.get_connection()
+    name = f"bench_projects_{int(time.time())}"
+    index = Index(name)
+    index.settings(**ProjectDocument._index._settings)
+    index.document(ProjectDocument)
+    index.create()
+    try:
+        start = time.monotonic()
+        bulk(
+            client,
+            ({'_index': name, '_id': doc['id'], '_source': doc} for doc in synthetic_projects(documents, seed)),
+            chunk_size=2_000,
+        )
+        index.refresh()
+        fill_seconds = round(time.monotonic() - start, 2)
+
+        terms = sample_terms(runs, seed)
+        results = {}
+        for strategy, build in STRATEGIES.items():
+            # Warm-up so both strategies start with loaded segments
+            Search(using=client, index=name).query(build(terms[0])).execute()
+            wall, took, hits = [], [], 0
+            for term in terms:
+                search = Search(using=client, index=name).query(build(term)).extra(track_total_hits=True)
+                started = time.perf_counter()
+                response = search.execute()
+                wall.append((time.perf_counter() - started) * 1000)
+                took.append(response.took)
+                hits += response.hits.total.value
+            results[strategy] = {
+                'p50_ms': _percentile(wall, 0.5),
+                'p95_ms': _percentile(wall, 0.95),
+                'mean_ms': round(statistics.mean(wall), 2),
+                'took_p50_ms': _percentile(took, 0.5),
+                'took_p95_ms': _percentile(took, 0.95),
+                'total_hits': hits,
+            }
+    finally:
+        if not keep:
+            index.delete(ignore=404)
+    return {'index': name, 'documents': documents, 'runs': runs, 'fill_seconds': fill_seconds, 'results': results}
@@ -0,0 +1,117 @@
+"""
+Circuit breaker in front of Elasticsearch.
+
+Failures are counted in Redis, so every web worker shares one view of the
+cluster's health. Once ``failure_threshold`` outage errors happen within
+``window_seconds`` the circuit opens: for ``reset_timeout`` seconds callers
+skip Elasticsearch entirely and serve from the Postgres full-text fallback
+instead of waiting on timeouts. When the open key expires the next request
+probes Elasticsearch again; a success clears the failure count.
+
+Only outages count as failures (connection errors, timeouts, 5xx). Bad
+queries (4xx) are re-raised unchanged. If Redis itself is unavailable the
+breaker stays closed and requests go to Elasticsearch as before.
+"""
+import logging
+
+from django.conf import settings
+from elasticsearch.exceptions import ConnectionError, TransportError
+from redis.exceptions import RedisError
+
+from utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CIRCUIT_BREAKER = {
+    'key_prefix': 'search:breaker',
+    'failure_threshold': 5,
+    'window_seconds': 60,
+    'reset_timeout': 30,
+}
+
+
+class SearchUnavailable(Exception):
+    """Raised when Elasticsearch is down or the circuit is open."""
+
+
+def get_breaker_config() -> dict:
+    """Return SEARCH_CIRCUIT_BREAKER merged over DEFAULT_CIRCUIT_BREAKER."""
+    return {**DEFAULT_CIRCUIT_BREAKER, **(getattr(settings, 'SEARCH_CIRCUIT_BREAKER', None) or {})}
+
+
+def is_outage(exc: Exception) -> bool:
+    """True for errors that mean the cluster is unreachable or unhealthy."""
+    if isinstance(exc, ConnectionError):
+        return True
+    if isinstance(exc, TransportError):
+        return not isinstance(exc.status_code, int) or exc.status_code >= 500
+    return False
+
+
+class CircuitBreaker:
+    def __init__(self, name: str):
+        self.name = name
+
+    def _keys(self, config: dict):
+        prefix = f"{config['key_prefix']}:{self.name}"
+        return f"{prefix}:failures", f"{prefix}:open"
+
+    def is_open(self) -> bool:
+        _, open_key = self._keys(get_breaker_config())
+        try:
+            return bool(get_redis().exists(open_key))
+        except RedisError:
+            return False
+
+    def record_success(self) -> None:
+        failures_key, _ = self._keys(get_breaker_config())
+        try:
+            get_redis().delete(failures_key)
+        except RedisError:
+            pass
+
+    def record_failure(self) -> None:
+        config = get_breaker_config()
+        failures_key, open_key = self._keys(config)
+        try:
+            redis = get_redis()
+            pipe = redis.pipeline()
+            # The window starts at the first failure and is not extended by later ones
+            pipe.set(failures_key, 0, ex=config['window_seconds'], nx=True)
+            pipe.incr(failures_key)
+            _, failures = pipe.execute()
+            if failures >= config['failure_threshold']:
+                redis.set(open_key, 1, ex=config['reset_timeout'])
+                redis.delete(failures_key)
+                logger.warning(
+                    "[SEARCH] Circuit %s opened after %s failures", self.name, failures,
+                    extra={'breaker': self.name, 'reset_timeout': config['reset_timeout']},
+                )
+        except RedisError:
+            logger.warning("[SEARCH] Could not record failure for circuit %s", self.name)
+
+    def reset(self) -> None:
+        try:
+            get_redis().delete(*self._keys(get_breaker_config()))
+        except RedisError:
+            pass
+
+    def call(self, func, *args, **kwargs):
+        """
+        Run ``func`` unless the circuit is open. Outage errors are recorded
+        and re-raised as SearchUnavailable; other errors propagate untouched.
+        """
+        if self.is_open():
+            raise SearchUnavailable(f"Circuit {self.name} is open")
+        try:
+            result = func(*args, **kwargs)
+        except (ConnectionError, TransportError) as exc:
+            if not is_outage(exc):
+                raise
+            self.record_failure()
+            raise SearchUnavailable(str(exc)) from exc
+        self.record_success()
+        return result
+
+
+elasticsearch_breaker = CircuitBreaker('elasticsearch')
@@ -0,0 +1,130 @@
+"""
+Faceted search for the Elasticsearch document viewsets.
+
+Facet filters are applied as ``post_filter`` so they narrow the hits but not
+the aggregations. Each facet's aggregation is wrapped in a ``filter``
+aggregation holding every *other* active facet filter, which gives
+multi-select counts: picking ``stage=seed`` still shows how many hits every
+other stage would have. Hits and all facet counts come back from one query.
+"""
+from elasticsearch_dsl import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+FUNDING_GOAL_RANGES = (
+    ('lt_10k', None, 10_000),
+    ('10k_100k', 10_000, 100_000),
+    ('100k_1m', 100_000, 1_000_000),
+    ('gte_1m', 1_000_000, None),
+)
+
+FACETS_PARAM = 'facets'
+DEFAULT_FACET_SIZE = 20
+
+
+def _range_filter(field, ranges, keys):
+    known = {key: (start, end) for key, start, end in ranges}
+    unknown = [key for key in keys if key not in known]
+    if unknown:
+        raise ValidationError({field: f"Unknown range(s): {', '.join(unknown)}. Allowed: {', '.join(known)}"})
+    should = []
+    for key in keys:
+        start, end = known[key]
+        bounds = {}
+        if start is not None:
+            bounds['gte'] = start
+        if end is not None:
+            bounds['lt'] = end
+        should.append(Q('range', **{field: bounds}))
+    return Q('bool', should=should, minimum_should_match=1)
+
+
+def build_facet_filter(config, values):
+    if 'ranges' in config:
+        return _range_filter(config['field'], config['ranges'], values)
+    return Q('terms', **{config['field']: values})
+
+
+def apply_facets(search, facets, params, with_aggregations=False):
+    """
+    Apply facet filters from ``params`` as a post_filter and optionally add the
+    facet aggregations to ``search``.
+    """
+    active = {
+        name: build_facet_filter(config, params.getlist(name))
+        for name, config in facets.items() if params.getlist(name)
+    }
+    if active:
+        search = search.post_filter('bool', filter=list(active.values()))
+    if with_aggregations:
+        search = search._clone()
+        for name, config in facets.items():
+            others = [query for other, query in active.items() if other != name]
+            bucket = search.aggs.bucket(
+                f'_facet_{name}', 'filter',
+                filter=Q('bool', filter=others) if others else Q('match_all'),
+            )
+            if 'ranges' in config:
+                ranges = []
+                for key, start, end in config['ranges']:
+                    bounds = {'key': key}
+                    if start is not None:
+                        bounds['from'] = start
+                    if end is not None:
+                        bounds['to'] = end
+                    ranges.append(bounds)
+                bucket.bucket(name, 'range', field=config['field'], ranges=ranges)
+            else:
+                bucket.bucket(name, 'terms', field=config['field'], size=config.get('size', DEFAULT_FACET_SIZE))
+    return search
+
+
+def parse_facets(aggregations, facets, params):
+    """Return {facet: [{'value', 'count', 'selected'}]} from the aggregations of an executed search."""
+    result = {}
+    for name in facets:
+        selected = set(params.getlist(name))
+        buckets = aggregations[f'_facet_{name}'][name].buckets
+        result[name] = [
+            {'value': bucket.key, 'count': bucket.doc_count, 'selected': str(bucket.key) in selected}
+            for bucket in buckets
+        ]
+    return result
+
+
+class FacetedSearchMixin:
+    """
+    Adds facet filtering and ``?facets=true`` facet counts to a DocumentViewSet.
+
+    ``facets`` maps a query parameter to ``{'field': <es field>}`` for terms
+    facets (optional ``size``) or ``{'field': ..., 'ranges': ((key, from, to), ...)}``
+    for range facets, where the parameter takes range keys.
+    With facets requested the paginated list response gains a ``facets`` key,
+    parsed from the aggregations of the page query.
+    """
+    facets = {}
+
+    def facets_requested(self):
+        return self.request.query_params.get(FACETS_PARAM, '').lower() in ('1', 'true', 'yes')
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        return apply_facets(
+            queryset, self.facets, self.request.query_params, with_aggregations=self.facets_requested(),
+        )
+
+    def list(self, request, *args, **kwargs):
+        if not self.facets_requested():
+            return super().list(request, *args, **kwargs)
+        search = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(search)
+        if page is None:
+            response = search.execute()
+            return Response({
+                'results': self.get_serializer(response, many=True).data,
+                'facets': parse_facets(response.aggregations, self.facets, request.query_params),
+            })
+        paginated = self.get_paginated_response(self.get_serializer(page, many=True).data)
+        # The page query carries the aggregations; replace the raw buckets the paginator adds
+        paginated.data['facets'] = parse_facets(self.paginator.page.facets, self.facets, request.query_params)
+        return paginated
@@ -0,0 +1,76 @@
+"""
+Postgres full-text fallback for the Elasticsearch-backed list endpoints.
+
+When Elasticsearch is unreachable, or the circuit breaker has opened after
+repeated failures, list requests are answered from the ``search_vector``
+columns instead of returning 503. Responses keep their usual shape and carry
+``X-Search-Backend: database`` so clients and monitoring can tell them apart.
+Ranking, facet counts and deep pagination are Elasticsearch-only and are
+simplified in fallback mode.
+"""
+import logging
+
+from elasticsearch_dsl.utils import AttrDict
+from rest_framework.response import Response
+
+from .circuit_breaker import SearchUnavailable, elasticsearch_breaker
+from .services import full_text_search
+
+logger = logging.getLogger(__name__)
+
+BACKEND_HEADER = 'X-Search-Backend'
+DATABASE_BACKEND = 'database'
+
+
+class DatabaseFallbackMixin:
+    """
+    Serve a DocumentViewSet's list action from Postgres while Elasticsearch is down.
+
+    ``fallback_filters`` maps query parameters to ORM lookups, e.g.
+    ``{'status': 'status'}``; each parameter accepts multiple values. A
+    lookup ending in ``__icontains`` mirrors an infix filter: every value
+    must be contained in the field, as with ``match_phrase``. The
+    ``search`` parameter is matched against the model's ``search_vector``.
+    Rows are built with ``Document.prepare`` so the document serializer sees
+    the same structure it gets from a hit.
+    """
+    fallback_filters = {}
+    fallback_page_size = 10
+
+    def get_fallback_queryset(self):
+        params = self.request.query_params
+        queryset = self.document().get_queryset()
+        for param, lookup in self.fallback_filters.items():
+            if lookup.endswith('__icontains'):
+                for value in params.getlist(param):
+                    if value.strip():
+                        queryset = queryset.filter(**{lookup: value.strip()})
+                continue
+            values = params.getlist(param)
+            if values:
+                queryset = queryset.filter(**{f'{lookup}__in': values})
+        text = ' '.join(params.getlist('search'))
+        if text:
+            return full_text_search(queryset, text)
+        return queryset.order_by('pk')
+
+    def fallback_list(self, request):
+        document = self.document()
+        rows = [
+            AttrDict(document.prepare(instance))
+            for instance in self.get_fallback_queryset()[:self.fallback_page_size]
+        ]
+        data = self.get_serializer(rows, many=True).data
+        if getattr(self, 'facets_requested', None) and self.facets_requested():
+            data = {'results': data, 'facets': {}}
+        return Response(data, headers={BACKEND_HEADER: DATABASE_BACKEND})
+
+    def list(self, request, *args, **kwargs):
+        try:
+            return elasticsearch_breaker.call(super().list, request, *args, **kwargs)
+        except SearchUnavailable as exc:
+            logger.warning(
+                "[SEARCH] Serving %s from the database: %s", self.document.Index.name, exc,
+                extra={'index': self.document.Index.name},
+            )
+            return self.fallback_list(request)
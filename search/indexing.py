@@ -0,0 +1,555 @@
+"""
+Asynchronous, batched Elasticsearch indexing.
+
+Model saves and deletes no longer talk to Elasticsearch in the request.
+QueuedSignalProcessor records "<app_label>.<model>:<pk>" keys and, once the
+transaction commits, adds them to a Redis sorted set scored by enqueue time
+(so repeated saves of the same row collapse into one entry). A Celery task
+drains the set: each batch is loaded from the database and sent as one
+``_bulk`` request — rows that still exist are indexed, missing rows are
+deleted from the index.
+
+Each batch is moved atomically from the queue into a processing set and
+removed from it only once Elasticsearch accepted it, so keys in flight
+survive a worker crash: the next run puts them back on the queue first.
+Runs are serialized with a Redis lock.
+
+Keys that Elasticsearch rejects are re-queued and retried on the next run;
+after ``max_attempts`` they move to a dead-letter list. Outages (connection
+errors, timeouts, 5xx, or the circuit breaker being open) do not count as
+attempts: the keys just wait until the cluster is back. Queue lag (age of
+the oldest pending key) and per-run counters are kept in Redis for
+monitoring.
+
+Edits to related rows embedded in documents (an industry inside every startup
+document, a startup inside every project) are not fanned out per document.
+Documents declare ``related_object_fields``; a save that changes one of the
+embedded columns then records one entry per related row in a Redis hash (so
+repeated edits collapse to the latest value) and the drain applies it with a
+single ``update_by_query`` that rewrites the embedded object in every
+matching document. Saves that only touch other columns queue nothing.
+"""
+import json
+import logging
+import time
+from functools import lru_cache, partial
+
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ObjectDoesNotExist
+from django.db import models, transaction
+from django_elasticsearch_dsl.apps import DEDConfig
+from django_elasticsearch_dsl.registries import registry as es_registry
+from django_elasticsearch_dsl.signals import BaseSignalProcessor
+from elasticsearch.helpers import bulk
+from elasticsearch_dsl.connections import connections
+from redis.exceptions import RedisError
+
+from utils.redis_client import acquire_lock, claim_hash, get_redis, hash_batches, release_lock
+
+from . import result_cache
+from .circuit_breaker import elasticsearch_breaker, is_outage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_QUEUE = {
+    'key_prefix': 'search:index',
+    'batch_size': 500,
+    'max_batches': 20,
+    'max_attempts': 5,
+    'schedule_delay': 2,
+    'lock_timeout': 300,
+}
+
+_NOT_LOADED = object()
+
+
+def get_queue_config() -> dict:
+    """Return SEARCH_INDEX_QUEUE merged over DEFAULT_INDEX_QUEUE."""
+    return {**DEFAULT_INDEX_QUEUE, **(getattr(settings, 'SEARCH_INDEX_QUEUE', None) or {})}
+
+
+def _keys(config: dict) -> dict:
+    prefix = config['key_prefix']
+    return {
+        'queue': f"{prefix}:queue",
+        'processing': f"{prefix}:processing",
+        'lock': f"{prefix}:lock",
+        'attempts': f"{prefix}:attempts",
+        'dead': f"{prefix}:dead",
+        'metrics': f"{prefix}:metrics",
+        'scheduled': f"{prefix}:scheduled",
+        'related': f"{prefix}:related",
+    }
+
+
+def make_key(model, pk) -> str:
+    return f"{model._meta.label_lower}:{pk}"
+
+
+def parse_key(key: str):
+    label, pk = key.rsplit(':', 1)
+    return apps.get_model(label), pk
+
+
+def _indexed_documents(model) -> list:
+    return [doc for doc in es_registry.get_documents([model]) if not doc.django.ignore_signals]
+
+
+def enqueue(model, pks) -> None:
+    """Queue rows of ``model`` for (re)indexing once the current transaction commits."""
+    keys = [make_key(model, pk) for pk in pks if pk is not None]
+    if keys:
+        transaction.on_commit(partial(_push, keys))
+
+
+def _push(keys: list) -> None:
+    config = get_queue_config()
+    try:
+        get_redis().zadd(_keys(config)['queue'], {key: time.time() for key in keys}, nx=True)
+    except RedisError:
+        logger.error("[INDEX] Could not enqueue documents", extra={"keys": keys}, exc_info=True)
+        return
+    schedule_drain()
+
+
+def embedded_object(doc, field: str, related_instance) -> dict:
+    """The value ``doc`` stores in its ``field`` ObjectField for ``related_instance``."""
+    return doc._fields[field]._get_inner_field_data(related_instance)
+
+
+@lru_cache(maxsize=None)
+def _embedded_columns(model) -> dict:
+    """
+    ``{(document class, field): attnames}`` for every document embedding
+    ``model`` through ``related_object_fields``. ``attnames`` are the columns
+    the embedded object is built from, or None when a property is not a
+    plain column of ``model``.
+    """
+    columns = {}
+    for doc_class in es_registry.get_documents():
+        field = getattr(doc_class, 'related_object_fields', {}).get(model)
+        if not field:
+            continue
+        properties = doc_class._fields[field]._doc_class._doc_type.mapping.properties._params.get('properties', {})
+        attnames = []
+        for name, prop in properties.items():
+            try:
+                model_field = model._meta.get_field(prop._path[0] if prop._path else name)
+            except FieldDoesNotExist:
+                attnames = None
+                break
+            if not model_field.concrete or model_field.is_relation:
+                attnames = None
+                break
+            attnames.append(model_field.attname)
+        columns[(doc_class, field)] = attnames
+    return columns
+
+
+def _snapshot_embedded(instance) -> None:
+    # Only loaded values are read, so deferred fields don't cost a query
+    instance._state.embedded_values = {
+        attname: instance.__dict__.get(attname, _NOT_LOADED)
+        for attnames in _embedded_columns(instance.__class__).values()
+        for attname in attnames or ()
+    }
+
+
+def _embedded_changed(instance, doc_class, field: str) -> bool:
+    """Whether a column of ``instance`` that ``doc_class`` embeds in ``field`` changed since it was loaded or saved."""
+    attnames = _embedded_columns(instance.__class__).get((doc_class, field))
+    previous = getattr(instance._state, 'embedded_values', None)
+    if attnames is None or previous is None:
+        return True
+    return any(instance.__dict__.get(attname, _NOT_LOADED) != previous.get(attname) for attname in attnames)
+
+
+def enqueue_related_update(index: str, field: str, pk, value) -> None:
+    """
+    Queue rewriting the embedded ``field`` object of every document in
+    ``index`` whose ``<field>.id`` is ``pk``, once the transaction commits.
+    """
+    entry = json.dumps({'index': index, 'field': field, 'id': pk, 'value': value}, default=str)
+    transaction.on_commit(partial(_push_related, f"{index}|{field}|{pk}", entry))
+
+
+def _push_related(field_key: str, entry: str) -> None:
+    try:
+        get_redis().hset(_keys(get_queue_config())['related'], field_key, entry)
+    except RedisError:
+        logger.error("[INDEX] Could not enqueue related update", extra={"key": field_key}, exc_info=True)
+        return
+    schedule_drain()
+
+
+def _update_embedded(es, entry: dict) -> int:
+    """Rewrite the embedded object of every document matching ``entry``; returns how many were updated."""
+    result = es.update_by_query(
+        index=entry['index'],
+        body={
+            'query': {'term': {f"{entry['field']}.id": entry['id']}},
+            'script': {
+                'source': 'ctx._source[params.field] = params.value',
+                'lang': 'painless',
+                'params': {'field': entry['field'], 'value': entry['value']},
+            },
+        },
+        # Documents re-indexed concurrently already hold fresh data
+        conflicts='proceed',
+    )
+    return result.get('updated', 0)
+
+
+def _apply_related_updates(client, keys: dict, batch_size: int) -> tuple[int, int]:
+    """
+    Run one update_by_query per queued related entry.
+
+    Returns (documents updated, entries that failed). Failed entries are put
+    back unless a newer value was queued meanwhile.
+    """
+    processing = f"{keys['related']}:processing"
+    if not claim_hash(client, keys['related'], processing):
+        return 0, 0
+
+    es = connections.get_connection()
+    updated, failed = 0, {}
+    for batch in hash_batches(client, processing, batch_size):
+        for field_key, raw in batch.items():
+            try:
+                updated += _update_embedded(es, json.loads(raw))
+            except Exception as e:
+                logger.warning("[INDEX] Related update failed for %s: %r", field_key, e)
+                failed[field_key] = raw
+    for field_key, raw in failed.items():
+        client.hsetnx(keys['related'], field_key, raw)
+    client.delete(processing)
+    return updated, len(failed)
+
+
+def schedule_drain() -> None:
+    """Schedule one drain run shortly; saves within ``schedule_delay`` share it."""
+    config = get_queue_config()
+    delay = config['schedule_delay']
+    try:
+        if not get_redis().set(_keys(config)['scheduled'], '1', nx=True, ex=delay):
+            return
+        from search.tasks import drain_index_queue_task
+        drain_index_queue_task.apply_async(countdown=delay)
+    except Exception:
+        # The periodic beat run picks the queue up
+        logger.warning("[INDEX] Could not schedule index queue drain", exc_info=True)
+
+
+def _build_actions(keys: list) -> tuple[list, dict]:
+    """Return bulk actions for ``keys`` and a map of (index, id) -> queue key."""
+    by_model = {}
+    for key in keys:
+        model, pk = parse_key(key)
+        by_model.setdefault(model, {})[pk] = key
+
+    actions, owners = [], {}
+    for model, pk_keys in by_model.items():
+        for doc_class in _indexed_documents(model):
+            doc = doc_class()
+            found = {str(obj.pk): obj for obj in doc.get_queryset().filter(pk__in=list(pk_keys))}
+            for pk, key in pk_keys.items():
+                obj = found.get(pk)
+                if obj is not None and doc.should_index_object(obj):
+                    action = doc._prepare_action(obj, 'index')
+                else:
+                    action = {'_op_type': 'delete', '_index': doc._index._name, '_id': pk}
+                actions.append(action)
+                owners[(action['_index'], str(action['_id']))] = key
+    return actions, owners
+
+
+def _index_batch(keys: list) -> tuple[dict, dict, bool]:
+    """
+    Send one _bulk request for ``keys``.
+
+    Returns ({'indexed': n, 'deleted': n}, {key: error}, outage) — deletes of
+    documents that are already gone count as success; ``outage`` is True when
+    the whole request failed because Elasticsearch was unavailable.
+    """
+    counts = {'indexed': 0, 'deleted': 0}
+    try:
+        actions, owners = _build_actions(keys)
+        if not actions:
+            return counts, {}, False
+        _, errors = bulk(
+            connections.get_connection(),
+            actions,
+            chunk_size=len(actions),
+            raise_on_error=False,
+            stats_only=False,
+            # Return once the changes are searchable, so the result cache
+            # generation bumped after the drain never caches stale hits
+            refresh='wait_for',
+        )
+    except Exception as e:
+        return counts, {key: repr(e) for key in keys}, is_outage(e)
+
+    failures = {}
+    for error in errors:
+        op_type, info = next(iter(error.items()))
+        if op_type == 'delete' and info.get('status') == 404:
+            continue
+        key = owners.get((info.get('_index'), str(info.get('_id'))))
+        if key:
+            failures[key] = json.dumps(info.get('error') or info.get('status'), default=str)
+    for action in actions:
+        if owners[(action['_index'], str(action['_id']))] not in failures:
+            counts['deleted' if action['_op_type'] == 'delete' else 'indexed'] += 1
+    return counts, failures, False
+
+
+# Moves up to ARGV[1] of the oldest queued keys into the processing set,
+# keeping their enqueue time, and returns them as [key, score, ...]
+_CLAIM_SCRIPT = """
+local items = redis.call('ZRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1, 'WITHSCORES')
+for i = 1, #items, 2 do
+    redis.call('ZADD', KEYS[2], items[i + 1], items[i])
+    redis.call('ZREM', KEYS[1], items[i])
+end
+return items
+"""
+
+
+def _claim(client, keys: dict, batch_size: int) -> dict:
+    items = client.eval(_CLAIM_SCRIPT, 2, keys['queue'], keys['processing'], batch_size)
+    return {items[i]: float(items[i + 1]) for i in range(0, len(items), 2)}
+
+
+def _release(client, keys: dict) -> None:
+    """Put the keys left in the processing set back on the queue, keeping the older enqueue time."""
+    pipe = client.pipeline()
+    pipe.zunionstore(keys['queue'], [keys['queue'], keys['processing']], aggregate='MIN')
+    pipe.delete(keys['processing'])
+    pipe.execute()
+
+
+def drain_index_queue(*, batch_size=None, max_batches=None) -> dict:
+    """
+    Index up to ``max_batches`` batches of queued keys.
+
+    Keys that fail are put back with their original enqueue time (so lag keeps
+    growing) and retried on the next run. A key Elasticsearch rejected moves
+    to the dead-letter list once it has failed ``max_attempts`` times; keys
+    that failed because of an outage are not charged an attempt, and the run
+    stops at the first outage.
+
+    Returns:
+        dict: run metrics.
+    """
+    config = get_queue_config()
+    keys = _keys(config)
+    batch_size = batch_size or config['batch_size']
+    max_batches = max_batches or config['max_batches']
+    client = get_redis()
+
+    stats = {
+        'lag_seconds': queue_lag(client, keys['queue']),
+        'indexed': 0,
+        'deleted': 0,
+        'retried': 0,
+        'dead_lettered': 0,
+        'batches': 0,
+        'related_updated': 0,
+        'related_failed': 0,
+        'outage': False,
+    }
+    if elasticsearch_breaker.is_open():
+        stats['outage'] = True
+        return stats
+    token = acquire_lock(client, keys['lock'], config['lock_timeout'])
+    if token is None:
+        return stats
+
+    try:
+        # Keys left by a run that died are queued again before anything is claimed
+        if client.exists(keys['processing']):
+            _release(client, keys)
+
+        while stats['batches'] < max_batches:
+            scores = _claim(client, keys, batch_size)
+            if not scores:
+                break
+            counts, failures, outage = _index_batch(list(scores))
+            stats['indexed'] += counts['indexed']
+            stats['deleted'] += counts['deleted']
+            stats['batches'] += 1
+
+            pipe = client.pipeline()
+            succeeded = [key for key in scores if key not in failures]
+            if succeeded:
+                pipe.zrem(keys['processing'], *succeeded)
+                pipe.hdel(keys['attempts'], *succeeded)
+            if outage:
+                stats['outage'] = True
+                stats['retried'] += len(failures)
+            for key, error in ({} if outage else failures).items():
+                attempts = client.hincrby(keys['attempts'], key, 1)
+                if attempts >= config['max_attempts']:
+                    pipe.rpush(keys['dead'], json.dumps({
+                        'key': key,
+                        'error': error,
+                        'attempts': attempts,
+                        'failed_at': time.time(),
+                    }))
+                    pipe.hdel(keys['attempts'], key)
+                    pipe.zrem(keys['processing'], key)
+                    stats['dead_lettered'] += 1
+                else:
+                    stats['retried'] += 1
+            pipe.execute()
+            if outage:
+                elasticsearch_breaker.record_failure()
+                break
+            if len(scores) < batch_size:
+                break
+
+        if not stats['outage']:
+            stats['related_updated'], stats['related_failed'] = _apply_related_updates(client, keys, batch_size)
+
+        if stats['indexed'] or stats['deleted'] or stats['related_updated']:
+            result_cache.bump_generation()
+
+        # Failed keys stay in the processing set until here, so they are not
+        # retried within this run and a failing ES isn't hammered in a loop
+        _release(client, keys)
+    finally:
+        release_lock(client, keys['lock'], token)
+
+    client.hset(keys['metrics'], mapping={
+        'last_run_at': time.time(),
+        'last_lag_seconds': stats['lag_seconds'],
+        'last_indexed': stats['indexed'],
+        'last_deleted': stats['deleted'],
+        'last_retried': stats['retried'],
+    })
+    for field in ('indexed', 'deleted', 'dead_lettered', 'related_updated'):
+        if stats[field]:
+            client.hincrby(keys['metrics'], f"total_{field}", stats[field])
+
+    if stats['batches'] or stats['related_updated'] or stats['related_failed']:
+        logger.info(
+            "search.index_queue indexed=%d deleted=%d retried=%d dead=%d related=%d lag=%.1fs outage=%s",
+            stats['indexed'],
+            stats['deleted'],
+            stats['retried'],
+            stats['dead_lettered'],
+            stats['related_updated'],
+            stats['lag_seconds'],
+            stats['outage'],
+            extra={'index_queue_stats': stats},
+        )
+    return stats
+
+
+def queue_lag(client=None, queue_key=None) -> float:
+    """Seconds since the oldest pending key was queued (0 when the queue is empty)."""
+    client = client or get_redis()
+    queue_key = queue_key or _keys(get_queue_config())['queue']
+    oldest = client.zrange(queue_key, 0, 0, withscores=True)
+    return max(0.0, time.time() - oldest[0][1]) if oldest else 0.0
+
+
+def queue_stats() -> dict:
+    """Return pending count, lag, dead-letter size and the last run's counters."""
+    keys = _keys(get_queue_config())
+    client = get_redis()
+    return {
+        'pending': client.zcard(keys['queue']),
+        'lag_seconds': queue_lag(client, keys['queue']),
+        'dead_letter': client.llen(keys['dead']),
+        'metrics': client.hgetall(keys['metrics']),
+    }
+
+
+def requeue_dead_letters() -> int:
+    """Move every dead-lettered key back onto the queue; returns how many moved."""
+    keys = _keys(get_queue_config())
+    client = get_redis()
+    moved = 0
+    while True:
+        raw = client.lpop(keys['dead'])
+        if raw is None:
+            break
+        client.zadd(keys['queue'], {json.loads(raw)['key']: time.time()}, nx=True)
+        moved += 1
+    return moved
+
+
+class QueuedSignalProcessor(BaseSignalProcessor):
+    """
+    Signal processor that queues index updates instead of sending them inline.
+
+    Enabled via ELASTICSEARCH_DSL_SIGNAL_PROCESSOR; honours
+    ELASTICSEARCH_DSL_AUTOSYNC and each document's ``ignore_signals``.
+    """
+
+    def setup(self):
+        models.signals.post_init.connect(self.handle_init)
+        models.signals.post_save.connect(self.handle_save)
+        models.signals.post_delete.connect(self.handle_delete)
+        models.signals.m2m_changed.connect(self.handle_m2m_changed)
+        models.signals.pre_delete.connect(self.handle_pre_delete)
+
+    def teardown(self):
+        models.signals.post_init.disconnect(self.handle_init)
+        models.signals.post_save.disconnect(self.handle_save)
+        models.signals.post_delete.disconnect(self.handle_delete)
+        models.signals.m2m_changed.disconnect(self.handle_m2m_changed)
+        models.signals.pre_delete.disconnect(self.handle_pre_delete)
+
+    def handle_init(self, sender, instance, **kwargs):
+        # Remember the embedded columns, so saves that don't touch them skip update_by_query
+        if _embedded_columns(sender):
+            _snapshot_embedded(instance)
+
+    def handle_save(self, sender, instance, created=False, **kwargs):
+        if not DEDConfig.autosync_enabled():
+            return
+        if _indexed_documents(instance.__class__):
+            enqueue(instance.__class__, [instance.pk])
+        # A new row has no dependants yet
+        if not created:
+            self._enqueue_related(instance)
+        if _embedded_columns(sender):
+            _snapshot_embedded(instance)
+
+    def handle_pre_delete(self, sender, instance, **kwargs):
+        # Relations are gone after the delete, so collect dependants now
+        if DEDConfig.autosync_enabled():
+            self._enqueue_related(instance, deleting=True)
+
+    def handle_delete(self, sender, instance, **kwargs):
+        if DEDConfig.autosync_enabled() and _indexed_documents(instance.__class__):
+            enqueue(instance.__class__, [instance.pk])
+
+    def _enqueue_related(self, instance, deleting=False):
+        for doc_class in es_registry._get_related_doc(instance):
+            doc = doc_class()
+            field = getattr(doc, 'related_object_fields', {}).get(instance.__class__)
+            if field:
+                # Dependants of a deleted row are deleted (CASCADE) or block it
+                # (PROTECT), and queue themselves either way
+                if not deleting and _embedded_changed(instance, doc_class, field):
+                    enqueue_related_update(doc._index._name, field, instance.pk, embedded_object(doc, field, instance))
+                continue
+            if not hasattr(doc, 'get_instances_from_related'):
+                continue
+            try:
+                related = doc.get_instances_from_related(instance)
+            except ObjectDoesNotExist:
+                continue
+            if related is None:
+                continue
+            if isinstance(related, models.Model):
+                pks = [related.pk]
+            elif isinstance(related, models.QuerySet):
+                pks = list(related.values_list('pk', flat=True))
+            else:
+                pks = [obj.pk for obj in related]
+            enqueue(doc_class.django.model, pks)
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+
+from search.benchmark import run_filter_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare leading-wildcard and trigram substring filters on a synthetic "
+        "project index (created and dropped by the command)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--documents",
+            type=int,
+            default=100_000,
+            help="Synthetic projects to index (default: 100000).",
+        )
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=50,
+            help="Queries per strategy (default: 50).",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=42,
+            help="Random seed for documents and query terms (default: 42).",
+        )
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the benchmark index instead of deleting it.",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Indexing {options['documents']} synthetic projects...")
+        report = run_filter_benchmark(
+            documents=options["documents"],
+            runs=options["runs"],
+            seed=options["seed"],
+            keep=options["keep"],
+        )
+        self.stdout.write(f"Index {report['index']} filled in {report['fill_seconds']}s")
+        for strategy, stats in report["results"].items():
+            self.stdout.write(
+                f"{strategy:>9}: p50={stats['p50_ms']}ms p95={stats['p95_ms']}ms mean={stats['mean_ms']}ms "
+                f"(es took p50={stats['took_p50_ms']}ms p95={stats['took_p95_ms']}ms) hits={stats['total_hits']}"
+            )
+        self.stdout.write(self.style.SUCCESS("Benchmark finished."))
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+
+from search.indexing import drain_index_queue, queue_stats, requeue_dead_letters
+
+
+class Command(BaseCommand):
+    help = "Show Elasticsearch index queue stats, drain it, or requeue dead-lettered keys."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--drain",
+            action="store_true",
+            help="Drain the queue now instead of waiting for the Celery worker.",
+        )
+        parser.add_argument(
+            "--requeue-dead",
+            action="store_true",
+            help="Move dead-lettered keys back onto the queue.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Keys per _bulk request when draining (default: from settings).",
+        )
+
+    def handle(self, *args, **options):
+        if options["requeue_dead"]:
+            moved = requeue_dead_letters()
+            self.stdout.write(self.style.SUCCESS(f"Requeued {moved} dead-lettered keys"))
+
+        if options["drain"]:
+            stats = drain_index_queue(batch_size=options["batch_size"])
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Indexed {stats['indexed']}, deleted {stats['deleted']}, "
+                    f"retried {stats['retried']}, dead-lettered {stats['dead_lettered']} "
+                    f"in {stats['batches']} batches"
+                )
+            )
+            if stats['outage']:
+                self.stdout.write(self.style.WARNING("Elasticsearch is unavailable; keys stay queued"))
+
+        stats = queue_stats()
+        self.stdout.write(
+            f"Pending: {stats['pending']}, lag: {stats['lag_seconds']:.1f}s, "
+            f"dead letter: {stats['dead_letter']}"
+        )
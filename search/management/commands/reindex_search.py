@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from search.reindex import ReindexError, rebuild_index, registered_indexes
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild Elasticsearch indexes without downtime: build a new versioned index, "
+        "verify it and atomically switch the alias to it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "indexes",
+            nargs="*",
+            help="Index (alias) names to rebuild (default: all registered indexes).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Rows read from the database per keyset chunk (default: 1000).",
+        )
+        parser.add_argument(
+            "--bulk-size",
+            type=int,
+            default=500,
+            help="Documents per _bulk request (default: 500).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Parallel bulk worker threads (default: 4).",
+        )
+        parser.add_argument(
+            "--keep-old",
+            action="store_true",
+            help="Keep the previous index version for rollback instead of deleting it.",
+        )
+
+    def handle(self, *args, **options):
+        aliases = options["indexes"] or sorted(registered_indexes())
+        for alias in aliases:
+            self.stdout.write(f"Rebuilding '{alias}'...")
+            try:
+                stats = rebuild_index(
+                    alias,
+                    chunk_size=options["chunk_size"],
+                    bulk_size=options["bulk_size"],
+                    workers=options["workers"],
+                    keep_old=options["keep_old"],
+                )
+            except ReindexError as e:
+                raise CommandError(str(e))
+            previous = ", ".join(stats["previous"]) or "none"
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"'{alias}' -> {stats['index']} ({stats['documents']} documents, "
+                    f"{stats['seconds']}s); previous: {previous}"
+                )
+            )
@@ -0,0 +1,76 @@
+"""
+Compile validated query parameters into efficient Elasticsearch queries.
+
+Each filter parameter declares how its values are matched:
+
+    term   exact match on a keyword field; repeated values become one ``terms``
+    infix  substring match served by a trigram (``ngram``) subfield. The
+           value's trigrams must appear consecutively (``match_phrase``), so
+           no term-dictionary scan is needed as with ``*value*`` wildcards.
+           Values need at least three characters.
+    match  analyzed full-text match
+
+Filters go to ``bool.filter`` (no scoring, cacheable by Elasticsearch); the
+``search`` parameter goes to ``bool.must`` so it still drives relevance.
+"""
+from elasticsearch_dsl import Q
+from rest_framework.exceptions import ValidationError
+
+TERM = 'term'
+INFIX = 'infix'
+MATCH = 'match'
+
+MIN_INFIX_LENGTH = 3
+SEARCH_PARAM = 'search'
+
+
+class FilterQueryBuilder:
+    """
+    ``filters`` maps a query parameter to ``{'field': <es field>, 'type': ...}``
+    (type defaults to ``term``). ``search_fields`` are the fields matched by
+    the ``search`` parameter. ``extra_params`` are accepted but handled
+    elsewhere (facets, ordering, ...).
+    """
+
+    def __init__(self, filters, search_fields=(), extra_params=()):
+        self.filters = filters
+        self.search_fields = list(search_fields)
+        self.allowed_params = set(filters) | set(extra_params) | ({SEARCH_PARAM} if search_fields else set())
+
+    def validate(self, params):
+        invalid = set(params.keys()) - self.allowed_params
+        if invalid:
+            allowed = ', '.join(sorted(self.allowed_params))
+            raise ValidationError({
+                'error': f'Invalid filter field(s): {", ".join(sorted(invalid))}. Allowed fields: {allowed}'
+            })
+        for param, config in self.filters.items():
+            if config.get('type', TERM) != INFIX:
+                continue
+            short = [value for value in params.getlist(param) if 0 < len(value.strip()) < MIN_INFIX_LENGTH]
+            if short:
+                raise ValidationError({param: f'Must be at least {MIN_INFIX_LENGTH} characters.'})
+
+    def _filter_queries(self, param, config, values):
+        field = config['field']
+        kind = config.get('type', TERM)
+        if kind == TERM:
+            return [Q('terms', **{field: values})]
+        if kind == INFIX:
+            return [Q('match_phrase', **{field: value.strip()}) for value in values]
+        return [Q('match', **{field: {'query': value, 'operator': 'and'}}) for value in values]
+
+    def build(self, params):
+        """Validate ``params`` and return the compiled query, or None if nothing applies."""
+        self.validate(params)
+        filters = []
+        for param, config in self.filters.items():
+            values = [value for value in params.getlist(param) if value.strip()]
+            if values:
+                filters.extend(self._filter_queries(param, config, values))
+        must = [
+            Q('multi_match', query=term, fields=self.search_fields)
+            for term in params.getlist(SEARCH_PARAM) if term.strip()
+        ] if self.search_fields else []
+        clauses = {name: queries for name, queries in (('filter', filters), ('must', must)) if queries}
+        return Q('bool', **clauses) if clauses else None
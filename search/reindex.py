@@ -0,0 +1,201 @@
+"""
+Zero-downtime rebuild of Elasticsearch indexes behind aliases.
+
+Each registered index name (e.g. ``startups``) is served through an alias of
+the same name pointing at a versioned concrete index (``startups_v3``). A
+rebuild creates the next version, streams rows from Postgres in keyset
+chunks into parallel bulk workers, checks the document count, swaps the alias
+atomically and drops the previous version, so searches never see a missing
+or half-filled index. Rows changed while the rebuild ran are re-queued
+through search.indexing once the alias points at the new index, and so are
+rows that were copied and then deleted, which the queue turns into deletes.
+"""
+import logging
+import re
+import threading
+import time
+
+from django import db
+from django.utils import timezone
+from django_elasticsearch_dsl.registries import registry as es_registry
+from elasticsearch.helpers import parallel_bulk
+from elasticsearch_dsl import Index
+from elasticsearch_dsl.connections import connections
+
+from search import indexing, result_cache
+
+logger = logging.getLogger(__name__)
+
+
+class ReindexError(Exception):
+    """Raised when a rebuilt index can't be verified; the alias is left untouched."""
+
+
+def registered_indexes() -> dict:
+    """Return {index name: [document classes]} for every registered document."""
+    indexes = {}
+    for doc in sorted(es_registry.get_documents(), key=lambda d: f"{d.__module__}.{d.__name__}"):
+        indexes.setdefault(doc._index._name, []).append(doc)
+    return indexes
+
+
+def next_version_name(client, alias: str) -> str:
+    """Return ``{alias}_v{n}`` with n one above the highest existing version."""
+    pattern = re.compile(rf"{re.escape(alias)}_v(\d+)")
+    existing = client.indices.get(index=f"{alias}_v*", allow_no_indices=True)
+    versions = [int(match.group(1)) for name in existing if (match := pattern.fullmatch(name))]
+    return f"{alias}_v{max(versions, default=0) + 1}"
+
+
+def stream_actions(doc, index_name: str, chunk_size: int):
+    """
+    Yield one list of bulk index actions per keyset chunk of ``doc``'s queryset.
+
+    Keyset pagination (``pk > last_pk``) keeps every chunk query an index range
+    scan regardless of how deep into the table it is.
+    """
+    queryset = doc.get_queryset().order_by('pk')
+    last_pk = None
+    while True:
+        chunk_qs = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        objects = list(chunk_qs[:chunk_size])
+        if not objects:
+            return
+        last_pk = objects[-1].pk
+        yield [
+            {**doc._prepare_action(obj, 'index'), '_index': index_name}
+            for obj in objects if doc.should_index_object(obj)
+        ]
+        if len(objects) < chunk_size:
+            return
+
+
+def deleted_since(model, pks, chunk_size: int) -> list:
+    """Return the ``pks`` whose rows no longer exist, checking ``chunk_size`` at a time."""
+    pks = sorted(pks)
+    missing = []
+    for start in range(0, len(pks), chunk_size):
+        chunk = pks[start:start + chunk_size]
+        existing = set(model.objects.filter(pk__in=chunk).values_list('pk', flat=True))
+        missing.extend(pk for pk in chunk if pk not in existing)
+    return missing
+
+
+def _current_targets(client, alias: str) -> tuple[list, bool]:
+    """Return (indices behind ``alias``, whether ``alias`` is a legacy concrete index)."""
+    if client.indices.exists_alias(name=alias):
+        return sorted(client.indices.get_alias(name=alias)), False
+    return [], bool(client.indices.exists(index=alias))
+
+
+def rebuild_index(alias: str, *, chunk_size: int = 1000, bulk_size: int = 500,
+                  workers: int = 4, keep_old: bool = False) -> dict:
+    """
+    Build the next version of ``alias`` and switch the alias to it.
+
+    Returns:
+        dict: run metrics.
+
+    Raises:
+        ReindexError: the index name isn't registered, bulk requests failed or
+            the document count doesn't match; the new index is deleted.
+    """
+    docs = registered_indexes().get(alias)
+    if not docs:
+        raise ReindexError(f"No documents registered for index '{alias}'")
+
+    client = connections.get_connection()
+    started_at = timezone.now()
+    start = time.monotonic()
+    new_name = next_version_name(client, alias)
+
+    new_index = Index(new_name)
+    index_settings = dict(docs[0]._index._settings)
+    refresh_interval = index_settings.get('refresh_interval')
+    new_index.settings(**{**index_settings, 'refresh_interval': '-1'})
+    for doc in docs:
+        new_index.document(doc)
+    new_index.create(using=client)
+    logger.info("[REINDEX] Created index", extra={"alias": alias, "index": new_name})
+
+    expected_ids = set()
+    copied = {doc_class: [] for doc_class in docs}
+
+    caller = threading.current_thread()
+
+    def all_actions():
+        # One stream for every chunk, so the workers always have requests to send
+        try:
+            for doc_class in docs:
+                for actions in stream_actions(doc_class(), new_name, chunk_size):
+                    for action in actions:
+                        expected_ids.add(str(action['_id']))
+                        copied[doc_class].append(action['_id'])
+                        yield action
+        finally:
+            # parallel_bulk consumes this from its pool's task thread, which
+            # opened its own database connection
+            if threading.current_thread() is not caller:
+                db.connection.close()
+
+    failed = 0
+    try:
+        for ok, item in parallel_bulk(
+            client, all_actions(), thread_count=workers, chunk_size=bulk_size, raise_on_error=False,
+        ):
+            if not ok:
+                failed += 1
+                logger.error("[REINDEX] Bulk item failed", extra={"index": new_name, "item": item})
+        if failed:
+            raise ReindexError(f"{failed} documents failed to index into '{new_name}'")
+
+        client.indices.put_settings(index=new_name, body={'index': {'refresh_interval': refresh_interval}})
+        client.indices.refresh(index=new_name)
+        count = client.count(index=new_name)['count']
+        if count != len(expected_ids):
+            raise ReindexError(
+                f"'{new_name}' has {count} documents, expected {len(expected_ids)}"
+            )
+    except Exception:
+        client.indices.delete(index=new_name, ignore=[404])
+        raise
+
+    previous, legacy = _current_targets(client, alias)
+    alias_actions = [{'remove': {'index': name, 'alias': alias}} for name in previous]
+    if legacy:
+        # A concrete index still owns the alias name; drop it in the same atomic call
+        alias_actions.append({'remove_index': {'index': alias}})
+    alias_actions.append({'add': {'index': new_name, 'alias': alias}})
+    client.indices.update_aliases(body={'actions': alias_actions})
+    result_cache.bump_generation()
+
+    if not keep_old:
+        for name in previous:
+            client.indices.delete(index=name, ignore=[404])
+
+    # Saves and deletes during the rebuild were applied to the old version; send them again
+    deleted = 0
+    for doc in docs:
+        model = doc.django.model
+        if any(field.name == 'updated_at' for field in model._meta.get_fields()):
+            indexing.enqueue(model, model.objects.filter(updated_at__gte=started_at).values_list('pk', flat=True))
+        missing = deleted_since(model, copied[doc], chunk_size)
+        if missing:
+            indexing.enqueue(model, missing)
+            deleted += len(missing)
+
+    stats = {
+        'alias': alias,
+        'index': new_name,
+        'previous': previous,
+        'documents': count,
+        'deleted_during_rebuild': deleted,
+        'dropped_previous': not keep_old,
+        'seconds': round(time.monotonic() - start, 2),
+    }
+    logger.info(
+        "search.reindex alias=%s index=%s documents=%d seconds=%.2f",
+        alias, new_name, count, stats['seconds'],
+        extra={'reindex_stats': stats},
+    )
+    return stats
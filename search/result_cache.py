@@ -0,0 +1,161 @@
+"""
+Redis cache for search result pages.
+
+Keys combine the endpoint, the caller's visibility scope, the normalized
+query parameters and the index generation: a counter bumped every time the
+indexing pipeline (queue drain or full reindex) writes to Elasticsearch.
+Bumping the generation makes every older entry unreachable, so updates show
+up immediately without deleting keys; stale entries simply expire after
+``ttl`` seconds.
+
+Only successful responses served by Elasticsearch are cached — database
+fallback pages and errors always go through. Redis being unavailable just
+disables the cache.
+"""
+import hashlib
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from redis.exceptions import RedisError
+from rest_framework.response import Response
+
+from utils.redis_client import get_redis
+
+from .fallback import BACKEND_HEADER
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESULT_CACHE = {
+    'key_prefix': 'search:results',
+    'ttl': 300,
+    'enabled': True,
+    'coalesce_wait': 0.25,  # seconds a coalesced request waits for the first one
+}
+
+CACHE_HEADER = 'X-Search-Cache'
+CACHED_HEADERS = ('X-Total-Count', 'Link')
+
+
+def get_cache_config() -> dict:
+    """Return SEARCH_RESULT_CACHE merged over DEFAULT_RESULT_CACHE."""
+    return {**DEFAULT_RESULT_CACHE, **(getattr(settings, 'SEARCH_RESULT_CACHE', None) or {})}
+
+
+def _generation_key(config: dict) -> str:
+    return f"{config['key_prefix']}:generation"
+
+
+def get_generation(client=None) -> int:
+    config = get_cache_config()
+    return int((client or get_redis()).get(_generation_key(config)) or 0)
+
+
+def bump_generation() -> None:
+    """Invalidate every cached search page; call after writing to the index."""
+    try:
+        get_redis().incr(_generation_key(get_cache_config()))
+    except RedisError:
+        logger.warning("[SEARCH] Could not bump the result cache generation")
+
+
+def normalize_params(params) -> list:
+    """
+    Canonical form of a QueryDict: keys sorted, blank values dropped, values
+    stripped. Value order is kept because it matters for ``ordering``.
+    """
+    normalized = []
+    for key in sorted(params):
+        values = [value.strip() for value in params.getlist(key) if value.strip()]
+        if values:
+            normalized.append([key, values])
+    return normalized
+
+
+def build_cache_key(config: dict, generation: int, endpoint: str, scope: str, params) -> str:
+    digest = hashlib.sha256(json.dumps(normalize_params(params)).encode()).hexdigest()
+    return f"{config['key_prefix']}:g{generation}:{endpoint}:{scope}:{digest}"
+
+
+class CachedSearchMixin:
+    """
+    Serve a search endpoint's responses from the Redis result cache.
+
+    Views call ``cached_response(request, compute)`` where ``compute`` builds
+    the uncached Response; the mixin's ``list`` does this for viewsets.
+    Override ``get_cache_scope`` when results depend on who is asking.
+
+    With ``coalesce`` set, concurrent misses for the same key are collapsed:
+    the first request computes the page while the others wait briefly for
+    it to land in the cache instead of all querying Elasticsearch.
+    """
+    cache_endpoint = None
+    cache_ttl = None
+    coalesce = False
+
+    def get_cache_scope(self, request) -> str:
+        return 'staff' if request.user.is_staff else 'user'
+
+    def get_cache_endpoint(self) -> str:
+        return self.cache_endpoint or f"{type(self).__module__}.{type(self).__name__}"
+
+    def get_cache_params(self, request):
+        return request.query_params
+
+    @staticmethod
+    def _wait_for(client, key, timeout):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            time.sleep(0.01)
+            cached = client.get(key)
+            if cached is not None:
+                return cached
+        return None
+
+    def cached_response(self, request, compute):
+        config = get_cache_config()
+        if not config['enabled']:
+            return compute()
+        locked = False
+        try:
+            client = get_redis()
+            key = build_cache_key(
+                config, get_generation(client), self.get_cache_endpoint(),
+                self.get_cache_scope(request), self.get_cache_params(request),
+            )
+            cached = client.get(key)
+            if cached is None and self.coalesce:
+                locked = bool(client.set(f"{key}:lock", 1, nx=True, ex=5))
+                if not locked:
+                    cached = self._wait_for(client, key, config['coalesce_wait'])
+        except RedisError:
+            return compute()
+
+        if cached is not None:
+            payload = json.loads(cached)
+            return Response(payload['data'], headers={**payload['headers'], CACHE_HEADER: 'hit'})
+
+        try:
+            response = compute()
+            if response.status_code == 200 and BACKEND_HEADER not in response:
+                payload = {
+                    'data': response.data,
+                    'headers': {name: response[name] for name in CACHED_HEADERS if name in response},
+                }
+                try:
+                    client.set(key, json.dumps(payload, cls=DjangoJSONEncoder), ex=self.cache_ttl or config['ttl'])
+                    response[CACHE_HEADER] = 'miss'
+                except RedisError:
+                    pass
+        finally:
+            if locked:
+                try:
+                    client.delete(f"{key}:lock")
+                except RedisError:
+                    pass
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, lambda: super(CachedSearchMixin, self).list(request, *args, **kwargs))
@@ -1,16 +1,48 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F
+
 from startups.models import Startup
-from django.db.models import Q
+
+FULL_TEXT_CONFIG = 'simple'
+
+_TERM_RE = re.compile(r'\w+')
+
+
+def build_prefix_query(text: str):
+    """
+    Turn free text into a tsquery matching every word as a prefix
+    ("clean ener" -> 'clean:* & ener:*'). Returns None if no words remain.
+    Only word characters reach the raw query, so user input cannot break it.
+    """
+    terms = _TERM_RE.findall(text.lower())
+    if not terms:
+        return None
+    return SearchQuery(' & '.join(f'{term}:*' for term in terms), config=FULL_TEXT_CONFIG, search_type='raw')
+
+
+def full_text_search(queryset, text: str):
+    """
+    Filter a queryset whose model has a ``search_vector`` column and order it
+    by relevance. Served by the GIN index on that column.
+    """
+    query = build_prefix_query(text)
+    if query is None:
+        return queryset.none()
+    return (
+        queryset.filter(search_vector=query)
+        .annotate(rank=SearchRank(F('search_vector'), query))
+        .order_by('-rank', 'pk')
+    )
 
 
 def filter_startups(query: str):
     """
-    Basic search function for startups.
-    Case-insensitive, partial match by company_name or description.
+    Full-text search for startups over company_name (weighted higher) and
+    description, best matches first.
     """
     if not query:
         return Startup.objects.none()
+    return full_text_search(Startup.objects.select_related("location", "industry"), query)
 
-    return Startup.objects.filter(
-        Q(company_name__icontains=query) |
-        Q(description__icontains=query)
-    ).select_related("location", "industry")
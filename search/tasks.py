@@ -0,0 +1,12 @@
+from celery import shared_task
+
+
+@shared_task
+def drain_index_queue_task(batch_size=None):
+    """
+    Celery task to send queued Elasticsearch index updates in batched _bulk requests.
+    Scheduled shortly after saves and periodically via Celery Beat; returns the run metrics.
+    """
+    from search.indexing import drain_index_queue
+
+    return drain_index_queue(batch_size=batch_size)
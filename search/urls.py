@@ -1,7 +1,8 @@
 from django.urls import path
-from .views import StartupSearchView, ProjectSearchView
+from .views import AutocompleteView, StartupSearchView, ProjectSearchView
 
 urlpatterns = [
     path("startups/", StartupSearchView.as_view(), name="startup-search"),
     path("projects/", ProjectSearchView.as_view(), name="project-search"),
+    path("autocomplete/", AutocompleteView.as_view(), name="search-autocomplete"),
 ]
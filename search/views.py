@@ -1,37 +1,236 @@
-from rest_framework.generics import ListAPIView
-from django_elasticsearch_dsl.search import Search
+import base64
+import binascii
+import json
+
+from django.utils.http import urlencode
 from elasticsearch_dsl.query import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import ListAPIView
+from rest_framework.response import Response
+from rest_framework.throttling import ScopedRateThrottle
+from rest_framework.views import APIView
+
 from startups.models import Startup
 from projects.models import Project
+from .autocomplete import SUGGESTERS, build_multi_search, database_suggestions, parse_suggestions
+from .circuit_breaker import SearchUnavailable, elasticsearch_breaker
 from .documents import StartupDocument, ProjectDocument
+from .fallback import BACKEND_HEADER, DATABASE_BACKEND
+from .result_cache import CachedSearchMixin
 from .serializers import StartupSearchSerializer, ProjectSearchSerializer
+from .services import full_text_search
 
 
-class StartupSearchView(ListAPIView):
-    serializer_class = StartupSearchSerializer
+class DocumentSearchView(CachedSearchMixin, ListAPIView):
+    """
+    Full-text search served from the Elasticsearch ``_source``.
 
-    def get_queryset(self):
-        query = self.request.query_params.get("q", "")
-        if not query:
-            return Startup.objects.none()
+    Hits are serialized in relevance order without re-querying Postgres; only
+    fields missing from a hit's source (e.g. documents indexed before a field
+    was added to the mapping) are loaded from the database, in one query.
+
+    Pagination (the body stays a plain list):
+        size: hits per page (default 10, max 100).
+        from: offset for page-style navigation (from + size <= 10000).
+        search_after: opaque cursor from the previous response's ``Link``
+            header; use it for deep pagination.
+    The total hit count is returned in ``X-Total-Count``.
+
+    While Elasticsearch is unavailable, results come from the Postgres
+    full-text index (``X-Search-Backend: database``); ``search_after``
+    cursors cannot be honoured there and return an empty page.
+
+    Responses are cached in Redis until the index changes (see result_cache).
+    """
+    document = None
+    model = None
+    search_fields = ()
+    default_size = 10
+    max_size = 100
+    max_window = 10000
+
+    def get_source_fields(self):
+        return list(self.get_serializer_class().Meta.fields)
 
-        search = StartupDocument.search().query(
-            Q("multi_match", query=query, fields=["company_name", "description", "stage"])
+    def get_search(self, query):
+        return self.document.search().query(
+            Q("multi_match", query=query, fields=list(self.search_fields))
         )
-        ids = [hit.id for hit in search]
-        return Startup.objects.filter(id__in=ids)
 
+    def get_fallback_queryset(self, query):
+        return full_text_search(self.model.objects.all(), query)
 
-class ProjectSearchView(ListAPIView):
-    serializer_class = ProjectSearchSerializer
+    def fallback_list(self, query, offset, size, fields, cursor):
+        rows = []
+        if not cursor:
+            rows = list(self.get_fallback_queryset(query).values(*fields)[offset:offset + size])
+        data = self.get_serializer(rows, many=True).data
+        return Response(data, headers={BACKEND_HEADER: DATABASE_BACKEND})
+
+    def _int_param(self, name, default, minimum, maximum):
+        raw = self.request.query_params.get(name)
+        if raw in (None, ""):
+            return default
+        try:
+            value = int(raw)
+        except ValueError:
+            raise ValidationError({name: "Must be an integer."})
+        if not minimum <= value <= maximum:
+            raise ValidationError({name: f"Must be between {minimum} and {maximum}."})
+        return value
+
+    @staticmethod
+    def encode_cursor(sort_values):
+        return base64.urlsafe_b64encode(json.dumps(list(sort_values)).encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(token):
+        try:
+            values = json.loads(base64.urlsafe_b64decode(token.encode() + b"=" * (-len(token) % 4)))
+        except (binascii.Error, ValueError):
+            raise ValidationError({"search_after": "Invalid cursor."})
+        if not isinstance(values, list):
+            raise ValidationError({"search_after": "Invalid cursor."})
+        return values
+
+    def hydrate_missing_fields(self, rows, fields):
+        """Fill fields absent from ``_source`` with a single database query."""
+        missing = {field for row in rows for field in fields if field not in row}
+        if not missing:
+            return rows
+        ids = [row["id"] for row in rows]
+        db_rows = {
+            values["id"]: values
+            for values in self.model.objects.filter(id__in=ids).values("id", *sorted(missing - {"id"}))
+        }
+        for row in rows:
+            for field, value in db_rows.get(row["id"], {}).items():
+                row.setdefault(field, value)
+        return rows
 
-    def get_queryset(self):
-        query = self.request.query_params.get("q", "")
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, lambda: self.search_response(request))
+
+    def search_response(self, request):
+        query = request.query_params.get("q", "")
         if not query:
-            return Project.objects.none()
+            return Response([])
 
-        search = ProjectDocument.search().query(
-            Q("multi_match", query=query, fields=["title", "description", "status"])
-        )
-        ids = [hit.id for hit in search]
-        return Project.objects.filter(id__in=ids)
+        size = self._int_param("size", self.default_size, 1, self.max_size)
+        cursor = request.query_params.get("search_after")
+        offset = 0 if cursor else self._int_param("from", 0, 0, self.max_window - size)
+        fields = self.get_source_fields()
+
+        # _score first keeps relevance order; id breaks ties so search_after is stable
+        extra = {"sort": [{"_score": "desc"}, {"id": "asc"}], "track_total_hits": True}
+        if cursor:
+            extra["search_after"] = self.decode_cursor(cursor)
+        search = self.get_search(query).source(fields).extra(**extra)
+        try:
+            response = elasticsearch_breaker.call(search[offset:offset + size].execute)
+        except SearchUnavailable:
+            return self.fallback_list(query, offset, size, fields, cursor)
+
+        hits = list(response)
+        rows = [{**hit.to_dict(), "id": int(hit.meta.id)} for hit in hits]
+        rows = self.hydrate_missing_fields(rows, fields)
+        data = self.get_serializer(rows, many=True).data
+
+        headers = {}
+        total = getattr(getattr(response.hits, "total", None), "value", None)
+        if isinstance(total, int):
+            headers["X-Total-Count"] = str(total)
+        if len(hits) == size:
+            params = {"q": query, "size": size, "search_after": self.encode_cursor(hits[-1].meta.sort)}
+            next_url = request.build_absolute_uri(f"{request.path}?{urlencode(params)}")
+            headers["Link"] = f'<{next_url}>; rel="next"'
+        return Response(data, headers=headers)
+
+
+class StartupSearchView(DocumentSearchView):
+    serializer_class = StartupSearchSerializer
+    document = StartupDocument
+    model = Startup
+    search_fields = ("company_name", "description", "stage")
+
+
+class ProjectSearchView(DocumentSearchView):
+    serializer_class = ProjectSearchSerializer
+    document = ProjectDocument
+    model = Project
+    search_fields = ("title", "description", "status")
+
+
+class AutocompleteView(CachedSearchMixin, APIView):
+    """
+    Typeahead suggestions for a prefix, grouped by kind.
+
+    Query parameters:
+        q: the prefix typed so far (at most 50 characters).
+        types: comma-separated groups (startups, projects, industries,
+            categories); all by default.
+        size: suggestions per group (default 5, max 10).
+
+    Responses are cached briefly and identical concurrent requests are
+    coalesced, so fast typists and many users typing the same prefix cost
+    one Elasticsearch round trip.
+    """
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = "autocomplete"
+    cache_endpoint = "autocomplete"
+    cache_ttl = 30
+    coalesce = True
+    default_size = 5
+    max_size = 10
+    max_prefix_length = 50
+
+    @staticmethod
+    def normalize_prefix(value):
+        return " ".join(value.split())
+
+    def get_cache_params(self, request):
+        params = request.query_params.copy()
+        # Completion suggesters are case-insensitive, so "Ac" and "ac" share an entry
+        params["q"] = self.normalize_prefix(params.get("q", "")).lower()
+        return params
+
+    def get_groups(self, request):
+        raw = request.query_params.get("types", "")
+        groups = [name.strip() for name in raw.split(",") if name.strip()] or list(SUGGESTERS)
+        unknown = [name for name in groups if name not in SUGGESTERS]
+        if unknown:
+            raise ValidationError({"types": f"Unknown type(s): {', '.join(unknown)}. Allowed: {', '.join(SUGGESTERS)}"})
+        return list(dict.fromkeys(groups))
+
+    def get_size(self, request):
+        raw = request.query_params.get("size")
+        if raw in (None, ""):
+            return self.default_size
+        try:
+            size = int(raw)
+        except ValueError:
+            raise ValidationError({"size": "Must be an integer."})
+        if not 1 <= size <= self.max_size:
+            raise ValidationError({"size": f"Must be between 1 and {self.max_size}."})
+        return size
+
+    def get(self, request, *args, **kwargs):
+        return self.cached_response(request, lambda: self.suggest(request))
+
+    def suggest(self, request):
+        prefix = self.normalize_prefix(request.query_params.get("q", ""))
+        groups = self.get_groups(request)
+        size = self.get_size(request)
+        if len(prefix) > self.max_prefix_length:
+            raise ValidationError({"q": f"Must be at most {self.max_prefix_length} characters."})
+        if not prefix:
+            return Response({name: [] for name in groups})
+
+        try:
+            responses = elasticsearch_breaker.call(build_multi_search(prefix, groups, size).execute)
+        except SearchUnavailable:
+            return Response(
+                database_suggestions(prefix, groups, size),
+                headers={BACKEND_HEADER: DATABASE_BACKEND},
+            )
+        return Response(parse_suggestions(responses, groups))
@@ -0,0 +1,143 @@
+"""
+Benchmark for listing serializers: nested detail form vs flat list form.
+
+For each endpoint the first ``pages`` pages of ``page_size`` rows are
+loaded and serialized with both the serializer the API used for listings
+before (``full``) and the list serializer it uses now (``list``). Each
+strategy uses the queryset its viewset builds for that action (retrieve's
+for the nested form). Reported
+per page: wall time (query + serialization), number of SQL queries and
+payload size.
+
+With ``synthetic`` > 0 the rows are generated inside a transaction that is
+rolled back afterwards, so the command can run against any database.
+"""
+import random
+import statistics
+import time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test.client import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+
+from common.enums import Stage
+from projects.models import Category, Project, ProjectStatus
+from projects.serializers import ProjectListSerializer, ProjectReadSerializer
+from projects.views import ProjectViewSet
+from startups.models import Industry, Location, Startup
+from startups.serializers.startup_full import StartupSerializer
+from startups.serializers.startup_list import StartupListSerializer
+from startups.views.startup import StartupViewSet
+from users.models import UserRole
+
+User = get_user_model()
+
+
+def _viewset_queryset(viewset_class, action):
+    return viewset_class(action=action).get_queryset()
+
+
+def _strategies():
+    return {
+        'startups': {
+            'full': (lambda: _viewset_queryset(StartupViewSet, 'retrieve'), StartupSerializer),
+            'list': (lambda: _viewset_queryset(StartupViewSet, 'list'), StartupListSerializer),
+        },
+        'projects': {
+            'full': (lambda: _viewset_queryset(ProjectViewSet, 'retrieve'), ProjectReadSerializer),
+            'list': (lambda: _viewset_queryset(ProjectViewSet, 'list'), ProjectListSerializer),
+        },
+    }
+
+
+def create_synthetic_rows(startups: int, projects_per_startup: int, seed: int) -> None:
+    """Bulk-insert startups with projects (no signals, no indexing)."""
+    rng = random.Random(seed)
+    tag = f"bench{int(time.time())}"
+    role, _ = UserRole.objects.get_or_create(role=UserRole.Role.STARTUP)
+    industries = [Industry.objects.get_or_create(name=name)[0] for name in ('Technology', 'Healthcare', 'Finance')]
+    locations = [Location.objects.get_or_create(country=code, city='Benchmark')[0] for code in ('US', 'GB', 'UA')]
+    categories = [Category.objects.get_or_create(name=name)[0] for name in ('Tech', 'Health', 'Energy')]
+
+    users = User.objects.bulk_create(
+        User(email=f"{tag}.{i}@example.com", first_name='Bench', last_name=str(i), role=role, is_active=True)
+        for i in range(startups)
+    )
+    created = Startup.objects.bulk_create(
+        Startup(
+            user=user,
+            company_name=f"{tag} Startup {i}",
+            description='Synthetic startup for the list serializer benchmark.',
+            email=f"{tag}.startup{i}@example.com",
+            industry=rng.choice(industries),
+            location=rng.choice(locations),
+            founded_year=rng.randint(2000, 2024),
+            team_size=rng.randint(1, 200),
+            stage=rng.choice(Stage.values),
+        )
+        for i, user in enumerate(users)
+    )
+    Project.objects.bulk_create(
+        (
+            Project(
+                startup=startup,
+                title=f"{startup.company_name} Project {n}",
+                description='Synthetic project.',
+                email=f"{tag}.project{startup.pk}.{n}@example.com",
+                category=rng.choice(categories),
+                status=rng.choice(ProjectStatus.values),
+                funding_goal=Decimal(rng.randint(1_000, 2_000_000)),
+            )
+            for startup in created
+            for n in range(projects_per_startup)
+        ),
+        batch_size=2_000,
+    )
+
+
+def _measure_page(queryset_factory, serializer_class, offset, page_size, context):
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        page = list(queryset_factory()[offset:offset + page_size])
+        data = serializer_class(page, many=True, context=context).data
+        elapsed = (time.perf_counter() - started) * 1000
+    return elapsed, len(queries), len(JSONRenderer().render(data))
+
+
+def _run(page_size, pages, runs):
+    context = {'request': RequestFactory().get('/')}
+    report = {}
+    for endpoint, strategies in _strategies().items():
+        report[endpoint] = {}
+        for name, (queryset_factory, serializer_class) in strategies.items():
+            timings, query_counts, sizes = [], [], []
+            for _ in range(runs):
+                for page in range(pages):
+                    elapsed, queries, size = _measure_page(
+                        queryset_factory, serializer_class, page * page_size, page_size, context,
+                    )
+                    timings.append(elapsed)
+                    query_counts.append(queries)
+                    sizes.append(size)
+            report[endpoint][name] = {
+                'p50_ms': round(statistics.median(timings), 2),
+                'mean_ms': round(statistics.mean(timings), 2),
+                'queries_per_page': max(query_counts),
+                'bytes_per_page': round(statistics.mean(sizes)),
+            }
+    return report
+
+
+def run_serializer_benchmark(*, page_size: int = 20, pages: int = 5, runs: int = 10,
+                             synthetic: int = 0, projects_per_startup: int = 5, seed: int = 42) -> dict:
+    if not synthetic:
+        return _run(page_size, pages, runs)
+    with transaction.atomic():
+        create_synthetic_rows(synthetic, projects_per_startup, seed)
+        report = _run(page_size, pages, runs)
+        transaction.set_rollback(True)
+    return report
+
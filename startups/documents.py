@@ -8,7 +8,7 @@ class StartupDocument(Document):
 
     industry = fields.ObjectField(properties={
         'id': fields.IntegerField(),
-        'name': fields.KeywordField(),
+        'name': fields.KeywordField(fields={'suggest': fields.CompletionField()}),
     })
 
     location = fields.ObjectField(properties={
@@ -20,6 +20,10 @@ class StartupDocument(Document):
         'postal_code': fields.KeywordField(),
     })
 
+    company_name = fields.TextField(fields={
+        'raw': fields.KeywordField(),
+        'suggest': fields.CompletionField(),
+    })
     stage = fields.KeywordField()
 
     class Index:
@@ -33,7 +37,6 @@ class StartupDocument(Document):
         model = Startup
         fields = [
             'id',
-            'company_name',
             'description',
             'website',
             'email',
@@ -41,9 +44,20 @@ class StartupDocument(Document):
             'team_size',
             'created_at',
             'updated_at',
+            # Ranking signal; see startups.popularity
+            'popularity_score',
         ]
         related_models = [Startup.industry.field.related_model, Startup.location.field.related_model]
 
+    # Embedded related rows; edits to them are applied with one update_by_query
+    related_object_fields = {
+        Startup.industry.field.related_model: 'industry',
+        Startup.location.field.related_model: 'location',
+    }
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('industry', 'location')
+
     def prepare_industry(self, instance):
         if instance.industry:
             return {
@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand
+
+from startups.benchmark import run_serializer_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare serialization time per page of the nested detail serializers "
+        "and the flat list serializers for startups and projects."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=20,
+            help="Rows per page (default: 20).",
+        )
+        parser.add_argument(
+            "--pages",
+            type=int,
+            default=5,
+            help="Pages measured per run (default: 5).",
+        )
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=10,
+            help="Repetitions of every page (default: 10).",
+        )
+        parser.add_argument(
+            "--synthetic",
+            type=int,
+            default=0,
+            help="Generate this many startups in a rolled-back transaction instead of using existing rows.",
+        )
+        parser.add_argument(
+            "--projects-per-startup",
+            type=int,
+            default=5,
+            help="Projects per synthetic startup (default: 5).",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=42,
+            help="Random seed for synthetic rows (default: 42).",
+        )
+
+    def handle(self, *args, **options):
+        report = run_serializer_benchmark(
+            page_size=options["page_size"],
+            pages=options["pages"],
+            runs=options["runs"],
+            synthetic=options["synthetic"],
+            projects_per_startup=options["projects_per_startup"],
+            seed=options["seed"],
+        )
+        for endpoint, strategies in report.items():
+            for strategy, stats in strategies.items():
+                self.stdout.write(
+                    f"{endpoint:>8} {strategy:>4}: p50={stats['p50_ms']}ms mean={stats['mean_ms']}ms "
+                    f"queries={stats['queries_per_page']} bytes={stats['bytes_per_page']}"
+                )
+        self.stdout.write(self.style.SUCCESS("Benchmark finished."))
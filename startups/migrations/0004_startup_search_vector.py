@@ -0,0 +1,24 @@
+# Generated by Django 5.2.4 on 2026-10-18 22:24
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('startups', '0003_alter_startup_company_name_alter_startup_stage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='startup',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector('company_name', config='simple', weight='A'), '||', django.contrib.postgres.search.SearchVector('description', config='simple', weight='B'), django.contrib.postgres.search.SearchConfig('simple')), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='startup',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='startup_search_vector_gin'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 23:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('startups', '0004_startup_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='industry',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Updated At'),
+        ),
+    ]
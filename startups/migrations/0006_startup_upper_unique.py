@@ -0,0 +1,22 @@
+# Generated by Django 5.2.4 on 2026-10-18 23:16
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('startups', '0005_industry_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='startup',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Upper('company_name'), name='startup_company_name_upper_uniq', violation_error_message='Company with this name already exists.'),
+        ),
+        migrations.AddConstraint(
+            model_name='startup',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Upper('email'), name='startup_email_upper_uniq', violation_error_message='Company with this email already exists.'),
+        ),
+    ]
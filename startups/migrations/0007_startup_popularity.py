@@ -0,0 +1,58 @@
+# Generated by Django 5.2.4 on 2026-10-18 23:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('startups', '0006_startup_upper_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='startup',
+            name='popularity_score',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='startup',
+            name='popularity_updated_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='startup',
+            name='total_follows',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='startup',
+            name='total_saves',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='startup',
+            name='total_views',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.CreateModel(
+            name='StartupDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('saves', models.PositiveIntegerField(default=0)),
+                ('follows', models.PositiveIntegerField(default=0)),
+                ('startup', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='startups.startup')),
+            ],
+            options={
+                'verbose_name': 'Startup daily stats',
+                'verbose_name_plural': 'Startup daily stats',
+                'db_table': 'startup_daily_stats',
+                'ordering': ['-date'],
+                'indexes': [models.Index(fields=['date'], name='startup_daily_stats_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('startup', 'date'), name='unique_startup_daily_stats')],
+            },
+        ),
+    ]
@@ -1,9 +1,13 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.db.models import UniqueConstraint, F
+from django.db.models.functions import Upper
 from django_countries.fields import CountryField
 
 from common.company import Company
+from common.counter_fields import CounterFieldsMixin
 from common.enums import Stage
 from validation.validate_names import validate_forbidden_names, validate_latin
 
@@ -143,6 +147,7 @@ class Industry(models.Model):
         help_text="Optional detailed description of the industry"
     )
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Created At")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Updated At")
 
     def clean(self):
         """
@@ -167,7 +172,7 @@ class Industry(models.Model):
         ]
 
 
-class Startup(Company):
+class Startup(CounterFieldsMixin, Company):
     """
     Represents a startup company linked to a user.
     Includes stage of development and social links validation.
@@ -186,6 +191,24 @@ class Startup(Company):
         verbose_name="Development Stage",
         help_text="Current development stage of the startup"
     )
+    # Maintained by Postgres; used by the full-text fallback when Elasticsearch is down
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector('company_name', weight='A', config='simple')
+            + SearchVector('description', weight='B', config='simple')
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    # Engagement totals and ranking score rolled up from Redis counters; see startups.popularity
+    total_views = models.PositiveIntegerField(default=0, editable=False)
+    total_saves = models.PositiveIntegerField(default=0, editable=False)
+    total_follows = models.PositiveIntegerField(default=0, editable=False)
+    popularity_score = models.FloatField(default=0, editable=False)
+    popularity_updated_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    COUNTER_FIELDS = ('total_views', 'total_saves', 'total_follows', 'popularity_score', 'popularity_updated_at')
 
     def clean(self):
         """
@@ -210,4 +233,47 @@ class Startup(Company):
         indexes = [
             models.Index(fields=['company_name']),
             models.Index(fields=['stage']),
+            GinIndex(fields=['search_vector'], name='startup_search_vector_gin'),
+        ]
+        # Case-insensitive uniqueness; also serves the iexact lookups
+        # (UPPER(column) = UPPER(value)) of the serializer duplicate checks
+        constraints = [
+            UniqueConstraint(
+                Upper('company_name'),
+                name='startup_company_name_upper_uniq',
+                violation_error_message="Company with this name already exists.",
+            ),
+            UniqueConstraint(
+                Upper('email'),
+                name='startup_email_upper_uniq',
+                violation_error_message="Company with this email already exists.",
+            ),
+        ]
+
+
+class StartupDailyStats(models.Model):
+    """
+    Engagement counters of a startup for one day (UTC), rolled up from
+    Redis by ``startups.popularity.roll_up``. ``follows`` counts follows of
+    the startup's projects.
+    """
+    startup = models.ForeignKey(Startup, on_delete=models.CASCADE, related_name='daily_stats')
+    date = models.DateField()
+    views = models.PositiveIntegerField(default=0)
+    saves = models.PositiveIntegerField(default=0)
+    follows = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'startup_daily_stats'
+        ordering = ['-date']
+        verbose_name = 'Startup daily stats'
+        verbose_name_plural = 'Startup daily stats'
+        constraints = [
+            UniqueConstraint(fields=['startup', 'date'], name='unique_startup_daily_stats'),
+        ]
+        indexes = [
+            models.Index(fields=['date'], name='startup_daily_stats_date_idx'),
         ]
+
+    def __str__(self):
+        return f"{self.startup_id} on {self.date}"
@@ -0,0 +1,274 @@
+"""
+Startup and project popularity counters.
+
+Engagement events (a startup viewed, saved, a project viewed or followed)
+are not counted in Postgres when they happen. ``record`` increments one
+field per target, metric and UTC day in the ``{prefix}:pending`` Redis hash
+(HINCRBY) once the current transaction commits:
+
+    {model label}:{pk}:{metric}:{YYYY-MM-DD} -> count
+
+``roll_up`` is run periodically (see POPULARITY): it moves the hash aside,
+adds its counts to the daily StartupDailyStats / ProjectDailyStats rows in
+batches and then refreshes, for the rows it touched, the totals stored on
+Startup and Project and the startup's ``popularity_score``: the weighted
+sum of its counters over the last ``score_window_days`` days. Startups
+whose oldest bucket leaves the window are rescored once a day, so scores
+decay without new events. Rescored startups are re-indexed, which makes
+the score available to Elasticsearch ordering.
+
+API payloads read the stored totals, so no request aggregates counters.
+"""
+import logging
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from functools import partial
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q, Sum
+from django.utils import timezone
+from django_elasticsearch_dsl.apps import DEDConfig
+from redis.exceptions import RedisError
+
+from common import detail_cache
+from projects.models import Project, ProjectDailyStats
+from search import indexing
+from startups.models import Startup, StartupDailyStats
+from utils.redis_client import acquire_lock, claim_hash, get_redis, hash_batches, release_lock
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POPULARITY = {
+    'key_prefix': 'popularity',
+    'enabled': True,
+    'batch_size': 1000,
+    'lock_timeout': 300,
+    'score_window_days': 30,
+    'weights': {'views': 1, 'saves': 5, 'follows': 10},
+}
+
+# Counted model -> (daily stats model, its foreign key, metric -> total field)
+TARGETS = {
+    Startup: (StartupDailyStats, 'startup', {
+        'views': 'total_views',
+        'saves': 'total_saves',
+        'follows': 'total_follows',
+    }),
+    Project: (ProjectDailyStats, 'project', {
+        'views': 'total_views',
+        'follows': 'total_follows',
+    }),
+}
+
+
+def get_popularity_config() -> dict:
+    """Return POPULARITY merged over DEFAULT_POPULARITY."""
+    return {**DEFAULT_POPULARITY, **(getattr(settings, 'POPULARITY', None) or {})}
+
+
+def _keys(config: dict) -> dict:
+    prefix = config['key_prefix']
+    return {
+        'pending': f"{prefix}:pending",
+        'processing': f"{prefix}:processing",
+        'lock': f"{prefix}:lock",
+    }
+
+
+def make_field(model, pk, metric: str, day: date) -> str:
+    return f"{model._meta.label_lower}:{pk}:{metric}:{day.isoformat()}"
+
+
+def parse_field(field: str):
+    label, pk, metric, day = field.rsplit(':', 3)
+    return apps.get_model(label), int(pk), metric, date.fromisoformat(day)
+
+
+def record(metric: str, *targets) -> None:
+    """Count one ``metric`` event for each ``(model, pk)`` once the current transaction commits."""
+    config = get_popularity_config()
+    if not config['enabled']:
+        return
+    day = timezone.now().astimezone(dt_timezone.utc).date()
+    fields = [
+        make_field(model, pk, metric, day)
+        for model, pk in targets
+        if pk is not None and metric in TARGETS[model][2]
+    ]
+    if fields:
+        transaction.on_commit(partial(_increment, _keys(config)['pending'], fields))
+
+
+def record_follow(project) -> None:
+    """Count a follow of ``project`` for the project and for its startup."""
+    record('follows', (Project, project.pk), (Startup, project.startup_id))
+
+
+def _increment(pending: str, fields: list) -> None:
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        for field in fields:
+            pipe.hincrby(pending, field, 1)
+        pipe.execute()
+    except RedisError:
+        # Popularity is advisory; a lost event is not worth failing the request
+        logger.warning("[POPULARITY] Could not record events", extra={"fields": fields}, exc_info=True)
+
+
+def _apply_batch(batch: dict) -> dict:
+    """
+    Add ``{field: count}`` to the daily stats rows, with one lookup, one
+    select and one bulk update / insert per model.
+
+    Returns:
+        dict: model -> pks whose rows changed.
+    """
+    counts = {model: defaultdict(lambda: defaultdict(int)) for model in TARGETS}
+    for field, count in batch.items():
+        model, pk, metric, day = parse_field(field)
+        counts[model][(pk, day)][metric] += count
+
+    touched = {}
+    for model, buckets in counts.items():
+        if not buckets:
+            continue
+        stats_model, fk, _ = TARGETS[model]
+        # Events of rows deleted since are dropped
+        existing = set(model.objects.filter(pk__in={pk for pk, _ in buckets}).values_list('pk', flat=True))
+        buckets = {key: metrics for key, metrics in buckets.items() if key[0] in existing}
+        if not buckets:
+            continue
+        rows = {
+            (getattr(row, f'{fk}_id'), row.date): row
+            for row in stats_model.objects.select_for_update().filter(
+                **{f'{fk}_id__in': {pk for pk, _ in buckets}},
+                date__in={day for _, day in buckets},
+            )
+        }
+        updated, created = [], []
+        for (pk, day), metrics in buckets.items():
+            row = rows.get((pk, day))
+            if row is None:
+                created.append(stats_model(**{f'{fk}_id': pk, 'date': day, **metrics}))
+                continue
+            for metric, count in metrics.items():
+                setattr(row, metric, getattr(row, metric) + count)
+            updated.append(row)
+        stats_model.objects.bulk_create(created)
+        stats_model.objects.bulk_update(updated, list(TARGETS[model][2]))
+        touched[model] = {pk for pk, _ in buckets}
+    return touched
+
+
+def _write_batch(client, keys: dict, batch: dict, touched: dict, stats: dict) -> None:
+    with transaction.atomic():
+        for model, pks in _apply_batch(batch).items():
+            touched[model] |= pks
+    client.hdel(keys['processing'], *batch)
+    stats['events'] += sum(batch.values())
+    stats['batches'] += 1
+
+
+def _window_start(config: dict, now: datetime) -> date:
+    return now.astimezone(dt_timezone.utc).date() - timedelta(days=config['score_window_days'] - 1)
+
+
+def _expiring_startups(config: dict, now: datetime) -> set:
+    """Startups not rescored today whose oldest windowed bucket has just left the window."""
+    today = datetime.combine(now.astimezone(dt_timezone.utc).date(), time.min, tzinfo=dt_timezone.utc)
+    return set(
+        StartupDailyStats.objects.filter(date=_window_start(config, now) - timedelta(days=1))
+        .filter(Q(startup__popularity_updated_at__lt=today) | Q(startup__popularity_updated_at__isnull=True))
+        .values_list('startup_id', flat=True)
+    )
+
+
+def _refresh_totals(model, pks: set, config: dict, now: datetime) -> int:
+    """Recompute the stored totals (and startup scores) of ``pks`` from their daily rows."""
+    stats_model, fk, totals = TARGETS[model]
+    aggregates = {f'sum_{metric}': Sum(metric) for metric in totals}
+    if model is Startup:
+        window = Q(date__gte=_window_start(config, now))
+        for metric in totals:
+            aggregates[f'window_{metric}'] = Sum(metric, filter=window)
+    rows = {
+        row[fk]: row
+        for row in stats_model.objects.filter(**{f'{fk}_id__in': pks}).order_by().values(fk).annotate(**aggregates)
+    }
+
+    instances = []
+    for pk in pks:
+        row = rows.get(pk, {})
+        instance = model(pk=pk)
+        for metric, total_field in totals.items():
+            setattr(instance, total_field, row.get(f'sum_{metric}') or 0)
+        if model is Startup:
+            instance.popularity_score = float(sum(
+                weight * (row.get(f'window_{metric}') or 0)
+                for metric, weight in config['weights'].items()
+                if metric in totals
+            ))
+            instance.popularity_updated_at = now
+        instances.append(instance)
+
+    fields = list(totals.values())
+    if model is Startup:
+        fields += ['popularity_score', 'popularity_updated_at']
+    model.objects.bulk_update(instances, fields)
+    if model is Startup:
+        detail_cache.invalidate(Startup, pks)
+        if DEDConfig.autosync_enabled():
+            indexing.enqueue(Startup, pks)
+    return len(instances)
+
+
+def roll_up(*, batch_size=None, now=None) -> dict:
+    """
+    Add the pending counters to the daily stats and refresh the totals.
+
+    Runs are serialized with a Redis lock. Each batch is written in one
+    transaction and then removed from the processing hash, so a failed run
+    is resumed by the next one without counting finished batches twice.
+
+    Returns:
+        dict: run metrics.
+    """
+    config = get_popularity_config()
+    batch_size = batch_size or config['batch_size']
+    now = now or timezone.now()
+    stats = {'events': 0, 'batches': 0, 'startups': 0, 'projects': 0}
+    if not config['enabled']:
+        return stats
+
+    client = get_redis()
+    keys = _keys(config)
+    token = acquire_lock(client, keys['lock'], config['lock_timeout'])
+    if token is None:
+        logger.info("[POPULARITY] Roll-up already running")
+        return stats
+
+    try:
+        touched = defaultdict(set)
+        if claim_hash(client, keys['pending'], keys['processing']):
+            for batch in hash_batches(client, keys['processing'], batch_size):
+                _write_batch(client, keys, {field: int(count) for field, count in batch.items()}, touched, stats)
+
+        touched[Startup] |= _expiring_startups(config, now)
+        with transaction.atomic():
+            stats['startups'] = _refresh_totals(Startup, touched[Startup], config, now) if touched[Startup] else 0
+            stats['projects'] = _refresh_totals(Project, touched[Project], config, now) if touched[Project] else 0
+    finally:
+        release_lock(client, keys['lock'], token)
+
+    if stats['batches'] or stats['startups']:
+        logger.info(
+            "startups.popularity rolled up events=%d batches=%d startups=%d projects=%d",
+            stats['events'],
+            stats['batches'],
+            stats['startups'],
+            stats['projects'],
+            extra={'popularity_stats': stats},
+        )
+    return stats
@@ -1,10 +1,17 @@
 from rest_framework import serializers
 from mixins.social_links_mixin import SocialLinksValidationMixin
 from startups.models import Startup
+from startups.serializers.startup_popularity import StartupPopularitySerializer
 from utils.get_field_value import get_field_value
 from validation.validate_names import validate_company_name, validate_latin
+from validation.validate_unique import find_case_insensitive_duplicates
 from django.core.exceptions import ValidationError
 
+UNIQUE_FIELD_ERRORS = {
+    'company_name': "Company with this name already exists.",
+    'email': "Company with this email already exists.",
+}
+
 
 class StartupBaseSerializer(SocialLinksValidationMixin, serializers.ModelSerializer):
     """
@@ -12,6 +19,7 @@ class StartupBaseSerializer(SocialLinksValidationMixin, serializers.ModelSeriali
     Contains shared fields and validations.
     """
     social_links = serializers.DictField(required=False)
+    popularity = StartupPopularitySerializer(source='*', read_only=True)
 
     class Meta:
         model = Startup
@@ -19,9 +27,10 @@ class StartupBaseSerializer(SocialLinksValidationMixin, serializers.ModelSeriali
             'id', 'company_name', 'description', 'industry',
             'location', 'website', 'email', 'founded_year',
             'team_size', 'stage', 'social_links', 'user',
-            'created_at', 'updated_at'
+            'popularity', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'popularity', 'created_at', 'updated_at']
+        field_sources = {'popularity': StartupPopularitySerializer.SOURCES}
         extra_kwargs = {
             'company_name': {
                 'validators': []
@@ -40,29 +49,15 @@ class StartupBaseSerializer(SocialLinksValidationMixin, serializers.ModelSeriali
                     "The name must contain only Latin letters, spaces, hyphens, or apostrophes."
                 )
 
-            if self.instance:
-                if Startup.objects.filter(company_name__iexact=value).exclude(pk=self.instance.pk).exists():
-                    raise ValidationError("Company with this name already exists.")
-            else:
-                if Startup.objects.filter(company_name__iexact=value).exists():
-                    raise ValidationError("Company with this name already exists.")
-
             return value
         except ValidationError as e:
             raise serializers.ValidationError(str(e))
 
     def validate_email(self, value):
-        """ Validate email uniqueness. """
+        """ Normalize the email; uniqueness is checked in validate(). """
         if value:
             value = value.strip().lower()
 
-            if self.instance:
-                if Startup.objects.filter(email__iexact=value).exclude(pk=self.instance.pk).exists():
-                    raise ValidationError("Company with this email already exists.")
-            else:
-                if Startup.objects.filter(email__iexact=value).exists():
-                    raise ValidationError("Company with this email already exists.")
-
         return value
 
     def validate(self, data):
@@ -71,9 +66,18 @@ class StartupBaseSerializer(SocialLinksValidationMixin, serializers.ModelSeriali
         - team_size must be at least 1
         - either website or email must be provided
         - industry, location, and user must be present
+        - company_name and email are not taken (case-insensitive, one query)
         """
         errors = {}
 
+        duplicates = find_case_insensitive_duplicates(
+            Startup.objects.all(),
+            {field: data.get(field) for field in UNIQUE_FIELD_ERRORS},
+            exclude_pk=self.instance.pk if self.instance else None,
+        )
+        for field in duplicates:
+            errors[field] = UNIQUE_FIELD_ERRORS[field]
+
         team_size = get_field_value(self, data, 'team_size')
         if team_size is not None and team_size < 1:
             errors['team_size'] = "Team size must be at least 1."
@@ -2,6 +2,14 @@ from rest_framework import serializers
 from startups.models import Startup, Industry, Location
 from common.company import Company
 from mixins.social_links_mixin import SocialLinksValidationMixin
+from validation.validate_email import validate_email_custom
+from validation.validate_names import validate_company_name, validate_latin
+from validation.validate_unique import find_case_insensitive_duplicates
+
+UNIQUE_FIELD_ERRORS = {
+    'company_name': "A startup with this name already exists.",
+    'email': "Startup with this email already exists.",
+}
 
 class StartupCreateSerializer(SocialLinksValidationMixin, serializers.ModelSerializer):
     """
@@ -30,19 +38,26 @@ class StartupCreateSerializer(SocialLinksValidationMixin, serializers.ModelSeria
             'email', 'founded_year', 'team_size', 'stage', 'social_links'
         ]
         read_only_fields = ['id']
+        # Model validators without the per-field UniqueValidator queries;
+        # uniqueness is checked in validate() with a single query
         extra_kwargs = {
-            'company_name': {'required': True},
-            'email': {'required': True},
+            'company_name': {'required': True, 'validators': [validate_company_name, validate_latin]},
+            'email': {'required': True, 'validators': [validate_email_custom]},
             'founded_year': {'required': True},
         }
 
-    def validate_company_name(self, value):
+    def validate(self, data):
         """
-        Ensure the company name is unique, case-insensitively.
+        Ensure the company name and email are unique, case-insensitively.
         """
-        if self.instance is None and Startup.objects.filter(company_name__iexact=value).exists():
-            raise serializers.ValidationError("A startup with this name already exists.")
-        return value
+        duplicates = find_case_insensitive_duplicates(
+            Startup.objects.all(),
+            {field: data.get(field) for field in UNIQUE_FIELD_ERRORS},
+            exclude_pk=self.instance.pk if self.instance else None,
+        )
+        if duplicates:
+            raise serializers.ValidationError({field: UNIQUE_FIELD_ERRORS[field] for field in duplicates})
+        return data
 
     def create(self, validated_data):
         """
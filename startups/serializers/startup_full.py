@@ -1,8 +1,9 @@
+from mixins.sparse_fields_mixin import SparseFieldsetSerializerMixin
 from projects.serializers import ProjectReadSerializer
 from startups.serializers.startup_base import StartupBaseSerializer
 
 
-class StartupSerializer(StartupBaseSerializer):
+class StartupSerializer(SparseFieldsetSerializerMixin, StartupBaseSerializer):
     """
     Full serializer with nested project details.
     """
@@ -0,0 +1,35 @@
+from rest_framework import serializers
+from mixins.sparse_fields_mixin import SparseFieldsetSerializerMixin
+from projects.serializers import ProjectListSerializer
+from startups.models import Startup
+from startups.serializers.startup_popularity import StartupPopularitySerializer
+
+
+class StartupListSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    """
+    Flat serializer for startup listings.
+    Projects are reported as a count (annotated on the queryset as
+    ``projects_count``); the nested form is served by retrieve.
+    """
+    industry_name = serializers.CharField(source='industry.name', read_only=True)
+    country = serializers.CharField(source='location.country.code', read_only=True)
+    projects_count = serializers.IntegerField(read_only=True)
+    popularity = StartupPopularitySerializer(source='*', read_only=True)
+
+    # Columns loaded for the list queryset; keep in sync with ``fields``
+    QUERYSET_ONLY = (
+        'id', 'company_name', 'description', 'industry_id', 'industry__name',
+        'location_id', 'location__country', 'website', 'stage', 'team_size',
+        'founded_year', 'created_at', 'updated_at', *StartupPopularitySerializer.SOURCES,
+    )
+
+    class Meta:
+        model = Startup
+        fields = [
+            'id', 'company_name', 'description', 'industry', 'industry_name',
+            'location', 'country', 'website', 'stage', 'team_size',
+            'founded_year', 'projects_count', 'popularity', 'created_at', 'updated_at',
+        ]
+        read_only_fields = fields
+        field_sources = {'popularity': StartupPopularitySerializer.SOURCES}
+        expandable_fields = {'projects': (ProjectListSerializer, {'many': True})}
@@ -0,0 +1,25 @@
+from rest_framework import serializers
+from startups.models import StartupDailyStats
+
+
+class StartupPopularitySerializer(serializers.Serializer):
+    """
+    Engagement totals and ranking score of a startup as of the last counter
+    rollup (see startups.popularity). Used with ``source='*'``.
+    """
+    views = serializers.IntegerField(source='total_views', read_only=True)
+    saves = serializers.IntegerField(source='total_saves', read_only=True)
+    follows = serializers.IntegerField(source='total_follows', read_only=True)
+    score = serializers.FloatField(source='popularity_score', read_only=True)
+
+    # ORM paths read; see mixins.sparse_fields_mixin
+    SOURCES = ('total_views', 'total_saves', 'total_follows', 'popularity_score')
+
+
+class StartupDailyStatsSerializer(serializers.ModelSerializer):
+    """One day of a startup's engagement counters."""
+
+    class Meta:
+        model = StartupDailyStats
+        fields = ['date', 'views', 'saves', 'follows']
+        read_only_fields = fields
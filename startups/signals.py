@@ -1,15 +1,20 @@
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
-from .models import Startup
-from .documents import StartupDocument
-
-@receiver(post_save, sender=Startup)
-def update_startup_document(sender, instance, **kwargs):
-    StartupDocument().update(instance)
-
-@receiver(post_delete, sender=Startup)
-def delete_startup_document(sender, instance, **kwargs):
-    try:
-        StartupDocument(meta={"id": instance.id}).delete()
-    except Exception as e:
-        print(f"Error deleting startup from Elasticsearch: {e}")
+
+from common import detail_cache
+from projects.models import Project
+from startups.models import Industry, Location, Startup
+
+
+@receiver([post_save, post_delete], sender=Startup)
+def invalidate_startup_detail(sender, instance, **kwargs):
+    """Startup details embed the row; project details embed the startup."""
+    detail_cache.invalidate(Startup, [instance.pk])
+    detail_cache.invalidate(Project, Project.objects.filter(startup_id=instance.pk).values_list('pk', flat=True))
+
+
+@receiver([post_save, post_delete], sender=Industry)
+@receiver([post_save, post_delete], sender=Location)
+def invalidate_startups_of_related_row(sender, instance, **kwargs):
+    field = 'industry' if sender is Industry else 'location'
+    detail_cache.invalidate(Startup, Startup.objects.filter(**{field: instance}).values_list('pk', flat=True))
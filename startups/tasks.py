@@ -0,0 +1,12 @@
+from celery import shared_task
+
+
+@shared_task
+def roll_up_popularity_task():
+    """
+    Celery task to add the popularity counters pending in Redis to the daily stats.
+    Scheduled every five minutes via Celery Beat; returns the run metrics.
+    """
+    from startups.popularity import roll_up
+
+    return roll_up()
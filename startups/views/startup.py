@@ -1,3 +1,7 @@
+from datetime import timedelta
+
+from django.db.models import Count
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter
 from rest_framework.decorators import action
@@ -7,6 +11,11 @@ from rest_framework.exceptions import ValidationError, NotFound
 from startups.models import Startup
 from startups.serializers.startup_full import StartupSerializer
 from startups.serializers.startup_create import StartupCreateSerializer
+from startups.serializers.startup_list import StartupListSerializer
+from startups.serializers.startup_popularity import StartupDailyStatsSerializer, StartupPopularitySerializer
+from mixins.conditional_get_mixin import ConditionalGetMixin
+from mixins.detail_cache_mixin import DetailCacheMixin
+from mixins.sparse_fields_mixin import SparseFieldsetViewMixin
 from startups.views.startup_base import BaseValidatedModelViewSet
 from users.cookie_jwt import CookieJWTAuthentication
 from users.permissions import IsStartupUser, CanCreateCompanyPermission, IsAuthenticatedOr401, HasActiveCompanyAccount
@@ -17,8 +26,11 @@ from communications.serializers import (
 )
 from communications.services import get_or_create_user_pref
 
+DEFAULT_STATS_DAYS = 30
+MAX_STATS_DAYS = 365
+
 
-class StartupViewSet(BaseValidatedModelViewSet):
+class StartupViewSet(ConditionalGetMixin, DetailCacheMixin, SparseFieldsetViewMixin, BaseValidatedModelViewSet):
     queryset = Startup.objects.select_related('user', 'industry', 'location') \
         .prefetch_related('projects')
 
@@ -28,6 +40,16 @@ class StartupViewSet(BaseValidatedModelViewSet):
     filter_backends = [DjangoFilterBackend, SearchFilter]
     filterset_fields = ['industry', 'stage', 'location__country']
     search_fields = ['company_name', 'user__first_name', 'user__last_name', 'email']
+    # IsStartupUser compares obj.user on retrieve
+    sparse_detail_required_fields = ('user__user_id',)
+    conditional_timestamp_fields = (
+        'updated_at', 'industry__updated_at', 'location__updated_at',
+        'projects__updated_at', 'projects__category__updated_at',
+        # Set by the popularity rollup, which changes the payload's totals
+        'popularity_updated_at',
+    )
+    conditional_count_fields = ('projects',)
+    permission_object_fields = ('user__user_id',)
 
     def _get_or_create_user_pref(self, request):
         """Fetch the current user's notification preferences, creating defaults if absent.
@@ -177,6 +199,39 @@ class StartupViewSet(BaseValidatedModelViewSet):
         type_pref = serializer.save()
         return Response(UserNotificationTypePreferenceSerializer(type_pref, context={'request': request}).data)
 
+    @action(detail=True, methods=['get'], url_path='stats', url_name='stats')
+    def stats(self, request, pk=None):
+        """
+        Engagement counters of the startup: its totals, one entry per day with
+        events over the last ``days`` days (default 30, at most 365) and the
+        totals of its projects. Served from the rolled-up stats tables.
+        """
+        try:
+            days = int(request.query_params.get('days', DEFAULT_STATS_DAYS))
+        except ValueError:
+            raise ValidationError({'days': ['A valid integer is required.']})
+        if not 1 <= days <= MAX_STATS_DAYS:
+            raise ValidationError({'days': [f'Must be between 1 and {MAX_STATS_DAYS}.']})
+
+        startup = self.get_object()
+        since = timezone.now().date() - timedelta(days=days - 1)
+        projects = startup.projects.order_by('pk').values('id', 'title', 'total_views', 'total_follows', 'follower_count')
+        return Response({
+            'startup_id': startup.pk,
+            'totals': StartupPopularitySerializer(startup).data,
+            'daily': StartupDailyStatsSerializer(startup.daily_stats.filter(date__gte=since), many=True).data,
+            'projects': [
+                {
+                    'id': project['id'],
+                    'title': project['title'],
+                    'views': project['total_views'],
+                    'follows': project['total_follows'],
+                    'followers': project['follower_count'],
+                }
+                for project in projects
+            ],
+        })
+
     def get_permissions(self):
         """
         Instantiates and returns the list of permissions that this view requires.
@@ -185,10 +240,29 @@ class StartupViewSet(BaseValidatedModelViewSet):
             return [IsAuthenticatedOr401(), CanCreateCompanyPermission()]
         return [IsAuthenticatedOr401(), IsStartupUser()]
 
+    def get_queryset(self):
+        """
+        Lists skip the nested projects: only the columns StartupListSerializer
+        renders are loaded and projects are counted in the same query.
+        """
+        if self.action == 'list':
+            return (
+                Startup.objects.select_related('industry', 'location')
+                .only(*StartupListSerializer.QUERYSET_ONLY)
+                .annotate(projects_count=Count('projects'))
+                # Meta.ordering is not applied to aggregated querysets
+                .order_by(*Startup._meta.ordering)
+            )
+        if self.action == 'stats':
+            return Startup.objects.select_related('user')
+        return super().get_queryset()
+
     def get_serializer_class(self):
         """
         Return the appropriate serializer class based on the request action.
         """
         if self.action == 'create':
             return StartupCreateSerializer
+        if self.action == 'list':
+            return StartupListSerializer
         return StartupSerializer
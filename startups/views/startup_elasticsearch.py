@@ -8,6 +8,9 @@ from django_elasticsearch_dsl_drf.viewsets import DocumentViewSet
 from elasticsearch.exceptions import ConnectionError, TransportError
 from rest_framework import status
 from rest_framework.response import Response
+from search.facets import FacetedSearchMixin
+from search.fallback import DatabaseFallbackMixin
+from search.result_cache import CachedSearchMixin
 from startups.documents import StartupDocument
 from startups.serializers.startup_elasticsearch import StartupDocumentSerializer
 from users.cookie_jwt import CookieJWTAuthentication
@@ -16,7 +19,7 @@ from users.permissions import IsAuthenticatedOr401
 logger = logging.getLogger(__name__)
 
 
-class StartupDocumentView(DocumentViewSet):
+class StartupDocumentView(CachedSearchMixin, DatabaseFallbackMixin, FacetedSearchMixin, DocumentViewSet):
     authentication_classes = [CookieJWTAuthentication]
     permission_classes = [IsAuthenticatedOr401]
     document = StartupDocument
@@ -31,15 +34,30 @@ class StartupDocumentView(DocumentViewSet):
 
     filter_fields = {
         'company_name': 'company_name.raw',
-        'stage': 'stage',
-        'location.country': 'location.country',
         'industries.name': 'industries.name',
     }
 
+    # Filterable facets; counts are returned with ?facets=true
+    facets = {
+        'stage': {'field': 'stage'},
+        'industry.name': {'field': 'industry.name'},
+        'location.country': {'field': 'location.country'},
+    }
+
+    # Used by the Postgres fallback while Elasticsearch is unavailable
+    fallback_filters = {
+        'company_name': 'company_name',
+        'industries.name': 'industry__name',
+        'stage': 'stage',
+        'industry.name': 'industry__name',
+        'location.country': 'location__country',
+    }
+
     ordering_fields = {
         'company_name': 'company_name.raw',
-        'stage': 'stage.raw',
-        'location.country': 'location.country.raw',
+        'stage': 'stage',
+        'location.country': 'location.country',
+        'popularity': 'popularity_score',
     }
 
     ordering = ('-stage',)
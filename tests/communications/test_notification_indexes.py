@@ -0,0 +1,58 @@
+from django.db import connection
+from django.test import TestCase
+
+from communications.models import Notification, NotificationType
+from tests.factories import UserFactory
+
+
+class NotificationFeedIndexTests(TestCase):
+    """
+    EXPLAIN-based regression tests for the notifications feed indexes.
+
+    Sequential scans are disabled for the duration of each test so the planner
+    reveals which index it would use on a large table instead of falling back
+    to a seq scan on the tiny test dataset.
+    """
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.ntype = NotificationType.objects.get(code='message_received')
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+    def _feed(self):
+        return (
+            Notification.objects
+            .filter(user=self.user)
+            .order_by('-created_at', '-notification_id')
+        )
+
+    def _plan(self, qs):
+        return qs[:11].explain()
+
+    def assertUsesIndex(self, qs, index_name):
+        plan = self._plan(qs)
+        self.assertIn(index_name, plan)
+        self.assertNotIn('Sort', plan.replace('Incremental Sort', ''))
+
+    def test_feed_uses_feed_index(self):
+        self.assertUsesIndex(self._feed(), 'idx_notif_user_feed')
+
+    def test_cursor_page_uses_feed_index(self):
+        qs = self._feed().filter(created_at__lt='2030-01-01T00:00:00Z')
+        self.assertUsesIndex(qs, 'idx_notif_user_feed')
+
+    def test_unread_feed_uses_partial_index(self):
+        self.assertUsesIndex(self._feed().filter(is_read=False), 'idx_notif_user_unread')
+
+    def test_type_filter_uses_type_index(self):
+        qs = self._feed().filter(notification_type=self.ntype)
+        self.assertUsesIndex(qs, 'idx_notif_user_type_feed')
+
+    def test_priority_filter_uses_priority_index(self):
+        self.assertUsesIndex(self._feed().filter(priority='high'), 'idx_notif_user_prio_feed')
+
+    def test_unread_count_uses_partial_index(self):
+        qs = Notification.objects.filter(user=self.user, is_read=False)
+        plan = qs.explain()
+        self.assertIn('idx_notif_user_unread', plan)
@@ -194,3 +194,43 @@ class NotificationsApiTestCase(APITestCase):
                            kwargs={'notification_id': str(self.n1.notification_id)})
         resp = client.post(mark_url)
         self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_cursor_pagination_mode(self):
+        url = reverse('communications:notification-list')
+        for i in range(12):
+            Notification.objects.create(
+                user=self.user,
+                notification_type=self.type_message,
+                title=f'Bulk {i}',
+                message='Bulk',
+            )
+
+        resp = self.client.get(url, {'pagination': 'cursor'})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertNotIn('count', resp.data)
+        self.assertEqual(len(resp.data['results']), 10)
+        self.assertIsNotNone(resp.data['next'])
+
+        resp2 = self.client.get(resp.data['next'])
+        self.assertEqual(resp2.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(resp2.data['results']), 4)
+        self.assertIsNone(resp2.data['next'])
+
+        first_ids = [item['notification_id'] for item in resp.data['results']]
+        second_ids = [item['notification_id'] for item in resp2.data['results']]
+        self.assertFalse(set(first_ids) & set(second_ids))
+
+        expected = [
+            str(pk) for pk in Notification.objects
+            .filter(user=self.user)
+            .order_by('-created_at', '-notification_id')
+            .values_list('notification_id', flat=True)
+        ]
+        self.assertEqual(first_ids + second_ids, expected)
+
+    def test_cursor_pagination_respects_filters(self):
+        url = reverse('communications:notification-list')
+        resp = self.client.get(url, {'pagination': 'cursor', 'is_read': 'false'})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        ids = [item['notification_id'] for item in resp.data['results']]
+        self.assertEqual(ids, [str(self.n1.notification_id)])
@@ -0,0 +1,133 @@
+import csv
+import os
+import tempfile
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from communications import registry
+from communications.models import (
+    EmailNotificationPreference,
+    EmailNotificationTypePreference,
+    NotificationFrequency,
+    UserNotificationPreference,
+    UserNotificationTypePreference,
+)
+from communications.services import seed_notification_preferences
+from tests.communications.factories import NotificationTypeFactory
+from tests.factories import UserFactory
+from users.models import User
+
+
+class SeedNotificationPreferencesTests(TestCase):
+    """Tests for bulk seeding of default notification preferences."""
+
+    def setUp(self):
+        with patch("communications.registry.get_redis"), self.captureOnCommitCallbacks(execute=True):
+            self.type_a = NotificationTypeFactory(
+                code="seed_type_a", default_frequency=NotificationFrequency.DAILY_DIGEST
+            )
+            self.type_b = NotificationTypeFactory(code="seed_type_b")
+        self.addCleanup(registry.clear)
+        self.users = [UserFactory() for _ in range(3)]
+        UserNotificationPreference.objects.filter(user__in=self.users).delete()
+        registry.active_types()
+
+    def test_query_count_does_not_depend_on_user_count(self):
+        # SAVEPOINT/RELEASE + four INSERT ... ON CONFLICT DO NOTHING
+        with self.assertNumQueries(6):
+            seed_notification_preferences(self.users)
+        more_users = [UserFactory() for _ in range(5)]
+        with self.assertNumQueries(6):
+            seed_notification_preferences(more_users)
+
+        active_count = len(registry.active_types())
+        self.assertEqual(
+            UserNotificationTypePreference.objects.filter(user_preference__user__in=self.users).count(),
+            len(self.users) * active_count,
+        )
+        self.assertEqual(
+            EmailNotificationTypePreference.objects.filter(email_preference__user__in=self.users).count(),
+            len(self.users) * active_count,
+        )
+
+    def test_uses_type_default_frequency(self):
+        seed_notification_preferences(self.users, email=False)
+        pref = UserNotificationTypePreference.objects.get(
+            user_preference__user=self.users[0], notification_type=self.type_a
+        )
+        self.assertEqual(pref.frequency, NotificationFrequency.DAILY_DIGEST)
+        self.assertFalse(EmailNotificationPreference.objects.filter(user__in=self.users).exists())
+
+    def test_is_idempotent_and_keeps_customised_rows(self):
+        seed_notification_preferences(self.users)
+        UserNotificationTypePreference.objects.filter(
+            user_preference__user=self.users[0], notification_type=self.type_b
+        ).update(frequency=NotificationFrequency.DISABLED)
+        EmailNotificationTypePreference.objects.filter(
+            email_preference__user=self.users[0], notification_type=self.type_b
+        ).update(enabled=False)
+        before = UserNotificationTypePreference.objects.count()
+
+        seed_notification_preferences(self.users)
+
+        self.assertEqual(UserNotificationTypePreference.objects.count(), before)
+        self.assertEqual(
+            UserNotificationTypePreference.objects.get(
+                user_preference__user=self.users[0], notification_type=self.type_b
+            ).frequency,
+            NotificationFrequency.DISABLED,
+        )
+        self.assertFalse(
+            EmailNotificationTypePreference.objects.get(
+                email_preference__user=self.users[0], notification_type=self.type_b
+            ).enabled
+        )
+
+    def test_accepts_user_ids(self):
+        seed_notification_preferences([user.pk for user in self.users], email=False)
+        self.assertEqual(
+            UserNotificationPreference.objects.filter(user__in=self.users).count(), len(self.users)
+        )
+
+    def test_backfill_command_seeds_users_missing_preferences(self):
+        call_command("seed_notification_preferences", "--chunk-size", "2", stdout=open(os.devnull, "w"))
+        for user in self.users:
+            self.assertTrue(UserNotificationPreference.objects.filter(user=user).exists())
+            self.assertTrue(EmailNotificationPreference.objects.filter(user=user).exists())
+            self.assertTrue(
+                UserNotificationTypePreference.objects.filter(
+                    user_preference__user=user, notification_type=self.type_a
+                ).exists()
+            )
+
+
+class ImportUsersCommandTests(TestCase):
+    """Tests for the bulk import_users management command."""
+
+    def setUp(self):
+        self.existing = UserFactory(email="existing@example.com")
+        self.tmp = tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, newline="")
+        writer = csv.writer(self.tmp)
+        writer.writerow(["email", "first_name", "last_name", "role"])
+        writer.writerow(["new1@example.com", "New", "One", "investor"])
+        writer.writerow(["new2@example.com", "New", "Two", ""])
+        writer.writerow(["new1@example.com", "Dup", "Row", ""])
+        writer.writerow(["existing@example.com", "Old", "User", ""])
+        self.tmp.close()
+        self.addCleanup(os.unlink, self.tmp.name)
+        self.addCleanup(registry.clear)
+
+    def test_imports_new_users_and_seeds_preferences(self):
+        call_command("import_users", self.tmp.name, stdout=open(os.devnull, "w"))
+
+        created = User.objects.filter(email__in=["new1@example.com", "new2@example.com"])
+        self.assertEqual(created.count(), 2)
+        for user in created:
+            self.assertFalse(user.has_usable_password())
+            self.assertTrue(UserNotificationPreference.objects.filter(user=user).exists())
+            self.assertTrue(EmailNotificationPreference.objects.filter(user=user).exists())
+        self.assertEqual(created.get(email="new1@example.com").role.role, "investor")
+        self.assertEqual(created.get(email="new2@example.com").role.role, "user")
+        self.assertEqual(User.objects.get(email="existing@example.com").first_name, self.existing.first_name)
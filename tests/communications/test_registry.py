@@ -0,0 +1,101 @@
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from communications import registry
+from communications.models import NotificationFrequency, NotificationType
+from communications.services import create_in_app_notification
+from tests.communications.factories import NotificationTypeFactory
+from tests.factories import UserFactory
+
+
+class NotificationTypeRegistryTests(TestCase):
+    """Tests for the in-process NotificationType registry."""
+
+    def setUp(self):
+        # Run the on_commit hook so the new type counts as committed for caching
+        with patch("communications.registry.get_redis"), self.captureOnCommitCallbacks(execute=True):
+            self.ntype = NotificationTypeFactory(
+                code="registry_type", default_frequency=NotificationFrequency.DAILY_DIGEST
+            )
+        # Rows created here are rolled back; don't leak them to other tests
+        self.addCleanup(registry.clear)
+
+    def test_uncommitted_changes_are_not_cached(self):
+        registry.get("registry_type")
+        NotificationTypeFactory(code="uncommitted_type")
+        self.assertIsNotNone(registry.get("uncommitted_type"))
+        with self.assertNumQueries(1):
+            registry.get("registry_type")
+
+    def test_lookups_after_load_run_no_queries(self):
+        registry.get("registry_type")
+        with self.assertNumQueries(0):
+            self.assertEqual(registry.get_type_id("registry_type"), self.ntype.pk)
+            self.assertEqual(
+                registry.get_default_frequency("registry_type"), NotificationFrequency.DAILY_DIGEST
+            )
+            codes = {entry.code for entry in registry.active_types()}
+        self.assertIn("registry_type", codes)
+
+    def test_unknown_code_returns_none(self):
+        self.assertIsNone(registry.get("does_not_exist"))
+        self.assertIsNone(registry.get_default_frequency("does_not_exist"))
+
+    def test_save_refreshes_entry(self):
+        registry.get("registry_type")
+        self.ntype.default_frequency = NotificationFrequency.WEEKLY_SUMMARY
+        self.ntype.is_active = False
+        self.ntype.save()
+
+        self.assertEqual(
+            registry.get_default_frequency("registry_type"), NotificationFrequency.WEEKLY_SUMMARY
+        )
+        self.assertNotIn("registry_type", {entry.code for entry in registry.active_types()})
+
+    def test_delete_removes_entry(self):
+        registry.get("registry_type")
+        self.ntype.delete()
+        self.assertIsNone(registry.get("registry_type"))
+
+    def test_get_type_id_creates_missing_type(self):
+        type_id = registry.get_type_id("brand_new_type", "Brand New")
+        self.assertEqual(NotificationType.objects.get(code="brand_new_type").pk, type_id)
+
+    @patch("communications.registry.get_redis")
+    def test_change_is_broadcast_on_commit(self, mock_get_redis):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.ntype.name = "Renamed"
+            self.ntype.save()
+        mock_get_redis.return_value.publish.assert_called_with(registry.INVALIDATION_CHANNEL, "1")
+
+    def test_invalidation_message_clears_local_copy(self):
+        registry.get("registry_type")
+        NotificationType.objects.filter(pk=self.ntype.pk).update(name="Updated elsewhere")
+        self.assertNotEqual(registry.get("registry_type").name, "Updated elsewhere")
+
+        registry._on_invalidation_message({"type": "message", "data": "1"})
+
+        self.assertEqual(registry.get("registry_type").name, "Updated elsewhere")
+
+    @patch("communications.registry.get_redis")
+    def test_forked_child_subscribes_again(self, mock_get_redis):
+        self.addCleanup(setattr, registry, "_subscriber", registry._subscriber)
+        registry.get("registry_type")
+        registry._subscriber = object()
+
+        registry._reset_after_fork()
+        self.assertIsNone(registry._subscriber)
+        registry.get("registry_type")
+
+        mock_get_redis.return_value.pubsub.return_value.run_in_thread.assert_called_once()
+        self.assertIs(registry._subscriber, mock_get_redis.return_value.pubsub.return_value.run_in_thread.return_value)
+
+    def test_create_in_app_notification_skips_type_query(self):
+        user = UserFactory()
+        registry.get("registry_type")
+        with self.assertNumQueries(1):
+            notification = create_in_app_notification(
+                user=user, type_code="registry_type", title="Hi", message="Hello"
+            )
+        self.assertEqual(notification.notification_type_id, self.ntype.pk)
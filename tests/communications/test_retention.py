@@ -0,0 +1,113 @@
+import gzip
+import json
+import tempfile
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from communications.models import Notification, NotificationType
+from communications.retention import purge_notifications
+from communications.tasks import purge_notifications_task
+from tests.factories import UserFactory
+
+
+def _retention(**overrides):
+    config = {
+        'batch_size': 2,
+        'max_batches': 100,
+        'archive': False,
+        'default': {'purge_expired': True, 'read_after_days': 90},
+        'types': {},
+    }
+    config.update(overrides)
+    return config
+
+
+class NotificationRetentionTests(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.type_message = NotificationType.objects.get(code='message_received')
+        self.type_project = NotificationType.objects.get(code='project_updated')
+        self.now = timezone.now()
+
+    def _notify(self, ntype=None, *, is_read=False, age_days=0, expires_in=None):
+        notification = Notification.objects.create(
+            user=self.user,
+            notification_type=ntype or self.type_message,
+            title='Title',
+            message='Message',
+            is_read=is_read,
+            expires_at=self.now + expires_in if expires_in is not None else None,
+        )
+        if age_days:
+            Notification.objects.filter(pk=notification.pk).update(
+                created_at=self.now - timedelta(days=age_days)
+            )
+        return notification
+
+    @override_settings(COMMUNICATIONS_NOTIFICATION_RETENTION=_retention())
+    def test_purges_expired_in_batches(self):
+        expired = [self._notify(expires_in=timedelta(days=-1)) for _ in range(5)]
+        alive = self._notify(expires_in=timedelta(days=1))
+        unread_old = self._notify(age_days=365)
+
+        stats = purge_notifications(now=self.now)
+
+        self.assertEqual(stats['expired_deleted'], 5)
+        self.assertEqual(stats['by_type']['message_received']['expired_deleted'], 5)
+        self.assertGreaterEqual(stats['batches'], 3)
+        self.assertFalse(Notification.objects.filter(pk__in=[n.pk for n in expired]).exists())
+        self.assertTrue(Notification.objects.filter(pk=alive.pk).exists())
+        self.assertTrue(Notification.objects.filter(pk=unread_old.pk).exists())
+
+    @override_settings(COMMUNICATIONS_NOTIFICATION_RETENTION=_retention(
+        types={'message_received': {'read_after_days': 30}},
+    ))
+    def test_per_type_read_policies(self):
+        old_read_message = self._notify(is_read=True, age_days=45)
+        old_read_project = self._notify(self.type_project, is_read=True, age_days=45)
+        very_old_read_project = self._notify(self.type_project, is_read=True, age_days=120)
+
+        stats = purge_notifications(now=self.now)
+
+        self.assertEqual(stats['read_deleted'], 2)
+        self.assertFalse(Notification.objects.filter(pk=old_read_message.pk).exists())
+        self.assertTrue(Notification.objects.filter(pk=old_read_project.pk).exists())
+        self.assertFalse(Notification.objects.filter(pk=very_old_read_project.pk).exists())
+
+    @override_settings(COMMUNICATIONS_NOTIFICATION_RETENTION=_retention(
+        default={'purge_expired': False, 'read_after_days': None},
+    ))
+    def test_disabled_policy_keeps_rows(self):
+        self._notify(expires_in=timedelta(days=-1))
+        self._notify(is_read=True, age_days=365)
+
+        stats = purge_notifications(now=self.now)
+
+        self.assertEqual(stats['total_deleted'], 0)
+        self.assertEqual(Notification.objects.filter(user=self.user).count(), 2)
+
+    def test_archive_writes_compressed_jsonl(self):
+        expired = self._notify(expires_in=timedelta(days=-1))
+        with tempfile.TemporaryDirectory() as archive_dir:
+            with override_settings(COMMUNICATIONS_NOTIFICATION_RETENTION=_retention(archive_dir=archive_dir)):
+                stats = purge_notifications(archive=True, now=self.now)
+
+            self.assertEqual(stats['archived'], 1)
+            with gzip.open(stats['archive_path'], 'rt', encoding='utf-8') as fh:
+                rows = [json.loads(line) for line in fh]
+
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['notification_id'], str(expired.notification_id))
+        self.assertEqual(rows[0]['notification_type_id'], self.type_message.pk)
+        self.assertFalse(Notification.objects.filter(pk=expired.pk).exists())
+
+    @override_settings(COMMUNICATIONS_NOTIFICATION_RETENTION=_retention())
+    def test_task_returns_metrics(self):
+        self._notify(expires_in=timedelta(days=-1))
+
+        stats = purge_notifications_task()
+
+        self.assertEqual(stats['total_deleted'], 1)
+        self.assertIsNone(stats['archive_path'])
@@ -1,10 +1,17 @@
+from datetime import timedelta
+from unittest.mock import patch
+
 from django.test import TestCase
+from django.utils import timezone
 from communications.services import (
     get_or_create_user_pref,
     create_in_app_notification,
     should_send_email_notification,
     get_or_create_email_pref,
+    build_idempotency_key,
+    create_notification_once,
 )
+from communications import registry
 from communications.models import (
     Notification,
     NotificationType, 
@@ -95,4 +102,69 @@ class NotificationServicesTests(TestCase):
                          "Should not send when email preference for the type is explicitly disabled.")
 
         self.assertFalse(should_send_email_notification(self.user, "non_existent_type"),
-                         "Should not send for a non-existent notification type code.")
\ No newline at end of file
+                         "Should not send for a non-existent notification type code.")
+
+
+class IdempotentNotificationTests(TestCase):
+    """Tests for idempotency-key based notification inserts."""
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.actor = UserFactory()
+        self.ntype = NotificationTypeFactory(code="idempotent_type")
+
+    def _fields(self, key):
+        return {
+            "user_id": self.user.pk,
+            "notification_type_id": self.ntype.pk,
+            "title": "Follow",
+            "message": "Someone followed you.",
+            "triggered_by_user_id": self.actor.pk,
+            "related_startup_id": "7",
+            "idempotency_key": key,
+        }
+
+    def test_key_is_stable_within_window(self):
+        now = timezone.now().replace(microsecond=100)
+        key1 = build_idempotency_key("idempotent_type", self.user.pk, self.actor.pk, "startup:7", now=now)
+        key2 = build_idempotency_key(
+            "idempotent_type", self.user.pk, self.actor.pk, "startup:7", now=now + timedelta(microseconds=500)
+        )
+        self.assertEqual(key1, key2)
+        self.assertEqual(len(key1), 64)
+
+    def test_key_differs_per_event(self):
+        now = timezone.now()
+        base = build_idempotency_key("idempotent_type", self.user.pk, self.actor.pk, "startup:7", now=now)
+        self.assertNotEqual(
+            base, build_idempotency_key("idempotent_type", self.user.pk, self.actor.pk, "startup:8", now=now)
+        )
+        self.assertNotEqual(
+            base, build_idempotency_key("other_type", self.user.pk, self.actor.pk, "startup:7", now=now)
+        )
+        self.assertNotEqual(
+            base,
+            build_idempotency_key(
+                "idempotent_type", self.user.pk, self.actor.pk, "startup:7", now=now + timedelta(seconds=2)
+            ),
+        )
+
+    def test_duplicate_insert_is_ignored(self):
+        key = build_idempotency_key("idempotent_type", self.user.pk, self.actor.pk, "startup:7")
+        create_notification_once(**self._fields(key))
+        create_notification_once(**self._fields(key))
+        self.assertEqual(Notification.objects.filter(idempotency_key=key).count(), 1)
+
+    def test_follow_notification_is_single_insert(self):
+        # Treat the type as committed so the registry caches it
+        with patch("communications.registry.get_redis"), self.captureOnCommitCallbacks(execute=True):
+            self.ntype.save()
+        self.addCleanup(registry.clear)
+        type_id = registry.get_type_id("idempotent_type")
+        key = build_idempotency_key("idempotent_type", self.user.pk, self.actor.pk, "startup:7")
+        with self.assertNumQueries(1):
+            fields = self._fields(key)
+            fields["notification_type_id"] = registry.get_type_id("idempotent_type")
+            create_notification_once(**fields)
+        self.assertEqual(type_id, self.ntype.pk)
+        self.assertTrue(Notification.objects.filter(idempotency_key=key).exists())
@@ -0,0 +1,84 @@
+from unittest.mock import patch
+
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from investors.models import ProjectFollow, recount_follower_counts
+from projects.models import Project
+from tests.factories import InvestorFactory, ProjectFactory
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class ProjectFollowerCountTests(APITestCase):
+    """Tests for the denormalized Project.follower_count and the counts endpoint."""
+
+    def setUp(self):
+        self.project = ProjectFactory()
+        self.investor = InvestorFactory()
+
+    def count(self, project=None):
+        return Project.objects.values_list('follower_count', flat=True).get(pk=(project or self.project).pk)
+
+    @patch('users.permissions.HasActiveCompanyAccount.has_permission', return_value=True)
+    def test_follow_and_unfollow_endpoints_maintain_count(self, mocked_permission):
+        self.client.force_authenticate(user=self.investor.user)
+
+        self.client.post(reverse('project-follow', kwargs={'project_id': self.project.id}))
+        self.assertEqual(self.count(), 1)
+
+        follow = ProjectFollow.objects.get(project=self.project)
+        self.client.patch(reverse('project-follow-detail', kwargs={'pk': follow.id}))
+        self.assertEqual(self.count(), 0)
+
+    def test_stale_instances_count_a_flip_once(self):
+        follow = ProjectFollow.objects.create(investor=self.investor, project=self.project)
+        first = ProjectFollow.objects.get(pk=follow.pk)
+        second = ProjectFollow.objects.get(pk=follow.pk)
+
+        first.is_active = False
+        first.save()
+        second.is_active = False
+        second.save()
+        self.assertEqual(self.count(), 0)
+
+        first.is_active = True
+        first.save()
+        self.assertEqual(self.count(), 1)
+
+    def test_deleting_an_active_follow_decrements(self):
+        ProjectFollow.objects.create(investor=self.investor, project=self.project)
+        ProjectFollow.objects.create(investor=InvestorFactory(), project=self.project, is_active=False)
+
+        self.investor.delete()
+        self.assertEqual(self.count(), 0)
+
+    def test_project_save_keeps_the_current_count(self):
+        stale = Project.objects.get(pk=self.project.pk)
+        ProjectFollow.objects.create(investor=self.investor, project=self.project)
+
+        stale.title = 'Renamed'
+        stale.save()
+        self.assertEqual(self.count(), 1)
+
+    def test_recount_repairs_bulk_created_follows(self):
+        ProjectFollow.objects.bulk_create([ProjectFollow(investor=self.investor, project=self.project)])
+        self.assertEqual(self.count(), 0)
+
+        recount_follower_counts([self.project.pk])
+        self.assertEqual(self.count(), 1)
+
+    def test_counts_endpoint(self):
+        other = ProjectFactory()
+        ProjectFollow.objects.create(investor=self.investor, project=self.project)
+        self.client.force_authenticate(user=self.investor.user)
+        url = reverse('project-follower-counts')
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {'ids': f'{self.project.pk},{other.pk},999999'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {str(self.project.pk): 1, str(other.pk): 0})
+        self.assertEqual(self.client.get(url, {'ids': 'x'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_400_BAD_REQUEST)
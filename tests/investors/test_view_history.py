@@ -0,0 +1,145 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from redis.exceptions import RedisError
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from investors import view_history
+from investors.models import ViewedStartup
+from tests.factories import InvestorFactory, StartupFactory
+from utils.redis_client import get_redis
+
+TEST_VIEW_HISTORY = {
+    'key_prefix': 'test:investors:viewed',
+    'enabled': True,
+    'max_entries': 3,
+    'ttl': 60,
+    'batch_size': 2,
+}
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, VIEW_HISTORY=TEST_VIEW_HISTORY)
+@patch('users.permissions.HasActiveCompanyAccount.has_permission', return_value=True)
+class ViewHistoryTests(APITestCase):
+    """Tests for the Redis-backed recently viewed startups."""
+
+    def setUp(self):
+        self.redis = get_redis()
+        self.investor = InvestorFactory()
+        self.startups = [StartupFactory() for _ in range(4)]
+        self.client.force_authenticate(user=self.investor.user)
+        self.addCleanup(self.clear_redis)
+        self.clear_redis()
+
+    def clear_redis(self):
+        keys = list(self.redis.scan_iter(f"{TEST_VIEW_HISTORY['key_prefix']}:*"))
+        if keys:
+            self.redis.delete(*keys)
+
+    def view(self, startup):
+        return self.client.post(reverse('viewed-startup-create', args=[startup.pk]))
+
+    def listed(self, **params):
+        response = self.client.get(reverse('viewed-startup-list'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item['startup_id'] for item in response.data['results']]
+
+    def test_views_are_kept_in_redis_until_flushed(self, mock_permission):
+        for startup in self.startups[:2]:
+            response = self.view(startup)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.view(self.startups[0])
+
+        self.assertFalse(ViewedStartup.objects.exists())
+        self.assertEqual(response.data['startup_id'], self.startups[1].pk)
+        self.assertEqual(self.listed(), [self.startups[0].pk, self.startups[1].pk])
+
+    def test_history_is_capped_and_hydrated_in_one_query(self, mock_permission):
+        for startup in self.startups:
+            self.view(startup)
+
+        # investor, the page's startups
+        with self.assertNumQueries(2):
+            listed = self.listed(page_size=2)
+        self.assertEqual(listed, [self.startups[3].pk, self.startups[2].pk])
+        self.assertEqual(self.listed(), [startup.pk for startup in reversed(self.startups[1:])])
+
+    def test_flush_upserts_in_batches_and_trims(self, mock_permission):
+        other = InvestorFactory()
+        earlier = timezone.now() - timedelta(hours=1)
+        ViewedStartup.objects.create(investor=self.investor, startup=self.startups[0], viewed_at=earlier)
+        for startup in self.startups[1:]:
+            view_history.record_view(self.investor.pk, startup)
+        view_history.record_view(self.investor.pk, self.startups[0])
+        view_history.record_view(other.pk, self.startups[0])
+
+        stats = view_history.flush_views()
+
+        self.assertEqual(stats['flushed'], 5)
+        self.assertEqual(stats['batches'], 3)
+        self.assertEqual(stats['trimmed'], 1)
+        self.assertEqual(
+            set(ViewedStartup.objects.filter(investor=self.investor).values_list('startup_id', flat=True)),
+            {self.startups[0].pk, self.startups[2].pk, self.startups[3].pk},
+        )
+        self.assertGreater(ViewedStartup.objects.get(investor=self.investor, startup=self.startups[0]).viewed_at, earlier)
+        self.assertTrue(ViewedStartup.objects.filter(investor=other).exists())
+        self.assertEqual(view_history.flush_views()['flushed'], 0)
+
+    def test_only_one_flush_runs_at_a_time(self, mock_permission):
+        view_history.record_view(self.investor.pk, self.startups[0])
+        self.redis.set(f"{TEST_VIEW_HISTORY['key_prefix']}:lock", '1')
+
+        self.assertEqual(view_history.flush_views()['flushed'], 0)
+        self.assertFalse(ViewedStartup.objects.exists())
+        self.assertEqual(self.redis.hlen(f"{TEST_VIEW_HISTORY['key_prefix']}:pending"), 1)
+
+    def test_missing_history_is_rebuilt_from_postgres(self, mock_permission):
+        now = timezone.now()
+        for minutes, startup in enumerate(self.startups[:2]):
+            ViewedStartup.objects.create(investor=self.investor, startup=startup, viewed_at=now - timedelta(minutes=minutes))
+
+        self.view(self.startups[2])
+
+        self.assertEqual(self.listed(), [self.startups[2].pk, self.startups[0].pk, self.startups[1].pk])
+
+    def test_clear_removes_redis_pending_and_rows(self, mock_permission):
+        ViewedStartup.objects.create(investor=self.investor, startup=self.startups[0])
+        self.view(self.startups[1])
+
+        response = self.client.delete(reverse('viewed-startup-clear'))
+
+        self.assertEqual(response.data['deleted_count'], 2)
+        self.assertEqual(self.listed(), [])
+        self.assertEqual(view_history.flush_views()['flushed'], 0)
+        self.assertFalse(ViewedStartup.objects.exists())
+
+    def test_clear_drops_views_a_flush_is_processing(self, mock_permission):
+        view_history.record_view(self.investor.pk, self.startups[0])
+        pending = view_history._pending_key(view_history.get_view_history_config())
+        self.redis.rename(pending, f"{pending}:processing")
+        view_history.clear_views(self.investor.pk)
+        self.assertFalse(self.redis.exists(f"{pending}:processing"))
+
+        # A flush that read the view before the clear doesn't write it back
+        batch = {(self.investor.pk, self.startups[1].pk): (timezone.now() - timedelta(seconds=1)).timestamp()}
+        self.assertEqual(view_history._write_batch(self.redis, view_history.get_view_history_config(), batch), set())
+        self.assertFalse(ViewedStartup.objects.exists())
+
+        view_history.record_view(self.investor.pk, self.startups[2])
+        self.assertEqual(view_history.flush_views()['flushed'], 1)
+        self.assertEqual(list(ViewedStartup.objects.values_list('startup_id', flat=True)), [self.startups[2].pk])
+        self.assertFalse(self.redis.exists(f"{TEST_VIEW_HISTORY['key_prefix']}:cleared"))
+
+    def test_postgres_is_used_when_redis_is_down(self, mock_permission):
+        with patch('investors.view_history.get_redis', side_effect=RedisError):
+            self.view(self.startups[0])
+            self.view(self.startups[0])
+            listed = self.listed()
+
+        self.assertEqual(listed, [self.startups[0].pk])
+        self.assertEqual(ViewedStartup.objects.filter(investor=self.investor).count(), 1)
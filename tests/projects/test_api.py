@@ -79,6 +79,23 @@ class ProjectAPICRUDTests(BaseAPITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertGreaterEqual(len(response.data), 1)
 
+    @patch('users.permissions.HasActiveCompanyAccount.has_permission', return_value=True)
+    def test_project_list_is_flat(self, mocked_permission):
+        """
+        Test that the list endpoint returns related startup and category by id and name
+        instead of nested objects, with one query for the page (plus the ETag validator).
+        """
+        project = self.get_or_create_project()
+        url = reverse("project-list")
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        row = next(item for item in response.data if item["id"] == project.id)
+        self.assertEqual(row["startup"], project.startup_id)
+        self.assertEqual(row["startup_name"], project.startup.company_name)
+        self.assertEqual(row["category_name"], project.category.name)
+        self.assertNotIn("description", row)
+
     def test_patch_project(self):
         """
         Test updating an existing project's title via PATCH request.
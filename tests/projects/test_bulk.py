@@ -0,0 +1,140 @@
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from communications.models import Notification
+from projects.bulk import notify_project_subscribers
+from projects.models import Project, ProjectHistory
+from tests.test_base_case import BaseAPITestCase
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+@patch('users.permissions.HasActiveCompanyAccount.has_permission', return_value=True)
+class ProjectBulkUpsertTests(BaseAPITestCase):
+    """Tests for POST /api/v1/projects/bulk/."""
+
+    url = reverse('project-bulk-upsert')
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(user=self.startup_user)
+
+    def new_project(self, index, **overrides):
+        data = {
+            'startup_id': self.startup.id,
+            'category_id': self.category.id,
+            'title': f'Bulk Project {index}',
+            'email': f'bulk{index}@example.com',
+            'funding_goal': '5000.00',
+        }
+        data.update(overrides)
+        return data
+
+    def post(self, payload):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(self.url, payload, format='json')
+
+    def test_creates_and_updates_in_one_batch(self, mock_permission):
+        payload = [
+            self.new_project(1),
+            {'id': self.project.id, 'title': 'Renamed Project'},
+            self.new_project(2),
+        ]
+        with patch('projects.tasks.notify_project_subscribers_task.delay') as delay:
+            response = self.post(payload)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(len(response.data['created']), 2)
+        self.assertEqual(response.data['updated'], [self.project.id])
+        self.assertEqual(
+            set(Project.objects.filter(pk__in=response.data['created']).values_list('title', flat=True)),
+            {'Bulk Project 1', 'Bulk Project 2'},
+        )
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.title, 'Renamed Project')
+
+        history = ProjectHistory.objects.get(project=self.project)
+        self.assertEqual(history.user, self.startup_user)
+        self.assertEqual(history.changed_fields['title']['new'], 'Renamed Project')
+        delay.assert_called_once_with([self.project.id], self.startup_user.pk)
+
+    def test_query_count_does_not_grow_with_batch_size(self, mock_permission):
+        def count(payload):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.post(payload)
+            self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+            return len(queries)
+
+        small = count([self.new_project(index) for index in range(2)])
+        large = count([self.new_project(index) for index in range(10, 20)])
+        self.assertEqual(small, large)
+
+    def test_updates_lock_rows_and_write_only_their_fields(self, mock_permission):
+        other = Project.objects.create(
+            startup=self.startup, category=self.category, title='Other', email='other@example.com',
+            funding_goal=Decimal('5000.00'),
+        )
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post([
+                {'id': self.project.id, 'title': 'Renamed Project'},
+                {'id': other.id, 'description': 'New description'},
+            ])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        sql = [query['sql'] for query in queries]
+        self.assertTrue(any(q.startswith('SELECT') and 'FOR UPDATE' in q for q in sql))
+        updates = [q for q in sql if q.startswith('UPDATE "projects"')]
+        self.assertEqual(len(updates), 2)
+        self.assertFalse(any('"current_funding"' in q for q in updates))
+        self.assertFalse(any('"title"' in q and '"description"' in q for q in updates))
+
+    def test_duplicates_reject_the_whole_batch(self, mock_permission):
+        payload = [
+            self.new_project(1, email='same@example.com'),
+            self.new_project(2, email='same@example.com'),
+            self.new_project(3, title=self.project.title),
+            self.new_project(4),
+        ]
+        response = self.post(payload)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('email', response.data[0])
+        self.assertIn('email', response.data[1])
+        self.assertIn('non_field_errors', response.data[2])
+        self.assertEqual(response.data[3], {})
+        self.assertFalse(Project.objects.filter(title__startswith='Bulk Project').exists())
+
+    def test_update_may_keep_its_own_email(self, mock_permission):
+        response = self.post([{'id': self.project.id, 'email': self.project.email, 'title': self.project.title}])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+
+    def test_other_users_startups_are_forbidden(self, mock_permission):
+        self.client.force_authenticate(user=self.user2)
+
+        self.assertEqual(self.post([self.new_project(1)]).status_code, status.HTTP_403_FORBIDDEN)
+        response = self.post([{'id': self.project.id, 'title': 'Hijacked'}])
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(PROJECT_BULK_MAX_ITEMS=1)
+    def test_batch_size_is_limited(self, mock_permission):
+        response = self.post([self.new_project(1), self.new_project(2)])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('non_field_errors', response.data)
+
+    def test_subscribers_are_notified_once_per_project(self, mock_permission):
+        self.get_or_create_subscription(self.investor1, self.project, Decimal('100.00'))
+        self.get_or_create_subscription(self.investor2, self.project, Decimal('100.00'))
+
+        created = notify_project_subscribers([self.project.id], self.startup_user.pk)
+
+        self.assertEqual(created, 2)
+        self.assertEqual(
+            set(Notification.objects.filter(related_project=self.project).values_list('user_id', flat=True)),
+            {self.investor_user.pk, self.investor_user2.pk},
+        )
@@ -0,0 +1,104 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from projects.history import compact_history, record_history
+from projects.models import ProjectFieldChange, ProjectHistory
+from tests.test_base_case import BaseAPITestCase
+
+
+def _change(old, new):
+    return {'old': old, 'new': new}
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+@patch('users.permissions.HasActiveCompanyAccount.has_permission', return_value=True)
+class ProjectHistoryTests(BaseAPITestCase):
+    """Tests for normalized project history, its endpoint and compaction."""
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(user=self.startup_user)
+        self.url = reverse('project-history', args=[self.project.pk])
+
+    def record(self, user, changes, seconds_ago):
+        entry = record_history([(self.project, user, changes)])[0]
+        timestamp = timezone.now() - timedelta(seconds=seconds_ago)
+        ProjectHistory.objects.filter(pk=entry.pk).update(timestamp=timestamp)
+        ProjectFieldChange.objects.filter(history=entry).update(timestamp=timestamp)
+        return entry
+
+    def test_update_stores_one_row_per_changed_field(self, mock_permission):
+        url = reverse('project-update-project', args=[self.project.pk])
+        self.client.post(url, {'title': 'Renamed', 'funding_goal': '2000000.00'}, format='json')
+
+        entry = ProjectHistory.objects.get(project=self.project)
+        self.assertEqual(
+            set(entry.changes.values_list('field', 'new_value')),
+            {('title', 'Renamed'), ('funding_goal', '2000000.00')},
+        )
+
+    def test_history_endpoint_is_cursor_paginated(self, mock_permission):
+        for index in range(25):
+            self.record(self.startup_user, {'title': _change(f't{index}', f't{index + 1}')}, 3600 * (25 - index))
+
+        # project, its owner (object permission), one page of entries, their changes
+        with self.assertNumQueries(4):
+            first = self.client.get(self.url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(first.data['results']), 20)
+        self.assertEqual(first.data['results'][0]['changes'], [{'field': 'title', 'old': 't24', 'new': 't25'}])
+
+        second = self.client.get(first.data['next'])
+        self.assertEqual(len(second.data['results']), 5)
+        self.assertIsNone(second.data['next'])
+
+    def test_field_timeline(self, mock_permission):
+        self.record(self.startup_user, {'funding_goal': _change('100', '200'), 'title': _change('a', 'b')}, 7200)
+        self.record(self.user2, {'funding_goal': _change('200', '300')}, 3600)
+        self.record(self.startup_user, {'title': _change('b', 'c')}, 60)
+
+        response = self.client.get(self.url, {'field': 'funding_goal'})
+
+        self.assertEqual(
+            [(point['old'], point['new'], point['user']) for point in response.data['results']],
+            [('200', '300', self.user2.pk), ('100', '200', self.startup_user.pk)],
+        )
+        self.assertEqual(self.client.get(self.url, {'field': 'email'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_history_is_owner_only(self, mock_permission):
+        self.client.force_authenticate(user=self.user2)
+
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_compaction_merges_rapid_edits_by_the_same_editor(self, mock_permission):
+        first = self.record(self.startup_user, {'title': _change('a', 'b'), 'status': _change('draft', 'x')}, 600)
+        self.record(self.startup_user, {'title': _change('b', 'c'), 'status': _change('x', 'draft')}, 500)
+        self.record(self.startup_user, {'description': _change('', 'd')}, 400)
+        other = self.record(self.user2, {'title': _change('c', 'e')}, 300)
+        late = self.record(self.user2, {'title': _change('e', 'f')}, 100)
+
+        stats = compact_history(merge_window_seconds=120)
+
+        self.assertEqual(stats['merged'], 2)
+        self.assertEqual(
+            list(ProjectHistory.objects.order_by('timestamp').values_list('pk', flat=True)),
+            [first.pk, other.pk, late.pk],
+        )
+        first.refresh_from_db()
+        self.assertEqual(first.changed_fields, {'title': _change('a', 'c'), 'description': _change('', 'd')})
+        self.assertEqual(set(first.changes.values_list('timestamp', flat=True)), {first.timestamp})
+
+    def test_retention_deletes_old_entries(self, mock_permission):
+        self.record(self.startup_user, {'title': _change('a', 'b')}, 86400 * 40)
+        recent = self.record(self.startup_user, {'title': _change('b', 'c')}, 60)
+
+        stats = compact_history(merge_window_seconds=0, retention_days=30)
+
+        self.assertEqual(stats['expired'], 1)
+        self.assertEqual(list(ProjectHistory.objects.values_list('pk', flat=True)), [recent.pk])
+        self.assertEqual(ProjectFieldChange.objects.count(), 1)
@@ -0,0 +1,104 @@
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from elasticsearch.exceptions import ConnectionError
+from elasticsearch_dsl import MultiSearch, Search
+from elasticsearch_dsl.response import Response
+from rest_framework.test import APITestCase
+
+from search.autocomplete import build_multi_search
+from search.circuit_breaker import elasticsearch_breaker
+from tests.factories import IndustryFactory, StartupFactory, UserFactory
+from tests.search.test_result_cache import TEST_CACHE, _clear_cache
+from utils.redis_client import get_redis
+
+
+class BuildMultiSearchTests(SimpleTestCase):
+    def test_one_suggest_only_search_per_index(self):
+        body = build_multi_search('ac', ['startups', 'industries', 'projects'], 5).to_dict()
+
+        self.assertEqual(len(body), 4)  # header + body per index
+        startups = body[1]
+        self.assertEqual(startups['size'], 0)
+        self.assertFalse(startups['_source'])
+        self.assertEqual(startups['suggest']['startups'], {
+            'text': 'ac',
+            'completion': {'field': 'company_name.suggest', 'size': 5, 'skip_duplicates': False},
+        })
+        self.assertTrue(startups['suggest']['industries']['completion']['skip_duplicates'])
+        self.assertEqual(list(body[3]['suggest']), ['projects'])
+
+
+def _fake_msearch(self, *args, **kwargs):
+    startups = {
+        'hits': {'total': {'value': 0, 'relation': 'eq'}, 'hits': []},
+        'suggest': {
+            'startups': [{'text': 'ac', 'offset': 0, 'length': 2, 'options': [
+                {'text': 'Acme', '_index': 'startups_v1', '_id': '7', '_score': 1.0},
+            ]}],
+            'industries': [{'text': 'ac', 'offset': 0, 'length': 2, 'options': [
+                {'text': 'Accounting', '_index': 'startups_v1', '_id': '3', '_score': 1.0},
+            ]}],
+        },
+    }
+    return [Response(Search(), startups)]
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, SEARCH_RESULT_CACHE=TEST_CACHE)
+class AutocompleteAPITests(APITestCase):
+    """Tests for the typeahead endpoint."""
+
+    def setUp(self):
+        _clear_cache()
+        self.addCleanup(_clear_cache)
+        self.client.force_authenticate(user=UserFactory())
+        self.url = reverse('search-autocomplete')
+
+    @patch.object(MultiSearch, 'execute', autospec=True, side_effect=_fake_msearch)
+    def test_suggestions_are_grouped_and_cached_case_insensitively(self, mock_execute):
+        response = self.client.get(self.url, {'q': 'Ac', 'types': 'startups,industries'})
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data, {
+            'startups': [{'text': 'Acme', 'id': 7}],
+            'industries': [{'text': 'Accounting'}],
+        })
+        again = self.client.get(self.url, {'q': ' ac', 'types': 'startups,industries'})
+        self.assertEqual(again['X-Search-Cache'], 'hit')
+        self.assertEqual(mock_execute.call_count, 1)
+
+    @patch.object(MultiSearch, 'execute', autospec=True, side_effect=_fake_msearch)
+    def test_concurrent_miss_waits_for_the_first_request(self, mock_execute):
+        params = {'q': 'ac', 'types': 'startups,industries'}
+        self.client.get(self.url, params)
+        redis = get_redis()
+        key = next(redis.scan_iter(f"{TEST_CACHE['key_prefix']}:*autocomplete*"))
+        payload = redis.get(key)
+        redis.delete(key)
+        redis.set(f"{key}:lock", 1, ex=5)
+        self.addCleanup(redis.delete, f"{key}:lock")
+
+        # The request holding the lock stores its page while this one waits
+        with patch('search.result_cache.time.sleep', side_effect=lambda _: redis.set(key, payload)):
+            response = self.client.get(self.url, params)
+
+        self.assertEqual(response['X-Search-Cache'], 'hit')
+        self.assertEqual(mock_execute.call_count, 1)
+
+    @patch.object(MultiSearch, 'execute', side_effect=ConnectionError('N/A', 'down', None))
+    def test_database_suggestions_while_elasticsearch_is_down(self, mock_execute):
+        self.addCleanup(elasticsearch_breaker.reset)
+        startup = StartupFactory(company_name='Acme Robotics', industry=IndustryFactory(name='Aerospace'))
+
+        response = self.client.get(self.url, {'q': 'a', 'types': 'startups,industries'})
+
+        self.assertEqual(response['X-Search-Backend'], 'database')
+        self.assertEqual(response.data['startups'], [{'text': 'Acme Robotics', 'id': startup.id}])
+        self.assertEqual(response.data['industries'], [{'text': 'Aerospace'}])
+
+    def test_empty_prefix_and_bad_params(self):
+        response = self.client.get(self.url, {'q': '', 'types': 'projects'})
+        self.assertEqual(response.data, {'projects': []})
+        self.assertEqual(self.client.get(self.url, {'q': 'a', 'types': 'users'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'q': 'a', 'size': 11}).status_code, 400)
@@ -0,0 +1,30 @@
+from collections import Counter
+
+from django.test import SimpleTestCase
+from django_elasticsearch_dsl.registries import registry
+
+import search.documents
+from projects.documents import ProjectDocument
+from startups.documents import StartupDocument
+
+
+class DocumentRegistryTests(SimpleTestCase):
+    """Guards against several documents writing to the same Elasticsearch index."""
+
+    def test_each_index_has_a_single_document(self):
+        index_names = Counter(doc._index._name for doc in registry.get_documents())
+        duplicates = {name: count for name, count in index_names.items() if count > 1}
+        self.assertEqual(duplicates, {}, f"Indexes registered by more than one document: {duplicates}")
+
+    def test_search_app_uses_the_registered_documents(self):
+        self.assertIs(search.documents.StartupDocument, StartupDocument)
+        self.assertIs(search.documents.ProjectDocument, ProjectDocument)
+
+    def test_mappings_cover_search_and_document_viewsets(self):
+        startup_props = StartupDocument._doc_type.mapping.to_dict()['properties']
+        self.assertEqual(startup_props['company_name']['fields']['raw']['type'], 'keyword')
+        self.assertEqual(startup_props['stage']['type'], 'keyword')
+        project_props = ProjectDocument._doc_type.mapping.to_dict()['properties']
+        self.assertEqual(project_props['title']['fields']['raw']['type'], 'keyword')
+        self.assertEqual(project_props['status']['type'], 'keyword')
+        self.assertIn('funding_goal', project_props)
@@ -0,0 +1,127 @@
+from unittest.mock import patch
+
+from django.http import QueryDict
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from django_elasticsearch_dsl_drf.pagination import PageNumberPagination
+from elasticsearch_dsl import Search
+from elasticsearch_dsl.response import Response
+from rest_framework.test import APITestCase
+
+from search.facets import FUNDING_GOAL_RANGES, apply_facets
+from tests.factories import UserFactory
+
+PROJECT_FACETS = {
+    'category.name': {'field': 'category.name'},
+    'status': {'field': 'status'},
+    'funding_goal': {'field': 'funding_goal', 'ranges': FUNDING_GOAL_RANGES},
+}
+
+
+class ApplyFacetsTests(SimpleTestCase):
+    """Tests for building post_filter + facet aggregations."""
+
+    def test_filters_go_to_post_filter_and_aggregations_exclude_own_filter(self):
+        params = QueryDict('status=active&category.name=Tech&category.name=Finance')
+        body = apply_facets(Search(), PROJECT_FACETS, params, with_aggregations=True).to_dict()
+
+        self.assertNotIn('query', body)
+        self.assertEqual(body['post_filter'], {'bool': {'filter': [
+            {'terms': {'category.name': ['Tech', 'Finance']}},
+            {'terms': {'status': ['active']}},
+        ]}})
+        status_agg = body['aggs']['_facet_status']
+        self.assertEqual(status_agg['filter'], {'bool': {'filter': [
+            {'terms': {'category.name': ['Tech', 'Finance']}},
+        ]}})
+        self.assertEqual(status_agg['aggs']['status'], {'terms': {'field': 'status', 'size': 20}})
+        funding_agg = body['aggs']['_facet_funding_goal']
+        self.assertEqual(len(funding_agg['filter']['bool']['filter']), 2)
+        self.assertEqual(
+            funding_agg['aggs']['funding_goal']['range']['ranges'][0], {'key': 'lt_10k', 'to': 10_000}
+        )
+
+    def test_range_filter_and_no_aggregations_by_default(self):
+        params = QueryDict('funding_goal=10k_100k&funding_goal=gte_1m')
+        body = apply_facets(Search(), PROJECT_FACETS, params).to_dict()
+
+        self.assertNotIn('aggs', body)
+        self.assertEqual(body['post_filter']['bool']['filter'][0], {'bool': {
+            'should': [
+                {'range': {'funding_goal': {'gte': 10_000, 'lt': 100_000}}},
+                {'range': {'funding_goal': {'gte': 1_000_000}}},
+            ],
+            'minimum_should_match': 1,
+        }})
+
+    def test_unselected_facets_aggregate_over_everything(self):
+        body = apply_facets(Search(), PROJECT_FACETS, QueryDict(''), with_aggregations=True).to_dict()
+        self.assertNotIn('post_filter', body)
+        self.assertEqual(body['aggs']['_facet_status']['filter'], {'match_all': {}})
+
+
+def _fake_execute(search, *args, **kwargs):
+    raw = {
+        'hits': {'total': {'value': 1, 'relation': 'eq'}, 'hits': [
+            {'_index': 'projects', '_id': '1', '_score': 1.0, '_source': {
+                'id': 1, 'title': 'Health AI', 'description': 'AI', 'status': 'active',
+                'startup': {'id': 1, 'company_name': 'Test'}, 'category': {'id': 1, 'name': 'Tech'},
+            }},
+        ]},
+        'aggregations': {
+            '_facet_category.name': {'doc_count': 3, 'category.name': {'buckets': [
+                {'key': 'Tech', 'doc_count': 2}, {'key': 'Finance', 'doc_count': 1},
+            ]}},
+            '_facet_status': {'doc_count': 2, 'status': {'buckets': [
+                {'key': 'active', 'doc_count': 1}, {'key': 'draft', 'doc_count': 1},
+            ]}},
+            '_facet_funding_goal': {'doc_count': 2, 'funding_goal': {'buckets': [
+                {'key': 'lt_10k', 'doc_count': 0}, {'key': '10k_100k', 'doc_count': 2},
+                {'key': '100k_1m', 'doc_count': 0}, {'key': 'gte_1m', 'doc_count': 0},
+            ]}},
+        },
+    }
+    return Response(search, raw)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class ProjectFacetsAPITests(APITestCase):
+    """Tests for ?facets=true on the project document endpoint."""
+
+    def setUp(self):
+        self.client.force_authenticate(user=UserFactory())
+        self.url = reverse('project-document-list')
+
+    @patch.object(Search, 'execute', autospec=True, side_effect=_fake_execute)
+    def test_hits_and_facets_in_one_query(self, mock_execute):
+        response = self.client.get(self.url, {'facets': 'true', 'status': 'active'})
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(mock_execute.call_count, 1)
+        self.assertEqual(response.data['results'][0]['title'], 'Health AI')
+        self.assertEqual(
+            response.data['facets']['status'],
+            [
+                {'value': 'active', 'count': 1, 'selected': True},
+                {'value': 'draft', 'count': 1, 'selected': False},
+            ],
+        )
+        self.assertEqual(response.data['facets']['funding_goal'][1], {'value': '10k_100k', 'count': 2, 'selected': False})
+
+    @patch.object(PageNumberPagination, 'page_size', 1)
+    @patch.object(Search, 'count', autospec=True, return_value=3)
+    @patch.object(Search, 'execute', autospec=True, side_effect=_fake_execute)
+    def test_facets_are_added_to_the_paginated_response(self, mock_execute, mock_count):
+        response = self.client.get(self.url, {'facets': 'true', 'page': 2})
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(mock_execute.call_count, 1)
+        body = mock_execute.call_args.args[0].to_dict()
+        self.assertEqual((body['from'], body['size']), (1, 1))
+        self.assertIsNotNone(response.data['previous'])
+        self.assertEqual(response.data['results'][0]['title'], 'Health AI')
+        self.assertEqual(response.data['facets']['category.name'][0], {'value': 'Tech', 'count': 2, 'selected': False})
+
+    def test_unknown_range_key_is_rejected(self):
+        response = self.client.get(self.url, {'funding_goal': 'huge'})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,144 @@
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from elasticsearch.exceptions import ConnectionError, RequestError
+from elasticsearch_dsl import Search
+from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
+
+from search.circuit_breaker import SearchUnavailable, elasticsearch_breaker
+from search.services import filter_startups
+from startups.views.startup_elasticsearch import StartupDocumentView
+from tests.factories import ProjectFactory, StartupFactory, UserFactory
+
+TEST_BREAKER = {
+    'key_prefix': 'test:search:breaker',
+    'failure_threshold': 2,
+    'window_seconds': 60,
+    'reset_timeout': 30,
+}
+
+
+def _es_down(*args, **kwargs):
+    raise ConnectionError('N/A', 'Connection refused', None)
+
+
+@override_settings(SEARCH_CIRCUIT_BREAKER=TEST_BREAKER)
+class CircuitBreakerTests(TestCase):
+    """Tests for the Redis-backed Elasticsearch circuit breaker."""
+
+    def setUp(self):
+        elasticsearch_breaker.reset()
+        self.addCleanup(elasticsearch_breaker.reset)
+
+    def test_opens_after_threshold_and_skips_calls(self):
+        for _ in range(2):
+            with self.assertRaises(SearchUnavailable):
+                elasticsearch_breaker.call(_es_down)
+        self.assertTrue(elasticsearch_breaker.is_open())
+
+        calls = []
+        with self.assertRaises(SearchUnavailable):
+            elasticsearch_breaker.call(calls.append, 1)
+        self.assertEqual(calls, [])
+
+    def test_success_clears_failure_count(self):
+        with self.assertRaises(SearchUnavailable):
+            elasticsearch_breaker.call(_es_down)
+        self.assertEqual(elasticsearch_breaker.call(lambda: 'ok'), 'ok')
+        with self.assertRaises(SearchUnavailable):
+            elasticsearch_breaker.call(_es_down)
+        self.assertFalse(elasticsearch_breaker.is_open())
+
+    def test_bad_requests_are_not_outages(self):
+        def bad_query():
+            raise RequestError(400, 'parsing_exception', {})
+
+        for _ in range(3):
+            with self.assertRaises(RequestError):
+                elasticsearch_breaker.call(bad_query)
+        self.assertFalse(elasticsearch_breaker.is_open())
+
+
+class FullTextSearchTests(TestCase):
+    """Tests for the Postgres full-text search over search_vector."""
+
+    def test_prefix_match_ranks_name_above_description(self):
+        in_description = StartupFactory(company_name='Acme', description='Healthcare analytics')
+        in_name = StartupFactory(company_name='Healthify', description='Apps')
+        StartupFactory(company_name='Solar', description='Energy')
+
+        self.assertEqual(list(filter_startups('health')), [in_name, in_description])
+
+    def test_query_without_words_matches_nothing(self):
+        StartupFactory()
+        self.assertFalse(filter_startups("'&|!").exists())
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, SEARCH_CIRCUIT_BREAKER=TEST_BREAKER)
+class SearchFallbackAPITests(APITestCase):
+    """Tests for serving search endpoints from Postgres while Elasticsearch is down."""
+
+    def setUp(self):
+        elasticsearch_breaker.reset()
+        self.addCleanup(elasticsearch_breaker.reset)
+        self.user = UserFactory()
+        self.client.force_authenticate(user=self.user)
+        self.startup = StartupFactory(company_name='Green Energy', description='Solar panels')
+        StartupFactory(company_name='Fintech One', description='Payments')
+        self.project = ProjectFactory(startup=self.startup, title='Solar farm', description='Panels', status='active')
+
+    @patch.object(Search, 'execute', side_effect=_es_down)
+    def test_startup_documents_served_from_database(self, mock_execute):
+        # startups/search/ is shadowed by the startup detail route, so call the view directly
+        request = APIRequestFactory().get('/', {'search': 'solar'})
+        force_authenticate(request, user=self.user)
+        response = StartupDocumentView.as_view({'get': 'list'})(request)
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response['X-Search-Backend'], 'database')
+        self.assertEqual([row['id'] for row in response.data], [self.startup.id])
+        self.assertEqual(response.data[0]['company_name'], 'Green Energy')
+        self.assertEqual(response.data[0]['industry'], self.startup.industry.name)
+
+    @patch.object(Search, 'execute', side_effect=_es_down)
+    def test_project_documents_apply_filters_and_open_circuit(self, mock_execute):
+        url = reverse('project-document-list')
+        for _ in range(3):
+            response = self.client.get(url, {'search': 'panel', 'status': 'active'})
+            self.assertEqual(response.status_code, 200, response.data)
+            self.assertEqual(response['X-Search-Backend'], 'database')
+            self.assertEqual(response.data[0]['title'], 'Solar farm')
+            self.assertEqual(response.data[0]['startup']['company_name'], 'Green Energy')
+
+        # Third request skipped Elasticsearch once the circuit opened
+        self.assertEqual(mock_execute.call_count, 2)
+        response = self.client.get(url, {'search': 'panel', 'status': 'draft'})
+        self.assertEqual(response.data, [])
+
+    @patch.object(Search, 'execute')
+    def test_infix_filters_apply_while_circuit_is_open(self, mock_execute):
+        ProjectFactory(startup=self.startup, title='Wind turbines', description='Offshore panels')
+        for _ in range(TEST_BREAKER['failure_threshold']):
+            elasticsearch_breaker.record_failure()
+        url = reverse('project-document-list')
+
+        response = self.client.get(url, {'title': 'olar'})
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response['X-Search-Backend'], 'database')
+        self.assertEqual([row['id'] for row in response.data], [self.project.id])
+
+        response = self.client.get(url, {'description': 'panels', 'title': 'WIND'})
+        self.assertEqual([row['title'] for row in response.data], ['Wind turbines'])
+        mock_execute.assert_not_called()
+
+    @patch.object(Search, 'execute', side_effect=_es_down)
+    def test_search_view_falls_back_and_ends_cursor_pagination(self, mock_execute):
+        response = self.client.get(reverse('startup-search'), {'q': 'green'})
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response['X-Search-Backend'], 'database')
+        self.assertEqual(response.data, [{'id': self.startup.id, 'company_name': 'Green Energy', 'stage': 'mvp'}])
+
+        response = self.client.get(reverse('startup-search'), {'q': 'green', 'search_after': 'WzEuMCwgMV0'})
+        self.assertEqual(response.data, [])
@@ -0,0 +1,184 @@
+import json
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from elasticsearch.exceptions import ConnectionError as ESConnectionError
+
+from search import indexing
+from startups.models import Startup
+from tests.factories import StartupFactory
+from utils.redis_client import get_redis
+
+TEST_QUEUE = {
+    'key_prefix': 'test:search:index',
+    'batch_size': 2,
+    'max_batches': 10,
+    'max_attempts': 2,
+    'schedule_delay': 2,
+}
+
+
+@override_settings(SEARCH_INDEX_QUEUE=TEST_QUEUE)
+class IndexQueueTests(TestCase):
+    """Tests for the Redis-backed Elasticsearch indexing queue."""
+
+    def setUp(self):
+        self.redis = get_redis()
+        self.keys = indexing._keys(indexing.get_queue_config())
+        self.addCleanup(self.redis.delete, *self.keys.values())
+        self.redis.delete(*self.keys.values())
+
+    def _save_startups(self, count):
+        with patch("search.indexing.schedule_drain"), self.captureOnCommitCallbacks(execute=True):
+            return [StartupFactory() for _ in range(count)]
+
+    def test_save_enqueues_after_commit_without_calling_elasticsearch(self):
+        with patch("search.indexing.bulk") as mock_bulk, patch("search.indexing.schedule_drain"):
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                startup = StartupFactory()
+            self.assertEqual(self.redis.zcard(self.keys['queue']), 0)
+            for callback in callbacks:
+                callback()
+        mock_bulk.assert_not_called()
+        self.assertIsNotNone(
+            self.redis.zscore(self.keys['queue'], indexing.make_key(Startup, startup.pk))
+        )
+
+    def test_repeated_saves_collapse_into_one_entry(self):
+        startup = self._save_startups(1)[0]
+        with patch("search.indexing.schedule_drain"), self.captureOnCommitCallbacks(execute=True):
+            startup.description = "Updated"
+            startup.save()
+        startup_keys = [
+            key for key in self.redis.zrange(self.keys['queue'], 0, -1)
+            if key.startswith("startups.startup:")
+        ]
+        self.assertEqual(startup_keys, [indexing.make_key(Startup, startup.pk)])
+
+    @patch("search.indexing.bulk", return_value=(0, []))
+    def test_drain_sends_one_bulk_request_per_batch(self, mock_bulk):
+        startups = self._save_startups(3)
+        self.redis.delete(self.keys['queue'])
+        with patch("search.indexing.schedule_drain"):
+            indexing._push([indexing.make_key(Startup, s.pk) for s in startups])
+
+        stats = indexing.drain_index_queue()
+
+        self.assertEqual(mock_bulk.call_count, 2)
+        self.assertEqual(stats['batches'], 2)
+        self.assertGreaterEqual(stats['indexed'], 3)
+        self.assertEqual(self.redis.zcard(self.keys['queue']), 0)
+        actions = mock_bulk.call_args_list[0].args[1]
+        self.assertTrue(all(action['_op_type'] == 'index' for action in actions))
+
+    @patch("search.indexing.bulk", return_value=(0, []))
+    def test_deleted_rows_become_delete_actions(self, mock_bulk):
+        startup = self._save_startups(1)[0]
+        self.redis.delete(self.keys['queue'])
+        with patch("search.indexing.schedule_drain"), self.captureOnCommitCallbacks(execute=True):
+            startup.delete()
+
+        stats = indexing.drain_index_queue()
+
+        actions = mock_bulk.call_args.args[1]
+        self.assertTrue(actions)
+        self.assertTrue(all(action['_op_type'] == 'delete' for action in actions))
+        self.assertEqual(stats['deleted'], len(actions))
+
+    def test_failures_are_retried_then_dead_lettered(self):
+        startup = self._save_startups(1)[0]
+        self.redis.delete(self.keys['queue'])
+        key = indexing.make_key(Startup, startup.pk)
+        self.redis.zadd(self.keys['queue'], {key: 1.0})
+        errors = [
+            {'index': {'_index': 'startups', '_id': str(startup.pk), 'status': 400, 'error': 'mapper_parsing_exception'}},
+        ]
+
+        with patch("search.indexing.bulk", return_value=(0, errors)):
+            first = indexing.drain_index_queue()
+            self.assertEqual(first['retried'], 1)
+            self.assertEqual(self.redis.zscore(self.keys['queue'], key), 1.0)
+            self.assertFalse(self.redis.exists(self.keys['processing']))
+            self.assertGreater(indexing.queue_lag(), 0)
+
+            second = indexing.drain_index_queue()
+
+        self.assertEqual(second['dead_lettered'], 1)
+        self.assertEqual(self.redis.zcard(self.keys['queue']), 0)
+        dead = json.loads(self.redis.lindex(self.keys['dead'], 0))
+        self.assertEqual(dead['key'], key)
+        self.assertIn("mapper_parsing_exception", dead['error'])
+
+        self.assertEqual(indexing.requeue_dead_letters(), 1)
+        self.assertEqual(indexing.queue_stats()['pending'], 1)
+
+    @patch("search.indexing.elasticsearch_breaker")
+    def test_outages_do_not_count_as_attempts(self, mock_breaker):
+        mock_breaker.is_open.return_value = False
+        startups = self._save_startups(3)
+        self.redis.delete(self.keys['queue'])
+        self.redis.zadd(self.keys['queue'], {indexing.make_key(Startup, s.pk): 1.0 for s in startups})
+
+        with patch("search.indexing.bulk", side_effect=ESConnectionError("es down")) as mock_bulk:
+            for _ in range(TEST_QUEUE['max_attempts'] + 1):
+                stats = indexing.drain_index_queue()
+
+        self.assertTrue(stats['outage'])
+        self.assertEqual(stats['batches'], 1)
+        self.assertEqual(mock_bulk.call_count, TEST_QUEUE['max_attempts'] + 1)
+        self.assertEqual(self.redis.zcard(self.keys['queue']), 3)
+        self.assertEqual(self.redis.hlen(self.keys['attempts']), 0)
+        self.assertEqual(self.redis.llen(self.keys['dead']), 0)
+        mock_breaker.record_failure.assert_called()
+
+        mock_breaker.is_open.return_value = True
+        with patch("search.indexing.bulk") as mock_bulk:
+            self.assertTrue(indexing.drain_index_queue()['outage'])
+        mock_bulk.assert_not_called()
+
+    @patch("search.indexing.bulk", return_value=(0, []))
+    def test_run_that_outlived_its_lock_leaves_the_next_lock_alone(self, mock_bulk):
+        startup = self._save_startups(1)[0]
+        self.redis.zadd(self.keys['queue'], {indexing.make_key(Startup, startup.pk): 1.0})
+
+        def lock_expired_and_taken(*args, **kwargs):
+            self.redis.set(self.keys['lock'], 'next-run')
+            return (0, [])
+
+        mock_bulk.side_effect = lock_expired_and_taken
+        indexing.drain_index_queue()
+
+        self.assertEqual(self.redis.get(self.keys['lock']), 'next-run')
+
+    @patch("search.indexing.bulk", return_value=(0, []))
+    def test_keys_left_in_processing_are_recovered(self, mock_bulk):
+        startups = self._save_startups(2)
+        self.redis.delete(self.keys['queue'])
+        first, second = (indexing.make_key(Startup, s.pk) for s in startups)
+        self.redis.zadd(self.keys['processing'], {first: 1.0})
+        self.redis.zadd(self.keys['queue'], {first: 5.0, second: 2.0})
+
+        self.redis.set(self.keys['lock'], '1')
+        self.assertEqual(indexing.drain_index_queue()['batches'], 0)
+        self.redis.delete(self.keys['lock'])
+
+        stats = indexing.drain_index_queue()
+
+        self.assertEqual(stats['batches'], 1)
+        self.assertEqual({action['_id'] for action in mock_bulk.call_args.args[1]}, {s.pk for s in startups})
+        self.assertEqual(self.redis.zcard(self.keys['queue']), 0)
+        self.assertFalse(self.redis.exists(self.keys['processing']))
+
+    def test_missing_document_on_delete_is_not_an_error(self):
+        startup = self._save_startups(1)[0]
+        startup_id = startup.pk
+        self.redis.delete(self.keys['queue'])
+        with patch("search.indexing.schedule_drain"), self.captureOnCommitCallbacks(execute=True):
+            startup.delete()
+        errors = [
+            {'delete': {'_index': 'startups', '_id': str(startup_id), 'status': 404}},
+        ]
+        with patch("search.indexing.bulk", return_value=(0, errors)):
+            stats = indexing.drain_index_queue()
+        self.assertEqual(stats['retried'], 0)
+        self.assertEqual(self.redis.hlen(self.keys['attempts']), 0)
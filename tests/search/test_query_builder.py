@@ -0,0 +1,64 @@
+from unittest.mock import patch
+
+from django.http import QueryDict
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from elasticsearch_dsl import Search
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APITestCase
+
+from search.query_builder import INFIX, MATCH, FilterQueryBuilder
+from tests.factories import UserFactory
+from tests.search.test_facets import _fake_execute
+
+FILTERS = {
+    'startup.company_name': {'field': 'startup.company_name'},
+    'title': {'field': 'title.ngram', 'type': INFIX},
+    'summary': {'field': 'summary', 'type': MATCH},
+}
+
+
+class FilterQueryBuilderTests(SimpleTestCase):
+    def setUp(self):
+        self.builder = FilterQueryBuilder(FILTERS, ('title', 'description'), {'facets'})
+
+    def test_compiles_terms_phrase_and_search_queries(self):
+        params = QueryDict('startup.company_name=A&startup.company_name=B&title=olar&summary=big+data&search=ai')
+        self.assertEqual(self.builder.build(params).to_dict(), {'bool': {
+            'filter': [
+                {'terms': {'startup.company_name': ['A', 'B']}},
+                {'match_phrase': {'title.ngram': 'olar'}},
+                {'match': {'summary': {'query': 'big data', 'operator': 'and'}}},
+            ],
+            'must': [{'multi_match': {'query': 'ai', 'fields': ['title', 'description']}}],
+        }})
+
+    def test_no_params_and_blank_values_build_nothing(self):
+        self.assertIsNone(self.builder.build(QueryDict('title=&facets=true')))
+
+    def test_rejects_unknown_params_and_short_infix_values(self):
+        with self.assertRaises(ValidationError) as unknown:
+            self.builder.build(QueryDict('owner=1'))
+        self.assertIn('Invalid filter field(s): owner', unknown.exception.detail['error'])
+        with self.assertRaises(ValidationError) as short:
+            self.builder.build(QueryDict('title=ab'))
+        self.assertIn('title', short.exception.detail)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class ProjectDocumentFilterTests(APITestCase):
+    def setUp(self):
+        self.client.force_authenticate(user=UserFactory())
+        self.url = reverse('project-document-list')
+
+    @patch.object(Search, 'execute', autospec=True, side_effect=_fake_execute)
+    def test_title_filter_uses_trigram_subfield_not_wildcard(self, mock_execute):
+        response = self.client.get(self.url, {'title': 'ealth', 'search': 'ai'})
+
+        self.assertEqual(response.status_code, 200, response.data)
+        body = mock_execute.call_args.args[0].to_dict()
+        self.assertNotIn('wildcard', str(body))
+        self.assertEqual(body['query']['bool']['filter'], [{'match_phrase': {'title.ngram': 'ealth'}}])
+
+    def test_short_title_filter_is_rejected(self):
+        self.assertEqual(self.client.get(self.url, {'title': 'ai'}).status_code, 400)
@@ -0,0 +1,101 @@
+from unittest.mock import MagicMock, patch
+
+from django.test import TestCase
+
+from search import reindex
+from startups.documents import StartupDocument
+from startups.models import Startup
+from tests.factories import StartupFactory
+
+
+def _bulk_ok(client, actions, **kwargs):
+    for action in actions:
+        yield True, {'index': {'_id': action['_id']}}
+
+
+class ReindexTests(TestCase):
+    """Tests for the alias-based zero-downtime index rebuild."""
+
+    def setUp(self):
+        self.startups = [StartupFactory() for _ in range(3)]
+        self.client = MagicMock()
+        self.client.indices.get.return_value = {'startups_v1': {}, 'startups_v2': {}}
+        self.client.indices.exists_alias.return_value = True
+        self.client.indices.get_alias.return_value = {'startups_v2': {'aliases': {'startups': {}}}}
+        self.client.count.return_value = {'count': 3}
+        patcher = patch("search.reindex.connections.get_connection", return_value=self.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch("search.reindex.Index.create")
+        self.mock_create = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_next_version_name(self):
+        self.assertEqual(reindex.next_version_name(self.client, 'startups'), 'startups_v3')
+        self.client.indices.get.return_value = {}
+        self.assertEqual(reindex.next_version_name(self.client, 'startups'), 'startups_v1')
+
+    def test_stream_actions_uses_keyset_chunks(self):
+        doc = StartupDocument()
+        with self.assertNumQueries(2):
+            chunks = list(reindex.stream_actions(doc, 'startups_v9', chunk_size=2))
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 1])
+        ids = [action['_id'] for chunk in chunks for action in chunk]
+        self.assertEqual(ids, sorted(s.pk for s in self.startups))
+        self.assertTrue(all(action['_index'] == 'startups_v9' for chunk in chunks for action in chunk))
+
+    @patch("search.reindex.parallel_bulk", side_effect=_bulk_ok)
+    @patch("search.reindex.registered_indexes", return_value={'startups': [StartupDocument]})
+    def test_rebuild_swaps_alias_and_drops_previous(self, _mock_registered, mock_bulk):
+        with patch("search.reindex.indexing.enqueue") as mock_enqueue:
+            stats = reindex.rebuild_index('startups', chunk_size=2, workers=2)
+
+        self.assertEqual(stats['index'], 'startups_v3')
+        self.assertEqual(stats['documents'], 3)
+        self.assertEqual(mock_bulk.call_count, 1)
+        self.client.indices.update_aliases.assert_called_once_with(body={'actions': [
+            {'remove': {'index': 'startups_v2', 'alias': 'startups'}},
+            {'add': {'index': 'startups_v3', 'alias': 'startups'}},
+        ]})
+        self.client.indices.delete.assert_called_once_with(index='startups_v2', ignore=[404])
+        mock_enqueue.assert_called()
+
+    @patch("search.reindex.registered_indexes", return_value={'startups': [StartupDocument]})
+    def test_rows_deleted_during_rebuild_are_requeued(self, _mock_registered):
+        deleted = self.startups[0]
+
+        def bulk_then_delete(client, actions, **kwargs):
+            for item in _bulk_ok(client, actions, **kwargs):
+                Startup.objects.filter(pk=deleted.pk).delete()
+                yield item
+
+        with patch("search.reindex.parallel_bulk", side_effect=bulk_then_delete), \
+                patch("search.reindex.indexing.enqueue") as mock_enqueue:
+            stats = reindex.rebuild_index('startups')
+
+        self.assertEqual(stats['deleted_during_rebuild'], 1)
+        mock_enqueue.assert_any_call(Startup, [deleted.pk])
+
+    @patch("search.reindex.parallel_bulk", side_effect=_bulk_ok)
+    @patch("search.reindex.registered_indexes", return_value={'startups': [StartupDocument]})
+    def test_legacy_concrete_index_is_replaced_atomically(self, _mock_registered, _mock_bulk):
+        self.client.indices.exists_alias.return_value = False
+        self.client.indices.exists.return_value = True
+
+        reindex.rebuild_index('startups')
+
+        self.client.indices.update_aliases.assert_called_once_with(body={'actions': [
+            {'remove_index': {'index': 'startups'}},
+            {'add': {'index': 'startups_v3', 'alias': 'startups'}},
+        ]})
+
+    @patch("search.reindex.parallel_bulk", side_effect=_bulk_ok)
+    @patch("search.reindex.registered_indexes", return_value={'startups': [StartupDocument]})
+    def test_count_mismatch_keeps_alias_and_deletes_new_index(self, _mock_registered, _mock_bulk):
+        self.client.count.return_value = {'count': 2}
+
+        with self.assertRaises(reindex.ReindexError):
+            reindex.rebuild_index('startups')
+
+        self.client.indices.update_aliases.assert_not_called()
+        self.client.indices.delete.assert_called_once_with(index='startups_v3', ignore=[404])
@@ -0,0 +1,97 @@
+import json
+from unittest.mock import MagicMock, patch
+
+from django.test import TestCase, override_settings
+
+from search import indexing
+from startups.models import Startup
+from tests.factories import IndustryFactory, StartupFactory
+from tests.search.test_index_queue import TEST_QUEUE
+from utils.redis_client import get_redis
+
+
+@override_settings(SEARCH_INDEX_QUEUE=TEST_QUEUE)
+class RelatedUpdateTests(TestCase):
+    """Tests for applying related-row edits with update_by_query."""
+
+    def setUp(self):
+        self.redis = get_redis()
+        self.keys = indexing._keys(indexing.get_queue_config())
+        cleanup = [*self.keys.values(), f"{self.keys['related']}:processing"]
+        self.redis.delete(*cleanup)
+        self.addCleanup(self.redis.delete, *cleanup)
+        with patch("search.indexing.schedule_drain"), self.captureOnCommitCallbacks(execute=True):
+            self.industry = IndustryFactory(name='Fintech')
+            self.startups = [StartupFactory(industry=self.industry) for _ in range(3)]
+        self.redis.delete(*self.keys.values())
+
+    def _related_entries(self):
+        return {key: json.loads(raw) for key, raw in self.redis.hgetall(self.keys['related']).items()}
+
+    def test_industry_rename_queues_one_entry_without_listing_startups(self):
+        with patch("search.indexing.schedule_drain"), self.captureOnCommitCallbacks(execute=True):
+            self.industry.name = 'Payments'
+            with self.assertNumQueries(1):
+                self.industry.save()
+            self.industry.name = 'Payments & Banking'
+            self.industry.save()
+
+        self.assertEqual(self.redis.zcard(self.keys['queue']), 0)
+        self.assertEqual(self._related_entries(), {
+            f'startups|industry|{self.industry.pk}': {
+                'index': 'startups', 'field': 'industry', 'id': self.industry.pk,
+                'value': {'id': self.industry.pk, 'name': 'Payments & Banking'},
+            },
+        })
+
+    def test_startup_save_updates_embedded_startup_in_projects(self):
+        startup = self.startups[0]
+        with patch("search.indexing.schedule_drain"), self.captureOnCommitCallbacks(execute=True):
+            startup.company_name = 'Renamed'
+            startup.save()
+
+        entry = self._related_entries()[f'projects|startup|{startup.pk}']
+        self.assertEqual(entry['value'], {'id': startup.pk, 'company_name': 'Renamed'})
+
+    def test_saves_without_embedded_changes_queue_nothing(self):
+        startup = Startup.objects.get(pk=self.startups[0].pk)
+        with patch("search.indexing.schedule_drain"), self.captureOnCommitCallbacks(execute=True):
+            startup.description = 'Only the description changed'
+            startup.save()
+            startup.save(update_fields=['updated_at'])
+            Startup.objects.only('id').get(pk=startup.pk).save(update_fields=['updated_at'])
+            self.industry.save()
+
+        self.assertEqual(self._related_entries(), {})
+        self.assertEqual(self.redis.zcard(self.keys['queue']), 1)
+
+    def test_drain_applies_entries_with_update_by_query(self):
+        with patch("search.indexing.schedule_drain"), self.captureOnCommitCallbacks(execute=True):
+            self.industry.name = 'Payments'
+            self.industry.save()
+        es = MagicMock()
+        es.update_by_query.return_value = {'updated': 3}
+
+        with patch("search.indexing.connections.get_connection", return_value=es):
+            stats = indexing.drain_index_queue()
+
+        self.assertEqual(stats['related_updated'], 3)
+        kwargs = es.update_by_query.call_args.kwargs
+        self.assertEqual(kwargs['index'], 'startups')
+        self.assertEqual(kwargs['body']['query'], {'term': {'industry.id': self.industry.pk}})
+        self.assertEqual(kwargs['body']['script']['params']['value'], {'id': self.industry.pk, 'name': 'Payments'})
+        self.assertNotIn('refresh', kwargs)
+        self.assertEqual(self._related_entries(), {})
+
+    def test_failed_entry_is_requeued(self):
+        with patch("search.indexing.schedule_drain"), self.captureOnCommitCallbacks(execute=True):
+            self.industry.name = 'Payments'
+            self.industry.save()
+        es = MagicMock()
+        es.update_by_query.side_effect = ConnectionError("es down")
+
+        with patch("search.indexing.connections.get_connection", return_value=es):
+            stats = indexing.drain_index_queue()
+
+        self.assertEqual(stats['related_failed'], 1)
+        self.assertEqual(len(self._related_entries()), 1)
@@ -0,0 +1,91 @@
+from unittest.mock import patch
+
+from django.http import QueryDict
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from elasticsearch.exceptions import ConnectionError
+from elasticsearch_dsl import Search
+from rest_framework.test import APITestCase
+
+from search import indexing, result_cache
+from search.circuit_breaker import elasticsearch_breaker
+from tests.factories import StartupFactory, UserFactory
+from tests.search.test_facets import _fake_execute
+from tests.search.test_index_queue import TEST_QUEUE
+from utils.redis_client import get_redis
+
+TEST_CACHE = {'key_prefix': 'test:search:results', 'ttl': 60, 'enabled': True}
+
+
+def _clear_cache():
+    redis = get_redis()
+    keys = list(redis.scan_iter(f"{TEST_CACHE['key_prefix']}:*"))
+    if keys:
+        redis.delete(*keys)
+
+
+class NormalizeParamsTests(SimpleTestCase):
+    def test_sorts_keys_drops_blanks_and_keeps_value_order(self):
+        params = QueryDict('ordering=-title&ordering=id&search=+solar+&status=&b=1')
+        self.assertEqual(
+            result_cache.normalize_params(params),
+            [['b', ['1']], ['ordering', ['-title', 'id']], ['search', ['solar']]],
+        )
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, SEARCH_RESULT_CACHE=TEST_CACHE)
+class SearchResultCacheAPITests(APITestCase):
+    """Tests for serving search pages from the Redis result cache."""
+
+    def setUp(self):
+        _clear_cache()
+        self.addCleanup(_clear_cache)
+        self.client.force_authenticate(user=UserFactory())
+        self.url = reverse('project-document-list')
+
+    @patch.object(Search, 'execute', autospec=True, side_effect=_fake_execute)
+    def test_repeated_query_is_served_from_cache(self, mock_execute):
+        first = self.client.get(f'{self.url}?status=active&facets=true')
+        second = self.client.get(f'{self.url}?facets=true&status=active')
+
+        self.assertEqual(mock_execute.call_count, 1)
+        self.assertEqual(first['X-Search-Cache'], 'miss')
+        self.assertEqual(second['X-Search-Cache'], 'hit')
+        self.assertEqual(second.json(), first.json())
+
+    @patch.object(Search, 'execute', autospec=True, side_effect=_fake_execute)
+    def test_generation_bump_invalidates_cached_pages(self, mock_execute):
+        self.client.get(self.url, {'status': 'active'})
+        result_cache.bump_generation()
+        response = self.client.get(self.url, {'status': 'active'})
+
+        self.assertEqual(mock_execute.call_count, 2)
+        self.assertEqual(response['X-Search-Cache'], 'miss')
+
+    @patch.object(Search, 'execute', side_effect=ConnectionError('N/A', 'down', None))
+    def test_database_fallback_is_not_cached(self, mock_execute):
+        self.addCleanup(elasticsearch_breaker.reset)
+        for _ in range(2):
+            response = self.client.get(reverse('startup-search'), {'q': 'solar'})
+            self.assertEqual(response['X-Search-Backend'], 'database')
+            self.assertNotIn('X-Search-Cache', response)
+
+
+@override_settings(SEARCH_INDEX_QUEUE=TEST_QUEUE, SEARCH_RESULT_CACHE=TEST_CACHE)
+class GenerationBumpTests(TestCase):
+    def setUp(self):
+        keys = indexing._keys(indexing.get_queue_config())
+        self.addCleanup(get_redis().delete, *keys.values())
+        _clear_cache()
+        self.addCleanup(_clear_cache)
+
+    def test_drain_bumps_generation_only_after_writes(self):
+        with patch("search.indexing.schedule_drain"), self.captureOnCommitCallbacks(execute=True):
+            StartupFactory()
+
+        with patch("search.indexing.bulk", return_value=(1, [])) as mock_bulk:
+            indexing.drain_index_queue()
+            indexing.drain_index_queue()
+
+        self.assertEqual(mock_bulk.call_args.kwargs['refresh'], 'wait_for')
+        self.assertEqual(result_cache.get_generation(), 1)
@@ -70,12 +70,14 @@ class SearchTests(APITestCase):
             self.project.save()
 
     @staticmethod
-    def _make_hit(doc_id):
-        """ES hit supporting both hit.id and hit.meta.id access."""
+    def _make_hit(doc_id, source=None, sort=None):
+        """ES hit supporting hit.id, hit.meta.id/sort and hit.to_dict() access."""
         hit = mock.Mock()
         hit.id = str(doc_id)
         hit.meta = mock.Mock()
         hit.meta.id = str(doc_id)
+        hit.meta.sort = sort or [1.0, doc_id]
+        hit.to_dict.return_value = {"id": doc_id, **(source or {})}
         return hit
 
     def _chainable_search(self, search_obj, hits, qs=None):
@@ -151,3 +153,65 @@ class SearchTests(APITestCase):
         resp = self.client.get(url, {"q": ""})
         self.assertEqual(resp.status_code, 200, resp.data)
         self.assertEqual(len(resp.data), 0, resp.data)
+
+    def test_startup_search_serializes_from_source_in_relevance_order(self):
+        other = Startup.objects.create(
+            user=User.objects.create_user(
+                email="other@example.com", password="password123",
+                role=UserRole.objects.get(role=UserRole.Role.USER), is_active=True,
+            ),
+            company_name="Other Startup",
+            description="Second",
+            stage="seed",
+            founded_year=2021,
+            industry=self.industry,
+            location=self.location,
+            email="hello@other-startup.com",
+            team_size=3,
+        )
+        hits = [
+            self._make_hit(other.id, {"company_name": "Other Startup", "stage": "seed"}),
+            self._make_hit(self.startup.id, {"company_name": "Test Startup", "stage": "seed"}),
+        ]
+        with mock.patch.object(sv.StartupDocument, "search") as search_fn:
+            self._chainable_search(search_fn.return_value, hits)
+            with self.assertNumQueries(0):
+                resp = self.client.get(reverse("startup-search"), {"q": "startup"})
+
+        self.assertEqual(resp.status_code, 200, resp.data)
+        self.assertEqual([row["id"] for row in resp.data], [other.id, self.startup.id])
+        self.assertEqual(resp.data[0]["company_name"], "Other Startup")
+
+    def test_project_search_hydrates_only_missing_fields(self):
+        hit = self._make_hit(self.project.id, {"title": "Indexed title", "status": "active"})
+        with mock.patch.object(sv.ProjectDocument, "search") as search_fn:
+            self._chainable_search(search_fn.return_value, [hit])
+            with self.assertNumQueries(1):
+                resp = self.client.get(reverse("project-search"), {"q": "health"})
+
+        self.assertEqual(resp.status_code, 200, resp.data)
+        self.assertEqual(resp.data[0]["title"], "Indexed title")
+        self.assertEqual(resp.data[0]["funding_goal"], "10000.00")
+
+    def test_search_after_pagination(self):
+        hit = self._make_hit(self.project.id, {"title": "Health AI", "status": "active", "funding_goal": 10000.0},
+                             sort=[2.5, self.project.id])
+        with mock.patch.object(sv.ProjectDocument, "search") as search_fn:
+            search_obj = search_fn.return_value
+            self._chainable_search(search_obj, [hit])
+            resp = self.client.get(reverse("project-search"), {"q": "health", "size": 1})
+            self.assertIn('rel="next"', resp["Link"])
+            cursor = sv.DocumentSearchView.encode_cursor([2.5, self.project.id])
+            self.assertIn(f"search_after={cursor}", resp["Link"])
+
+            self.client.get(reverse("project-search"), {"q": "health", "search_after": cursor})
+            extra_kwargs = search_obj.extra.call_args.kwargs
+            self.assertEqual(extra_kwargs["search_after"], [2.5, self.project.id])
+            search_obj.__getitem__.assert_called_with(slice(0, 10))
+
+    def test_invalid_pagination_params(self):
+        url = reverse("project-search")
+        self.assertEqual(self.client.get(url, {"q": "x", "size": 0}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"q": "x", "size": "abc"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"q": "x", "from": 20000}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"q": "x", "search_after": "%%%"}).status_code, 400)
@@ -0,0 +1,47 @@
+from unittest.mock import patch
+
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from tests.factories import CategoryFactory, ProjectFactory, StartupFactory, UserFactory
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+@patch("users.permissions.IsStartupUser.has_permission", return_value=True)
+class StartupListSerializerTests(APITestCase):
+    """Listings use the flat serializer; retrieve keeps nested projects."""
+
+    def setUp(self):
+        self.client.force_authenticate(user=UserFactory())
+        category = CategoryFactory()
+        self.startups = [StartupFactory() for _ in range(3)]
+        for count, startup in enumerate(self.startups):
+            for _ in range(count):
+                ProjectFactory(startup=startup, category=category)
+
+    def test_list_is_flat_with_project_counts(self, mock_permission):
+        response = self.client.get(reverse('startup-list'))
+
+        self.assertEqual(response.status_code, 200)
+        rows = {row['id']: row for row in response.data}
+        self.assertEqual({pk: row['projects_count'] for pk, row in rows.items()},
+                         {startup.pk: count for count, startup in enumerate(self.startups)})
+        row = rows[self.startups[0].pk]
+        self.assertNotIn('projects', row)
+        self.assertEqual(row['industry_name'], self.startups[0].industry.name)
+        self.assertEqual(row['country'], 'US')
+
+    def test_list_query_count_does_not_depend_on_projects(self, mock_permission):
+        StartupFactory.create_batch(5)
+        # ETag validator aggregate + the page itself
+        with self.assertNumQueries(2):
+            self.client.get(reverse('startup-list'))
+
+    @patch("users.permissions.IsStartupUser.has_object_permission", return_value=True)
+    def test_retrieve_keeps_nested_projects(self, mock_object_permission, mock_permission):
+        startup = self.startups[2]
+        response = self.client.get(reverse('startup-detail', args=[startup.pk]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['projects']), 2)
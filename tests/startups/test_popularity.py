@@ -0,0 +1,141 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from investors.models import ProjectFollow, SavedStartup
+from projects.models import Project, ProjectDailyStats
+from startups import popularity
+from startups.models import Startup, StartupDailyStats
+from tests.test_base_case import BaseAPITestCase
+from utils.redis_client import get_redis
+
+TEST_POPULARITY = {
+    'key_prefix': 'test:popularity',
+    'enabled': True,
+    'batch_size': 2,
+    'score_window_days': 7,
+    'weights': {'views': 1, 'saves': 5, 'follows': 10},
+}
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, POPULARITY=TEST_POPULARITY)
+@patch('users.permissions.HasActiveCompanyAccount.has_permission', return_value=True)
+class PopularityTests(BaseAPITestCase):
+    """Tests for the Redis popularity counters and their daily rollup."""
+
+    def setUp(self):
+        super().setUp()
+        self.redis = get_redis()
+        self.keys = popularity._keys(popularity.get_popularity_config())
+        self.addCleanup(self.redis.delete, *self.keys.values())
+        self.redis.delete(*self.keys.values())
+
+    def pending(self):
+        return {field: int(count) for field, count in self.redis.hgetall(self.keys['pending']).items()}
+
+    def record(self, metric, *targets):
+        with self.captureOnCommitCallbacks(execute=True):
+            popularity.record(metric, *targets)
+
+    def test_events_are_counted_in_redis(self, mock_permission):
+        today = timezone.now().date()
+        with patch('search.indexing.schedule_drain'), self.captureOnCommitCallbacks(execute=True):
+            self.client.force_authenticate(user=self.investor_user)
+            self.client.post(reverse('viewed-startup-create', args=[self.startup.pk]))
+            SavedStartup.objects.create(investor=self.investor1, startup=self.startup)
+            ProjectFollow.objects.create(investor=self.investor1, project=self.project)
+            self.client.force_authenticate(user=self.startup_user)
+            self.client.get(reverse('project-detail', args=[self.project.pk]))
+
+        self.assertEqual(self.pending(), {
+            popularity.make_field(Startup, self.startup.pk, 'views', today): 1,
+            popularity.make_field(Startup, self.startup.pk, 'saves', today): 1,
+            popularity.make_field(Startup, self.startup.pk, 'follows', today): 1,
+            popularity.make_field(Project, self.project.pk, 'follows', today): 1,
+            popularity.make_field(Project, self.project.pk, 'views', today): 1,
+        })
+        self.assertFalse(StartupDailyStats.objects.exists())
+
+    def test_roll_up_adds_to_daily_rows_and_refreshes_totals(self, mock_permission):
+        yesterday = timezone.now().date() - timedelta(days=1)
+        StartupDailyStats.objects.create(startup=self.startup, date=timezone.now().date(), views=4)
+        StartupDailyStats.objects.create(startup=self.startup, date=yesterday, saves=1)
+        for _ in range(3):
+            self.record('views', (Startup, self.startup.pk), (Project, self.project.pk))
+        self.record('follows', (Startup, self.startup.pk), (Project, self.project.pk))
+        self.record('views', (Startup, 999999))
+
+        stats = popularity.roll_up()
+
+        self.assertEqual(stats['events'], 9)
+        self.assertEqual(stats['batches'], 3)
+        self.assertEqual(self.pending(), {})
+        self.assertFalse(self.redis.exists(self.keys['processing']))
+        today = StartupDailyStats.objects.get(startup=self.startup, date=timezone.now().date())
+        self.assertEqual((today.views, today.saves, today.follows), (7, 0, 1))
+        self.assertEqual(ProjectDailyStats.objects.get(project=self.project).views, 3)
+
+        startup = Startup.objects.get(pk=self.startup.pk)
+        self.assertEqual((startup.total_views, startup.total_saves, startup.total_follows), (7, 1, 1))
+        self.assertEqual(startup.popularity_score, 7 + 5 + 10)
+        self.assertIsNotNone(startup.popularity_updated_at)
+        project = Project.objects.get(pk=self.project.pk)
+        self.assertEqual((project.total_views, project.total_follows), (3, 1))
+        self.assertEqual(popularity.roll_up()['events'], 0)
+
+    def test_only_one_roll_up_runs_at_a_time(self, mock_permission):
+        self.record('views', (Startup, self.startup.pk))
+        self.redis.set(self.keys['lock'], '1')
+
+        self.assertEqual(popularity.roll_up()['events'], 0)
+        self.assertEqual(len(self.pending()), 1)
+
+    def test_score_decays_when_buckets_leave_the_window(self, mock_permission):
+        now = timezone.now()
+        StartupDailyStats.objects.create(startup=self.startup, date=now.date() - timedelta(days=3), follows=1)
+        StartupDailyStats.objects.create(startup=self.startup, date=now.date() - timedelta(days=7), views=50)
+        Startup.objects.filter(pk=self.startup.pk).update(popularity_score=60, popularity_updated_at=now - timedelta(days=1))
+
+        stats = popularity.roll_up(now=now)
+
+        self.assertEqual(stats['startups'], 1)
+        startup = Startup.objects.get(pk=self.startup.pk)
+        self.assertEqual(startup.popularity_score, 10)
+        self.assertEqual(startup.total_views, 50)
+        self.assertEqual(popularity.roll_up(now=now)['startups'], 0)
+
+    def test_startup_payloads_expose_totals_and_stats(self, mock_permission):
+        StartupDailyStats.objects.create(startup=self.startup, date=timezone.now().date(), views=2, saves=1)
+        StartupDailyStats.objects.create(startup=self.startup, date=timezone.now().date() - timedelta(days=40), views=5)
+        Startup.objects.filter(pk=self.startup.pk).update(total_views=7, total_saves=1, popularity_score=7)
+        Project.objects.filter(pk=self.project.pk).update(total_views=3)
+        self.client.force_authenticate(user=self.startup_user)
+
+        detail = self.client.get(reverse('startup-detail', args=[self.startup.pk]))
+        self.assertEqual(detail.data['popularity'], {'views': 7, 'saves': 1, 'follows': 0, 'score': 7.0})
+
+        response = self.client.get(reverse('startup-stats', args=[self.startup.pk]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['totals']['views'], 7)
+        self.assertEqual(
+            [(day['views'], day['saves']) for day in response.data['daily']],
+            [(2, 1)],
+        )
+        self.assertEqual(response.data['projects'][0]['views'], 3)
+        self.assertEqual(
+            self.client.get(reverse('startup-stats', args=[self.startup.pk]), {'days': 0}).status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+
+    def test_startup_save_keeps_rolled_up_totals(self, mock_permission):
+        stale = Startup.objects.get(pk=self.startup.pk)
+        Startup.objects.filter(pk=self.startup.pk).update(total_views=5, popularity_score=5)
+
+        stale.description = 'Updated'
+        stale.save()
+
+        self.assertEqual(Startup.objects.values_list('total_views', 'popularity_score').get(pk=self.startup.pk), (5, 5))
@@ -103,3 +103,36 @@ class StartupSerializerTests(BaseAPITestCase):
         errors = serializer.errors['social_links']
         self.assertIn("Invalid domain for platform 'linkedin'", errors.get('linkedin', ''))
         self.assertIn("Platform 'unknown' is not supported.", errors.get('unknown', ''))
+
+    def test_case_insensitive_duplicates_are_checked_in_one_query(self):
+        """
+        Test that a differently-cased existing company_name and email are both
+        rejected, using a single query for the uniqueness check.
+        """
+        data = {
+            'company_name': self.startup.company_name.upper(),
+            'email': self.startup.email.upper(),
+            'team_size': 5,
+            'user': self.user.pk,
+            'industry': self.industry.pk,
+            'location': self.location.pk,
+            'founded_year': 2020,
+        }
+        serializer = StartupSerializer(data=data)
+        # industry, location, user lookups + the user's one-to-one check + one duplicate query
+        with self.assertNumQueries(5):
+            self.assertFalse(serializer.is_valid())
+
+        self.assertEqual(serializer.errors['company_name'], ["Company with this name already exists."])
+        self.assertEqual(serializer.errors['email'], ["Company with this email already exists."])
+
+    def test_update_does_not_conflict_with_itself(self):
+        """
+        Test that updating a startup with its own name and email in another case is allowed.
+        """
+        data = {
+            'company_name': self.startup.company_name.lower(),
+            'email': self.startup.email.upper(),
+        }
+        serializer = StartupSerializer(self.startup, data=data, partial=True)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
@@ -0,0 +1,103 @@
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from tests.factories import CategoryFactory, InvestorFactory, ProjectFactory, StartupFactory, UserFactory
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+@patch("users.permissions.HasActiveCompanyAccount.has_permission", return_value=True)
+class ConditionalGetTests(APITestCase):
+    """Tests for ETag / Last-Modified handling on detail and list endpoints."""
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.client.force_authenticate(user=self.user)
+        self.startup = StartupFactory(user=self.user)
+        self.category = CategoryFactory()
+        self.project = ProjectFactory(startup=self.startup, category=self.category)
+
+    def _revalidate(self, url, response, **params):
+        return self.client.get(url, params, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def test_project_detail_returns_304_without_serializing(self, mock_permission):
+        url = reverse('project-detail', args=[self.project.pk])
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertIn('Last-Modified', first)
+
+        with patch('projects.serializers.ProjectReadSerializer.to_representation') as to_representation:
+            with self.assertNumQueries(2):
+                second = self._revalidate(url, first)
+        self.assertEqual(second.status_code, 304)
+        to_representation.assert_not_called()
+
+    def test_related_rows_change_the_etag(self, mock_permission):
+        url = reverse('project-detail', args=[self.project.pk])
+        first = self.client.get(url)
+
+        self.category.name = 'Renamed'
+        self.category.save()
+        second = self._revalidate(url, first)
+
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.data['category']['name'], 'Renamed')
+        self.assertNotEqual(second['ETag'], first['ETag'])
+
+    def test_subscription_changes_the_etag(self, mock_permission):
+        url = reverse('project-detail', args=[self.project.pk])
+        first = self.client.get(url)
+        investor = InvestorFactory()
+
+        self.client.force_authenticate(user=investor.user)
+        subscribed = self.client.post(
+            reverse('project-subscribe', kwargs={'project_id': self.project.pk}), {'amount': 100}, format='json',
+        )
+        self.assertEqual(subscribed.status_code, 201, subscribed.data)
+        self.client.force_authenticate(user=self.user)
+        second = self._revalidate(url, first)
+
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(Decimal(second.data['current_funding']), Decimal('100.00'))
+        self.assertNotEqual(second['ETag'], first['ETag'])
+
+    @patch("users.permissions.IsStartupUser.has_permission", return_value=True)
+    def test_startup_detail_tracks_nested_projects(self, *mocks):
+        url = reverse('startup-detail', args=[self.startup.pk])
+        first = self.client.get(url)
+        self.assertEqual(self._revalidate(url, first).status_code, 304)
+
+        self.project.delete()
+        self.assertEqual(self._revalidate(url, first).status_code, 200)
+
+    @patch("users.permissions.IsStartupUser.has_permission", return_value=True)
+    def test_object_permissions_are_checked_before_304(self, *mocks):
+        url = reverse('startup-detail', args=[self.startup.pk])
+        first = self.client.get(url)
+
+        self.client.force_authenticate(user=UserFactory())
+        self.assertEqual(self._revalidate(url, first).status_code, 403)
+
+    def test_list_etag_depends_on_filters_and_rows(self, mock_permission):
+        url = reverse('project-list')
+        first = self.client.get(url)
+        filtered = self.client.get(url, {'status': 'draft'})
+        self.assertNotEqual(first['ETag'], filtered['ETag'])
+        self.assertEqual(self._revalidate(url, first).status_code, 304)
+
+        ProjectFactory(startup=self.startup, category=self.category)
+        self.assertEqual(self._revalidate(url, first).status_code, 200)
+
+    def test_investor_detail_view(self, mock_permission):
+        investor = InvestorFactory()
+        url = f"/api/v1/investors/investors/{investor.pk}/"
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(self._revalidate(url, first).status_code, 304)
+
+        investor.team_size = 99
+        investor.save()
+        self.assertEqual(self._revalidate(url, first).status_code, 200)
@@ -0,0 +1,97 @@
+import json
+from unittest.mock import patch
+
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from common import detail_cache
+from projects.models import Project
+from tests.factories import CategoryFactory, ProjectFactory, StartupFactory, UserFactory
+from utils.redis_client import get_redis
+
+TEST_DETAIL_CACHE = {'key_prefix': 'test:detail', 'ttl': 60, 'enabled': True, 'coalesce_wait': 0.05}
+
+
+def _clear_cache():
+    redis = get_redis()
+    keys = list(redis.scan_iter(f"{TEST_DETAIL_CACHE['key_prefix']}:*"))
+    if keys:
+        redis.delete(*keys)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, DETAIL_CACHE=TEST_DETAIL_CACHE)
+@patch("users.permissions.HasActiveCompanyAccount.has_permission", return_value=True)
+@patch("users.permissions.IsStartupUser.has_permission", return_value=True)
+class DetailCacheTests(APITestCase):
+    """Tests for the Redis read-through cache on startup and project details."""
+
+    def setUp(self):
+        _clear_cache()
+        self.addCleanup(_clear_cache)
+        self.user = UserFactory()
+        self.client.force_authenticate(user=self.user)
+        self.category = CategoryFactory()
+        self.startup = StartupFactory(user=self.user)
+        self.project = ProjectFactory(startup=self.startup, category=self.category)
+        self.project_url = reverse('project-detail', args=[self.project.pk])
+        self.startup_url = reverse('startup-detail', args=[self.startup.pk])
+
+    def test_second_request_is_served_from_cache(self, *mocks):
+        first = self.client.get(self.project_url)
+        with patch('projects.serializers.ProjectReadSerializer.to_representation') as to_representation:
+            second = self.client.get(self.project_url)
+
+        to_representation.assert_not_called()
+        self.assertEqual(first['X-Detail-Cache'], 'miss')
+        self.assertEqual(second['X-Detail-Cache'], 'hit')
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(detail_cache.get_stats()['ProjectViewSet.retrieve'], {
+            'hit': 1, 'miss': 1, 'coalesced': 0, 'hit_rate': 0.5,
+        })
+
+    def test_variants_are_cached_separately(self, *mocks):
+        self.client.get(self.project_url)
+        response = self.client.get(self.project_url, {'fields': 'id,title'})
+
+        self.assertEqual(response['X-Detail-Cache'], 'miss')
+        self.assertEqual(set(response.data), {'id', 'title'})
+
+    def test_related_saves_invalidate_entries(self, *mocks):
+        self.client.get(self.project_url)
+        self.client.get(self.startup_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.name = 'Renamed'
+            self.category.save()
+
+        project = self.client.get(self.project_url)
+        startup = self.client.get(self.startup_url)
+        self.assertEqual(project['X-Detail-Cache'], 'miss')
+        self.assertEqual(project.data['category']['name'], 'Renamed')
+        self.assertEqual(startup['X-Detail-Cache'], 'miss')
+
+    def test_project_save_invalidates_its_startup(self, *mocks):
+        self.client.get(self.startup_url)
+        with self.captureOnCommitCallbacks(execute=True):
+            Project.objects.get(pk=self.project.pk).save()
+
+        self.assertEqual(self.client.get(self.startup_url)['X-Detail-Cache'], 'miss')
+
+    def test_object_permissions_apply_to_cached_payloads(self, *mocks):
+        self.client.get(self.startup_url)
+        self.client.force_authenticate(user=UserFactory())
+
+        self.assertEqual(self.client.get(self.startup_url).status_code, 403)
+
+    def test_concurrent_miss_waits_for_the_recompute(self, *mocks):
+        config = detail_cache.get_detail_cache_config()
+        variant = f"projects.serializers.ProjectReadSerializer.1|testserver|{self.project_url}"
+        key = detail_cache.build_entry_key(config, 'projects.project', self.project.pk, 0, variant)
+        get_redis().set(f"{key}:lock", 1, ex=5)
+
+        with patch('common.detail_cache._wait_for', return_value=json.dumps({'id': self.project.pk})):
+            response = self.client.get(self.project_url)
+
+        self.assertEqual(response['X-Detail-Cache'], 'coalesced')
+        self.assertEqual(response.data, {'id': self.project.pk})
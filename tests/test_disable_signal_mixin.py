@@ -1,20 +1,21 @@
-from django.db.models.signals import post_save
+from django.apps import apps
 from django.test import TestCase
 
-from startups.models import Startup
-from startups.signals import update_startup_document
-
 
 class DisableSignalMixin(TestCase):
     sender = None
 
+    @classmethod
+    def _signal_processor(cls):
+        return apps.get_app_config('django_elasticsearch_dsl').signal_processor
+
     @classmethod
     def disable_signal(cls):
-        post_save.disconnect(update_startup_document, sender=Startup)
+        cls._signal_processor().teardown()
 
     @classmethod
     def enable_signal(cls):
-        post_save.connect(update_startup_document, sender=Startup)
+        cls._signal_processor().setup()
 
     @classmethod
     def setUpClass(cls):
@@ -0,0 +1,84 @@
+from unittest.mock import patch
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from communications.models import Notification, NotificationType
+from tests.factories import CategoryFactory, InvestorFactory, ProjectFactory, StartupFactory, UserFactory
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+@patch("users.permissions.HasActiveCompanyAccount.has_permission", return_value=True)
+@patch("users.permissions.IsStartupUser.has_permission", return_value=True)
+class SparseFieldsetTests(APITestCase):
+    """Tests for ?fields= and ?expand= on the REST viewsets."""
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.client.force_authenticate(user=self.user)
+        self.startup = StartupFactory(user=self.user)
+        self.project = ProjectFactory(startup=self.startup, category=CategoryFactory(name='Energy'))
+
+    def _get(self, url, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, response.data)
+        # Skip the ETag validator query issued by ConditionalGetMixin
+        return response, [query['sql'] for query in queries if 'etag_rows' not in query['sql']]
+
+    def test_project_list_fields_prune_payload_and_columns(self, *mocks):
+        response, queries = self._get(reverse('project-list'), {'fields': 'id,title'})
+
+        self.assertEqual(response.data, [{'id': self.project.pk, 'title': self.project.title}])
+        self.assertNotIn('JOIN', queries[0])
+        self.assertNotIn('"projects"."description"', queries[0])
+
+    def test_project_list_expand_nests_related_objects(self, *mocks):
+        response, queries = self._get(reverse('project-list'), {'fields': 'id', 'expand': 'startup,category'})
+
+        row = response.data[0]
+        self.assertEqual(row['startup']['company_name'], self.startup.company_name)
+        self.assertEqual(row['category']['name'], 'Energy')
+        self.assertEqual(len(queries), 1)
+
+    def test_startup_retrieve_without_projects_skips_prefetch(self, *mocks):
+        url = reverse('startup-detail', args=[self.startup.pk])
+        response, queries = self._get(url, {'fields': 'id,company_name'})
+
+        self.assertEqual(response.data, {'id': self.startup.pk, 'company_name': self.startup.company_name})
+        self.assertFalse(any('"projects"' in sql for sql in queries))
+
+    def test_startup_list_expand_projects(self, *mocks):
+        response, queries = self._get(reverse('startup-list'), {'fields': 'id,projects_count', 'expand': 'projects'})
+
+        self.assertEqual(response.data[0]['projects_count'], 1)
+        self.assertEqual([p['id'] for p in response.data[0]['projects']], [self.project.pk])
+        self.assertEqual(len(queries), 2)
+
+    def test_investor_fields(self, *mocks):
+        investor = InvestorFactory()
+        response, _ = self._get(reverse('investor-detail', args=[investor.pk]), {'fields': 'id,company_name'})
+
+        self.assertEqual(set(response.data), {'id', 'company_name'})
+
+    def test_notification_fields_with_cursor_pagination(self, *mocks):
+        Notification.objects.create(
+            user=self.user, notification_type=NotificationType.objects.first(), title='Hi', message='Hello',
+        )
+        url = reverse('communications:notification-list')
+        response, _ = self._get(url, {'fields': 'notification_id,title', 'pagination': 'cursor'})
+
+        self.assertEqual(set(response.data['results'][0]), {'notification_id', 'title'})
+
+    def test_unknown_fields_are_rejected(self, *mocks):
+        self.assertEqual(self.client.get(reverse('project-list'), {'fields': 'id,secret'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('project-list'), {'expand': 'email'}).status_code, 400)
+
+    def test_writes_ignore_fields_param(self, *mocks):
+        url = reverse('project-list') + '?fields=id'
+        response = self.client.post(url, {'title': 'New'}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('funding_goal', response.data)
@@ -0,0 +1,81 @@
+import csv
+import logging
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from communications.services import seed_notification_preferences
+from users.models import UserRole
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
+REQUIRED_COLUMNS = {"email", "first_name", "last_name"}
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk import users from a CSV file (columns: email, first_name, last_name, optional role). "
+        "Existing emails are skipped; imported users get unusable passwords and default "
+        "notification preferences."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("csv_path", help="Path to the CSV file to import.")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Users inserted per statement (default: 1000).",
+        )
+        parser.add_argument(
+            "--active",
+            action="store_true",
+            help="Mark imported users as active.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with open(options["csv_path"], newline="", encoding="utf-8") as fh:
+                reader = csv.DictReader(fh)
+                missing = REQUIRED_COLUMNS - set(reader.fieldnames or [])
+                if missing:
+                    raise CommandError(f"Missing CSV columns: {', '.join(sorted(missing))}")
+                rows = list(reader)
+        except OSError as e:
+            raise CommandError(f"Cannot read {options['csv_path']}: {e}")
+
+        roles = {role.role: role for role in UserRole.objects.all()}
+        default_role = roles.get(UserRole.Role.USER)
+
+        emails = {User.objects.normalize_email(row["email"].strip()) for row in rows if row.get("email")}
+        existing = set(User.objects.filter(email__in=emails).values_list("email", flat=True))
+
+        to_create = []
+        seen = set()
+        for row in rows:
+            email = User.objects.normalize_email((row.get("email") or "").strip())
+            if not email or email in existing or email in seen:
+                continue
+            seen.add(email)
+            user = User(
+                email=email,
+                first_name=(row.get("first_name") or "").strip(),
+                last_name=(row.get("last_name") or "").strip(),
+                role=roles.get((row.get("role") or "").strip(), default_role),
+                is_active=options["active"],
+            )
+            user.set_unusable_password()
+            to_create.append(user)
+
+        with transaction.atomic():
+            # post_save does not fire for bulk_create, so preferences are seeded explicitly
+            created = User.objects.bulk_create(to_create, batch_size=options["batch_size"])
+            seed_notification_preferences(created, batch_size=options["batch_size"])
+
+        skipped = len(rows) - len(created)
+        logger.info("Imported %d users (%d skipped)", len(created), skipped)
+        self.stdout.write(
+            self.style.SUCCESS(f"Imported {len(created)} users, skipped {skipped} (existing or duplicate).")
+        )
@@ -0,0 +1,86 @@
+import logging
+import threading
+import uuid
+
+import redis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_client = None
+
+
+def get_redis() -> redis.Redis:
+    """
+    Return a process-wide Redis client for settings.REDIS_URL.
+
+    The client keeps its own connection pool, so it is safe to share across
+    threads. Short socket timeouts keep callers from hanging when Redis is down.
+    """
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = redis.Redis.from_url(
+                    settings.REDIS_URL,
+                    socket_connect_timeout=1,
+                    socket_timeout=1,
+                    decode_responses=True,
+                )
+    return _client
+
+
+# Deletes KEYS[1] only while it still holds this run's token ARGV[1]
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def acquire_lock(client, key: str, timeout: int):
+    """Take the lock ``key`` for ``timeout`` seconds; returns its token, or None if it is held."""
+    token = uuid.uuid4().hex
+    return token if client.set(key, token, nx=True, ex=timeout) else None
+
+
+def release_lock(client, key: str, token: str) -> bool:
+    """
+    Release the lock ``key`` taken with ``token``. A run that outlived the
+    timeout leaves the lock of the run that took it over alone.
+    """
+    return bool(client.eval(_RELEASE_SCRIPT, 1, key, token))
+
+
+def claim_hash(client, key: str, processing: str) -> bool:
+    """
+    Move the hash ``key`` to ``processing`` for a run to work through.
+
+    A ``processing`` hash that already exists was left by a run that died;
+    it is kept, and new entries in ``key`` wait for the next run, so it is
+    finished first. Returns False when there is nothing to process.
+    """
+    if client.exists(processing):
+        return True
+    if not client.exists(key):
+        return False
+    client.rename(key, processing)
+    return True
+
+
+def hash_batches(client, key: str, batch_size: int):
+    """Yield the hash ``key`` as ``{field: value}`` dicts of up to ``batch_size`` fields."""
+    seen, batch = set(), {}
+    for field, value in client.hscan_iter(key, count=batch_size):
+        # HSCAN may return a field more than once
+        if field in seen:
+            continue
+        seen.add(field)
+        batch[field] = value
+        if len(batch) >= batch_size:
+            yield batch
+            batch = {}
+    if batch:
+        yield batch
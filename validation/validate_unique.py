@@ -0,0 +1,36 @@
+from django.db.models import Q
+
+
+def find_case_insensitive_duplicates(queryset, values, exclude_pk=None):
+    """
+    Check several fields for case-insensitive duplicates in a single query.
+
+    The ``iexact`` lookups compile to ``UPPER(column) = UPPER(value)``, which
+    the functional ``UPPER()`` unique indexes serve directly.
+
+    Args:
+        queryset (QuerySet): Rows to check against.
+        values (dict): Field name -> candidate value; empty values are skipped.
+        exclude_pk: Primary key of the instance being updated, if any.
+
+    Returns:
+        set: Names of the fields whose value is already taken.
+    """
+    values = {field: value for field, value in values.items() if value}
+    if not values:
+        return set()
+
+    condition = Q()
+    for field, value in values.items():
+        condition |= Q(**{f'{field}__iexact': value})
+    queryset = queryset.filter(condition)
+    if exclude_pk is not None:
+        queryset = queryset.exclude(pk=exclude_pk)
+
+    duplicates = set()
+    # With unique indexes on every field, each field matches at most one row
+    for row in queryset.order_by().values(*values)[:len(values)]:
+        for field, value in values.items():
+            if str(row[field]).upper() == str(value).upper():
+                duplicates.add(field)
+    return duplicates